@@ -34,9 +34,13 @@ console.log('All translation keys:');
 console.log(Array.from(allKeys).sort());
 
 // Also check for keys that exist in one but not others
-const enOnly = enKeys.filter(key => !ruKeys.includes(key) || !kgKeys.includes(key));
-const ruOnly = ruKeys.filter(key => !enKeys.includes(key) || !kgKeys.includes(key));
-const kgOnly = kgKeys.filter(key => !enKeys.includes(key) || !ruKeys.includes(key));
+// (Set lookups keep this linear; scripts/locale_parity.py does the full N-locale report)
+const enSet = new Set(enKeys);
+const ruSet = new Set(ruKeys);
+const kgSet = new Set(kgKeys);
+const enOnly = enKeys.filter(key => !ruSet.has(key) || !kgSet.has(key));
+const ruOnly = ruKeys.filter(key => !enSet.has(key) || !kgSet.has(key));
+const kgOnly = kgKeys.filter(key => !enSet.has(key) || !ruSet.has(key));
 
 console.log('\nKeys only in EN:', enOnly);
 console.log('\nKeys only in RU:', ruOnly);
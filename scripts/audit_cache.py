@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Кэш результатов анализа файлов переводов на диске.
+Ключ - SHA-256 содержимого файла, имя инструмента и его версия, поэтому
+неизмененные файлы берутся из кэша, а изменение логики инструмента
+(новая версия) автоматически делает старые записи недействительными.
+Размер кэша ограничен: при превышении удаляются давно не использованные записи.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "i18n-audit"
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+class AuditCache:
+    """Кэш результатов в виде JSON файлов с вытеснением по времени использования"""
+
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, tool, version, digest):
+        return self.root / f"{tool}-v{version}-{digest}.json"
+
+    def get(self, tool, version, digest):
+        """Возвращает сохраненный результат или None"""
+        entry = self._entry_path(tool, version, digest)
+        try:
+            with open(entry, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Отмечаем использование для вытеснения давно не используемых записей
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return value
+
+    def put(self, tool, version, digest, value):
+        """Сохраняет результат (атомарно) и при необходимости чистит кэш"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        entry = self._entry_path(tool, version, digest)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, entry)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Удаляет самые старые записи, пока размер кэша больше max_bytes"""
+        entries = []
+        total = 0
+        for entry in self.root.glob("*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                # Запись могла удалить другая копия скрипта (--jobs)
+                pass
+            total -= size
+
+    def clear(self):
+        """Удаляет все записи кэша"""
+        for entry in self.root.glob("*.json"):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+def cache_enabled(argv=None):
+    """Кэш выключается флагом --no-cache"""
+    argv = sys.argv[1:] if argv is None else argv
+    return "--no-cache" not in argv
+
+def cached_analysis(tool, version, file_path, compute, cache=None):
+    """
+    Возвращает compute(data) для содержимого файла, используя кэш.
+    compute получает bytes и должен возвращать JSON-совместимый результат.
+    cache=None отключает кэширование.
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    if cache is None:
+        return compute(data)
+
+    digest = hashlib.sha256(data).hexdigest()
+    value = cache.get(tool, version, digest)
+    if value is not None:
+        return value["result"]
+
+    result = compute(data)
+    cache.put(tool, version, digest, {"result": result})
+    return result
+
+def main():
+    """Основная функция: статистика и очистка кэша"""
+    cache = AuditCache()
+    if "--clear" in sys.argv:
+        cache.clear()
+        print(f"🧹 Кэш очищен: {cache.root}")
+        return 0
+
+    entries = list(cache.root.glob("*.json")) if cache.root.exists() else []
+    total = sum(entry.stat().st_size for entry in entries)
+    print(f"📂 Кэш: {cache.root}")
+    print(f"📊 Записей: {len(entries)}, размер: {total / 1024:.1f} KB из {cache.max_bytes / 1024 / 1024:.0f} MB")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
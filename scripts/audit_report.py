@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Слой отчетов для инструментов аудита переводов.
+Находки - словари {'rule', 'severity', 'file', 'path', 'message', ...} -
+передаются отчету по одной и сразу пишутся в буферизованный поток:
+JSONL (одна находка - одна строка), SARIF 2.1.0 (для CI и редакторов)
+или человекочитаемый вид. Печать не накапливается в памяти и не идет
+построчно в терминал, поэтому большие проверки не упираются в вывод.
+
+Параметры инструментов:
+    --format=human|jsonl|sarif   (по умолчанию human)
+    --output=report.jsonl        (по умолчанию stdout)
+"""
+
+import json
+import sys
+
+FORMATS = ("human", "jsonl", "sarif")
+# Размер буфера записи отчета
+BUFFER_SIZE = 1024 * 1024
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {"error": "error", "warning": "warning", "info": "note"}
+SEVERITY_ICONS = {"error": "❌", "warning": "⚠️ ", "info": "💡"}
+
+def parse_report_args(argv=None):
+    """Читает --format=... и --output=...; возвращает (format, output или None)"""
+    argv = sys.argv[1:] if argv is None else argv
+    report_format = "human"
+    output = None
+    for arg in argv:
+        if arg.startswith("--format="):
+            report_format = arg.split("=", 1)[1]
+        elif arg.startswith("--output="):
+            output = arg.split("=", 1)[1]
+    if report_format not in FORMATS:
+        raise ValueError(f"Неизвестный формат отчета: {report_format} (доступны: {', '.join(FORMATS)})")
+    return report_format, output
+
+class Report:
+    """Базовый отчет: буферизованный поток и счетчики находок"""
+
+    def __init__(self, stream, tool):
+        self.stream = stream
+        self.tool = tool
+        self.counts = {}
+
+    def emit(self, finding):
+        severity = finding.get("severity", "warning")
+        self.counts[severity] = self.counts.get(severity, 0) + 1
+        self.write(finding)
+
+    def write(self, finding):
+        raise NotImplementedError
+
+    def close(self):
+        """Завершает документ (для SARIF - закрывает массивы)"""
+
+class JsonlReport(Report):
+    """Одна находка - одна строка JSON"""
+
+    def write(self, finding):
+        self.stream.write(json.dumps(dict(finding, tool=self.tool), ensure_ascii=False))
+        self.stream.write("\n")
+
+class SarifReport(Report):
+    """
+    SARIF 2.1.0, записываемый потоково: заголовок сразу, результаты по
+    мере поступления, закрывающие скобки - в close()
+    """
+
+    def __init__(self, stream, tool):
+        super().__init__(stream, tool)
+        self.first = True
+        header = json.dumps({"$schema": SARIF_SCHEMA, "version": "2.1.0"}, ensure_ascii=False)
+        driver = json.dumps({"driver": {"name": self.tool}}, ensure_ascii=False)
+        self.stream.write(header[:-1] + ', "runs": [{"tool": ' + driver + ', "results": [\n')
+
+    def write(self, finding):
+        result = {
+            "ruleId": finding["rule"],
+            "level": SARIF_LEVELS.get(finding.get("severity"), "warning"),
+            "message": {"text": finding["message"]},
+            "locations": [{
+                "physicalLocation": {"artifactLocation": {"uri": str(finding.get("file", "")).replace("\\", "/")}},
+                "logicalLocations": [{"fullyQualifiedName": finding.get("path", ""), "kind": "member"}],
+            }],
+        }
+        if finding.get("line"):
+            result["locations"][0]["physicalLocation"]["region"] = {"startLine": finding["line"]}
+        extra = {key: value for key, value in finding.items()
+                 if key not in ("rule", "severity", "message", "file", "path", "line")}
+        if extra:
+            result["properties"] = extra
+        if not self.first:
+            self.stream.write(",\n")
+        self.first = False
+        self.stream.write(json.dumps(result, ensure_ascii=False))
+
+    def close(self):
+        self.stream.write("\n]}]}\n")
+
+class HumanReport(Report):
+    """Человекочитаемый вид поверх тех же находок"""
+
+    def __init__(self, stream, tool):
+        super().__init__(stream, tool)
+        self.current_file = None
+
+    def write(self, finding):
+        file_name = finding.get("file")
+        if file_name != self.current_file:
+            self.current_file = file_name
+            self.stream.write(f"\n📁 {file_name}\n")
+        icon = SEVERITY_ICONS.get(finding.get("severity"), "•")
+        self.stream.write(f"   {icon} [{finding['rule']}] {finding.get('path', '')}: {finding['message']}\n")
+        for path in finding.get("paths", [])[1:]:
+            self.stream.write(f"      = {path}\n")
+
+    def close(self):
+        total = sum(self.counts.values())
+        self.stream.write(f"\n📊 Находок: {total}" + "".join(
+            f", {severity}: {count}" for severity, count in sorted(self.counts.items())) + "\n")
+
+REPORTS = {"human": HumanReport, "jsonl": JsonlReport, "sarif": SarifReport}
+
+class _Unclosable:
+    """Поток, close() которого только сбрасывает буфер"""
+
+    def __init__(self, stream):
+        self.write = stream.write
+        self.close = stream.flush
+
+class open_report:
+    """
+    Контекстный менеджер отчета:
+        with open_report("jsonl", "out.jsonl", "tool") as report:
+            report.emit(finding)
+    output=None - stdout (тоже с большим буфером)
+    """
+
+    def __init__(self, report_format, output=None, tool="i18n-audit"):
+        self.report_format = report_format
+        self.output = output
+        self.tool = tool
+
+    def __enter__(self):
+        if self.output:
+            self.stream = open(self.output, 'w', encoding='utf-8', buffering=BUFFER_SIZE)
+        else:
+            sys.stdout.flush()
+            try:
+                self.stream = open(sys.stdout.fileno(), 'w', encoding='utf-8',
+                                   buffering=BUFFER_SIZE, closefd=False)
+            except (AttributeError, OSError, ValueError):
+                # stdout подменен (например, redirect_stdout) - пишем в него напрямую
+                self.stream = _Unclosable(sys.stdout)
+        self.report = REPORTS[self.report_format](self.stream, self.tool)
+        return self.report
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.report.close()
+        finally:
+            self.stream.close()
+        return False
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Аудит файлов переводов движком правил за один обход дерева.
+Файл разбирается один раз (duplicate_keys.load_with_duplicates видит и
+повторяющиеся ключи), после чего дерево обходится один раз, а каждая
+проверка - это посетитель (Rule), подписанный на события обхода:
+вход в словарь/список, лист, выход из словаря/списка со структурным хэшем.
+Новая проверка - это новый класс в RULES, а не еще один проход по данным.
+
+Правила: duplicate-keys, duplicate-sections, section-names, empty-values,
+placeholders (в том числе расхождения между языками), oversized-strings.
+
+Запуск:
+    python audit_rules.py [--rules=duplicate-keys,placeholders] [--max-length=500] [--jobs N] [--no-cache]
+        [--format=jsonl|sarif] [--output=report.jsonl]
+"""
+
+import hashlib
+import json
+import re
+import sys
+from collections import defaultdict
+from functools import partial
+
+from audit_cache import AuditCache, cache_enabled, cached_analysis
+from audit_report import open_report, parse_report_args
+from duplicate_keys import load_with_duplicates
+from json_events import dotted
+from locale_files import find_locales_dir, parse_jobs, run_per_file
+from locale_parity import find_locale_groups
+from structural_hash import dict_digest, list_digest, scalar_digest
+from tree_walk import ENTER, LEAF, iter_tree
+
+# Версия логики правил: при ее изменении записи кэша становятся недействительными
+CACHE_VERSION = 1
+DEFAULT_MAX_LENGTH = 500
+
+ERROR = "error"
+WARNING = "warning"
+INFO = "info"
+
+# {{name}}, {{ count, number }} - интерполяция i18next
+_PLACEHOLDER = re.compile(r"\{\{\s*([^{}\s,]+)[^{}]*\}\}")
+
+class Rule:
+    """
+    Базовый посетитель. Пути - кортежи ключей и индексов от корня.
+    Переопределяются только нужные методы: обход вызывает лишь их.
+    """
+    name = ""
+    # Нужны ли структурные хэши поддеревьев в leave()
+    needs_digests = False
+
+    def __init__(self, options=None):
+        self.options = options or {}
+        self.findings = []
+
+    def report(self, path, message, severity=WARNING, **extra):
+        self.findings.append(dict(rule=self.name, severity=severity,
+                                  path=dotted(path), message=message, **extra))
+
+    def start(self, context):
+        """Перед обходом; context - {'duplicates': [...]} результата разбора"""
+
+    def enter(self, path, node):
+        """Вход в словарь или список"""
+
+    def leaf(self, path, value):
+        """Скалярное значение"""
+
+    def leave(self, path, node, digest):
+        """Выход из словаря или списка; digest - None, если хэши не нужны"""
+
+    def finish(self):
+        """После обхода: возвращает находки по файлу"""
+        return self.findings
+
+    def state(self):
+        """JSON-совместимое состояние для сравнения файлов разных языков"""
+        return None
+
+    @classmethod
+    def compare(cls, states):
+        """Находки по группе файлов {язык: state()} (например, один файл на язык)"""
+        return []
+
+def _overrides(rule, method):
+    return getattr(type(rule), method) is not getattr(Rule, method)
+
+def walk(data, rules):
+    """
+    Один итеративный обход дерева с вызовом всех правил.
+    Хэши поддеревьев считаются снизу вверх по ходу обхода,
+    только если они нужны хотя бы одному правилу.
+    """
+    enter = [rule.enter for rule in rules if _overrides(rule, "enter")]
+    leaf = [rule.leaf for rule in rules if _overrides(rule, "leaf")]
+    leave = [rule.leave for rule in rules if _overrides(rule, "leave")]
+    needs_digests = any(rule.needs_digests for rule in rules)
+
+    # Общий обход tree_walk; хэши детей открытых узлов - на стеке pending
+    pending = []
+    for event, path, key, node in iter_tree(data):
+        if event == ENTER:
+            for visit in enter:
+                visit(path, node)
+            pending.append({})
+        elif event == LEAF:
+            for visit in leaf:
+                visit(path, node)
+            if needs_digests and pending:
+                pending[-1][key] = scalar_digest(node)
+        else:
+            child_digests = pending.pop()
+            digest = None
+            if needs_digests:
+                if isinstance(node, dict):
+                    digest = dict_digest(child_digests)
+                else:
+                    digest = list_digest(child_digests.values())
+                if pending:
+                    pending[-1][key] = digest
+            for visit in leave:
+                visit(path, node, digest)
+
+class DuplicateKeysRule(Rule):
+    """Ключ повторяется внутри одного объекта (json.load молча оставил бы последний)"""
+    name = "duplicate-keys"
+
+    def start(self, context):
+        for dup in context["duplicates"]:
+            same = all(value == dup.values[0] for value in dup.values[1:])
+            self.report(dup.path, f"ключ '{dup.key}' повторяется {len(dup.positions)} раз"
+                        + (" (одинаковые значения)" if same else " (значения различаются)"),
+                        ERROR, count=len(dup.positions))
+
+class DuplicateSectionsRule(Rule):
+    """Разделы с одинаковым именем и одинаковым содержимым в разных местах"""
+    name = "duplicate-sections"
+    needs_digests = True
+
+    def __init__(self, options=None):
+        super().__init__(options)
+        self.groups = defaultdict(list)
+
+    def leave(self, path, node, digest):
+        if path and isinstance(path[-1], str) and isinstance(node, dict):
+            self.groups[(path[-1], digest)].append(path)
+
+    def finish(self):
+        for (name, _), paths in self.groups.items():
+            if len(paths) > 1:
+                self.report(paths[0], f"раздел '{name}' с одинаковым содержимым встречается "
+                            f"{len(paths)} раз", WARNING, paths=[dotted(path) for path in paths])
+        return self.findings
+
+class SectionNamesRule(Rule):
+    """Одно имя раздела используется в нескольких местах (возможное дублирование)"""
+    name = "section-names"
+
+    def __init__(self, options=None):
+        super().__init__(options)
+        self.paths = defaultdict(list)
+
+    def enter(self, path, node):
+        if path and isinstance(path[-1], str) and isinstance(node, dict):
+            self.paths[path[-1]].append(path)
+
+    def finish(self):
+        for name, paths in self.paths.items():
+            if len(paths) > 1:
+                self.report(paths[0], f"имя раздела '{name}' встречается {len(paths)} раз",
+                            INFO, paths=[dotted(path) for path in paths])
+        return self.findings
+
+class EmptyValuesRule(Rule):
+    """Пустые строки, null, пустые разделы и списки"""
+    name = "empty-values"
+
+    def leaf(self, path, value):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            self.report(path, "пустое значение")
+
+    def leave(self, path, node, digest):
+        if path and not node:
+            self.report(path, "пустой раздел" if isinstance(node, dict) else "пустой список")
+
+class PlaceholdersRule(Rule):
+    """
+    Незакрытые {{ }} в строке и разные наборы {{переменных}} у одного
+    ключа в разных языках
+    """
+    name = "placeholders"
+
+    def __init__(self, options=None):
+        super().__init__(options)
+        self.placeholders = {}
+
+    def leaf(self, path, value):
+        if not isinstance(value, str):
+            return
+        if value.count("{{") != value.count("}}"):
+            self.report(path, "незакрытая интерполяция {{ }}", ERROR)
+        self.placeholders[dotted(path)] = sorted(set(_PLACEHOLDER.findall(value)))
+
+    def state(self):
+        return self.placeholders
+
+    @classmethod
+    def compare(cls, states):
+        findings = []
+        keys = set().union(*(state.keys() for state in states.values()))
+        for key in sorted(keys):
+            present = {lang: state[key] for lang, state in states.items() if key in state}
+            if len(present) < 2 or not any(present.values()):
+                continue
+            variants = set(tuple(names) for names in present.values())
+            if len(variants) > 1:
+                detail = "; ".join(f"{lang}: {', '.join(names) or '-'}"
+                                   for lang, names in sorted(present.items()))
+                findings.append({"rule": cls.name, "severity": ERROR, "path": key,
+                                 "message": f"переменные различаются между языками ({detail})"})
+        return findings
+
+class OversizedStringsRule(Rule):
+    """Строки длиннее --max-length символов"""
+    name = "oversized-strings"
+
+    def leaf(self, path, value):
+        max_length = self.options.get("max_length", DEFAULT_MAX_LENGTH)
+        if isinstance(value, str) and len(value) > max_length:
+            self.report(path, f"строка длиной {len(value)} символов (лимит {max_length})",
+                        length=len(value))
+
+# Зарегистрированные правила: имя -> класс
+RULES = {rule.name: rule for rule in (
+    DuplicateKeysRule,
+    DuplicateSectionsRule,
+    SectionNamesRule,
+    EmptyValuesRule,
+    PlaceholdersRule,
+    OversizedStringsRule,
+)}
+
+def run_rules(data, rule_names, options=None):
+    """
+    Разбирает содержимое файла один раз и выполняет все правила за один обход.
+    Возвращает {'findings': [...], 'states': {правило: state}}
+    """
+    text = data.decode("utf-8") if isinstance(data, bytes) else data
+    json_data, duplicates = load_with_duplicates(text, keep='first')
+    # Правила - имена из RULES или классы Rule (например, служебные правила watch-режима)
+    rules = [RULES[name](options) if isinstance(name, str) else name(options) for name in rule_names]
+    for rule in rules:
+        rule.start({"duplicates": duplicates})
+    walk(json_data, rules)
+
+    findings = []
+    states = {}
+    for rule in rules:
+        findings.extend(rule.finish())
+        state = rule.state()
+        if state is not None:
+            states[rule.name] = state
+    return {"findings": findings, "states": states}
+
+def audit_file(file_path, rule_names, options, use_cache=True):
+    """
+    Аудит одного файла (выполняется и в пуле процессов).
+    При ошибке чтения или разбора - {'error': текст ошибки}: печатать здесь
+    нельзя, stdout может быть машиночитаемым отчетом
+    """
+    # Набор правил и параметры входят в имя записи кэша
+    config = json.dumps([rule_names, options], sort_keys=True).encode("utf-8")
+    tool = f"audit_rules-{hashlib.sha256(config).hexdigest()[:12]}"
+    cache = AuditCache() if use_cache else None
+    try:
+        return cached_analysis(tool, CACHE_VERSION, file_path,
+                               partial(run_rules, rule_names=rule_names, options=options), cache)
+    except Exception as e:
+        return {"error": str(e)}
+
+SEVERITY_ICONS = {ERROR: "❌", WARNING: "⚠️ ", INFO: "💡"}
+
+def print_findings(findings, limit):
+    """Печатает находки, сгруппированные по правилам"""
+    by_rule = defaultdict(list)
+    for finding in findings:
+        by_rule[finding["rule"]].append(finding)
+    for rule_name, items in by_rule.items():
+        print(f"   🔧 {rule_name}: {len(items)}")
+        shown = items if limit is None else items[:limit]
+        for finding in shown:
+            print(f"      {SEVERITY_ICONS[finding['severity']]} {finding['path']}: {finding['message']}")
+        if len(shown) < len(items):
+            print(f"      ... и еще {len(items) - len(shown)} (--all для полного списка)")
+
+def iter_audit(groups, results):
+    """
+    Находки в порядке групп: ('file', файл, находки), ('failed', файл, текст ошибки)
+    и после файлов группы - ('group', имя группы, находки сравнения языков)
+    """
+    for group_name, group in groups.items():
+        states = defaultdict(dict)
+        for lang, file_path in group.items():
+            result = results[file_path]
+            if "error" in result:
+                yield "failed", file_path, result["error"]
+                continue
+            yield "file", file_path, result["findings"]
+            for rule_name, state in result["states"].items():
+                states[rule_name][lang] = state
+
+        # Правила, сравнивающие языки одной группы
+        for rule_name, lang_states in states.items():
+            yield "group", group_name, RULES[rule_name].compare(lang_states)
+
+def main():
+    """Основная функция"""
+    try:
+        jobs = parse_jobs()
+        report_format, output = parse_report_args()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if report_format == "human" and not output:
+        print("🧪 АУДИТ ФАЙЛОВ ПЕРЕВОДОВ (ОДИН ПРОХОД, ВСЕ ПРАВИЛА)")
+        print("=" * 60)
+    limit = None if "--all" in sys.argv else 10
+    rule_names = list(RULES)
+    options = {"max_length": DEFAULT_MAX_LENGTH}
+    for arg in sys.argv[1:]:
+        if arg.startswith("--rules="):
+            rule_names = [name for name in arg.split("=", 1)[1].split(",") if name]
+        elif arg.startswith("--max-length="):
+            try:
+                options["max_length"] = int(arg.split("=", 1)[1])
+            except ValueError:
+                print(f"❌ Некорректное значение {arg}")
+                return 1
+    unknown = [name for name in rule_names if name not in RULES]
+    if unknown:
+        print(f"❌ Неизвестные правила: {', '.join(unknown)}. Доступны: {', '.join(RULES)}")
+        return 1
+
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
+        print("❌ Папка с переводами не найдена!")
+        return 1
+    groups = find_locale_groups(locales_dir)
+    if not groups:
+        print("❌ Файлы переводов не найдены!")
+        return 1
+
+    files = [file_path for group in groups.values() for file_path in group.values()]
+    results = dict(zip(files, run_per_file(audit_file, files, jobs, rule_names, options, cache_enabled())))
+
+    # Отчет в JSONL/SARIF или в файл - через слой отчетов, без построчной печати
+    if report_format != "human" or output:
+        with open_report(report_format, output, "audit_rules") as report:
+            for kind, source, findings in iter_audit(groups, results):
+                if kind == "failed":
+                    findings = [{"rule": "parse-error", "severity": ERROR, "path": "",
+                                 "message": f"Ошибка разбора файла: {findings}"}]
+                for finding in findings:
+                    report.emit(dict(finding, file=str(source)))
+        return 1 if report.counts.get(ERROR) else 0
+
+    severities = defaultdict(int)
+    failed = 0
+    for kind, source, findings in iter_audit(groups, results):
+        if kind == "failed":
+            failed += 1
+            print(f"\n❌ Ошибка разбора файла {source}: {findings}", file=sys.stderr)
+            continue
+        if kind == "file":
+            print(f"\n📁 {source}: находок {len(findings)}")
+        elif findings:
+            print(f"\n🌐 Группа '{source}': расхождения между языками")
+        print_findings(findings, limit)
+        for finding in findings:
+            severities[finding["severity"]] += 1
+
+    print("\n" + "=" * 60)
+    print(f"📊 Ошибок: {severities[ERROR]}, предупреждений: {severities[WARNING]}, "
+          f"замечаний: {severities[INFO]}, файлов с ошибками разбора: {failed}")
+    return 1 if failed or severities[ERROR] else 0
+
+if __name__ == "__main__":
+    exit(main())
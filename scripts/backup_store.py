@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Хранилище резервных копий файлов переводов с адресацией по содержимому.
+Каждая версия файла хранится один раз - сжатой, под именем SHA-256 своего
+содержимого (objects/ab/abcdef....gz), а runs.jsonl записывает, какой
+инструмент, когда и какую версию какого файла сохранил. Повторные запуски
+очистки с неизмененными файлами не занимают места, история не теряется.
+
+Запуск:
+    python backup_store.py list                      # запуски и сохраненные файлы
+    python backup_store.py restore [RUN] [файлы...]  # восстановить (по умолчанию - последний запуск)
+    python backup_store.py prune [--keep=20]         # оставить последние N запусков
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STORE_DIR = REPO_ROOT / ".i18n-backups"
+DEFAULT_KEEP_RUNS = 20
+# Идентификатор запуска наследуется процессами пула (--jobs) через окружение,
+# поэтому все файлы одного запуска попадают в один run. Для этого основной
+# процесс должен вызвать current_run_id() до создания пула
+RUN_ENV = "I18N_BACKUP_RUN"
+
+def current_run_id():
+    """Идентификатор текущего запуска (один на процесс и его дочерние процессы)"""
+    run_id = os.environ.get(RUN_ENV)
+    if not run_id:
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{os.getpid()}"
+        os.environ[RUN_ENV] = run_id
+    return run_id
+
+def _relative(file_path):
+    """Путь файла относительно корня репозитория (если файл внутри него)"""
+    path = Path(file_path).resolve()
+    try:
+        return path.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+def _atomic_write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class BackupStore:
+    """Объекты по хэшу содержимого и журнал запусков"""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        self.runs_file = self.root / "runs.jsonl"
+
+    def _object_path(self, digest):
+        return self.root / "objects" / digest[:2] / f"{digest}.gz"
+
+    def put_object(self, data):
+        """Сохраняет содержимое (если такого еще нет) и возвращает его SHA-256"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            _atomic_write(path, gzip.compress(data, mtime=0))
+        return digest
+
+    def get_object(self, digest):
+        """Содержимое версии по хэшу (с проверкой целостности)"""
+        with open(self._object_path(digest), 'rb') as f:
+            data = gzip.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Поврежденный объект {digest}")
+        return data
+
+    def backup_file(self, file_path, tool, data=None):
+        """
+        Сохраняет текущую версию файла (data - уже прочитанное содержимое)
+        и записывает ее в журнал текущего запуска. Возвращает хэш версии.
+        """
+        if data is None:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        digest = self.put_object(bytes(data))
+        entry = {
+            "run": current_run_id(),
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "tool": tool,
+            "path": _relative(file_path),
+            "sha256": digest,
+            "size": len(data),
+        }
+        # Одна короткая строка в режиме append - записи процессов пула не перемешиваются
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.runs_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return digest
+
+    def restore_file(self, digest, file_path):
+        """Атомарно восстанавливает файл из версии digest"""
+        _atomic_write(Path(file_path), self.get_object(digest))
+
+    def entries(self):
+        """Все записи журнала в порядке добавления"""
+        if not self.runs_file.exists():
+            return []
+        with open(self.runs_file, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def runs(self):
+        """Запуски {run: [записи]} в порядке их начала"""
+        runs = {}
+        for entry in self.entries():
+            runs.setdefault(entry["run"], []).append(entry)
+        return runs
+
+    def prune(self, keep=DEFAULT_KEEP_RUNS):
+        """
+        Оставляет последние keep запусков и удаляет объекты, на которые
+        больше не ссылается ни одна запись. Возвращает (запусков, объектов) удалено.
+        """
+        runs = self.runs()
+        kept_runs = list(runs)[-keep:] if keep > 0 else []
+        kept = [entry for run in kept_runs for entry in runs[run]]
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in kept)
+        if self.runs_file.exists():
+            _atomic_write(self.runs_file, lines.encode("utf-8"))
+
+        referenced = set(entry["sha256"] for entry in kept)
+        removed_objects = 0
+        for path in self.root.glob("objects/*/*.gz"):
+            if path.name[:-len(".gz")] not in referenced:
+                path.unlink()
+                removed_objects += 1
+        return len(runs) - len(kept_runs), removed_objects
+
+def resolve_path(stored_path):
+    """Путь из журнала -> путь на диске"""
+    path = Path(stored_path)
+    return path if path.is_absolute() else REPO_ROOT / path
+
+def list_main(store):
+    runs = store.runs()
+    if not runs:
+        print("📭 Резервных копий нет")
+        return 0
+    objects = list(store.root.glob("objects/*/*.gz"))
+    print(f"📂 Хранилище: {store.root}")
+    print(f"📊 Запусков: {len(runs)}, уникальных версий: {len(objects)}, "
+          f"на диске: {sum(path.stat().st_size for path in objects) / 1024:.1f} KB")
+    for run, entries in runs.items():
+        print(f"\n🕒 {run} ({entries[0]['tool']}, {entries[0]['time']})")
+        for entry in entries:
+            print(f"   💾 {entry['path']}  {entry['sha256'][:12]}  {entry['size'] / 1024:.1f} KB")
+    return 0
+
+def restore_main(store, args):
+    runs = store.runs()
+    if not runs:
+        print("❌ Резервных копий нет")
+        return 1
+    run = args[0] if args and args[0] in runs else list(runs)[-1]
+    paths = set(args[1:] if args and args[0] in runs else args)
+    # Для каждого файла - первая версия в запуске (состояние до изменений)
+    versions = {}
+    for entry in runs[run]:
+        versions.setdefault(entry["path"], entry["sha256"])
+    if paths:
+        wanted = set(_relative(path) for path in paths)
+        versions = {path: digest for path, digest in versions.items() if path in wanted}
+        if not versions:
+            print(f"❌ В запуске {run} нет указанных файлов")
+            return 1
+
+    print(f"🔄 Восстановление запуска {run}:")
+    for stored_path, digest in versions.items():
+        store.restore_file(digest, resolve_path(stored_path))
+        print(f"   ✅ {stored_path} ← {digest[:12]}")
+    return 0
+
+def prune_main(store, args):
+    keep = DEFAULT_KEEP_RUNS
+    for arg in args:
+        if arg.startswith("--keep="):
+            try:
+                keep = int(arg.split("=", 1)[1])
+            except ValueError:
+                print(f"❌ Некорректное значение {arg}")
+                return 1
+    removed_runs, removed_objects = store.prune(keep)
+    print(f"🧹 Удалено запусков: {removed_runs}, версий файлов: {removed_objects} (оставлено до {keep} запусков)")
+    return 0
+
+def main():
+    """Основная функция"""
+    print("💾 РЕЗЕРВНЫЕ КОПИИ ФАЙЛОВ ПЕРЕВОДОВ")
+    print("=" * 60)
+
+    store = BackupStore()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    args = sys.argv[2:]
+    if command == "list":
+        return list_main(store)
+    if command == "restore":
+        return restore_main(store, args)
+    if command == "prune":
+        return prune_main(store, args)
+    print(f"❌ Неизвестная команда: {command} (list, restore, prune)")
+    return 1
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк инструментов для файлов переводов на синтетических данных.
+Генерирует файлы переводов заданного размера, глубины, доли дубликатов
+и плотности экранирования, замеряет основную функцию каждого инструмента
+(пропускная способность MB/s и пиковый RSS отдельного процесса) и
+сравнивает результаты с сохраненной базовой линией, чтобы замечать
+регрессии в горячих местах.
+
+Абсолютные MB/s зависят от процессора, поэтому сравниваются не они, а
+скорость относительно эталона - json.loads того же файла, замеренного в
+том же процессе сразу после инструмента. Отношение гораздо меньше зависит
+от машины, но не совсем: базовую линию нужно пересохранять на каждой
+машине (или в CI-окружении), где выполняется сравнение.
+
+Запуск:
+    python benchmark_translations.py                    # замер и сравнение с базовой линией
+    python benchmark_translations.py --save-baseline    # сохранить результаты как базовую линию
+    python benchmark_translations.py --scaling          # рост времени dedupe с размером файла
+Параметры генератора: --size=MB --depth=N --duplicates=0.05 --escapes=0.1 --seed=N --repeat=N
+(сохраняются в базовой линии; с другими параметрами сравнение не выполняется)
+Допустимое падение относительной скорости: --tolerance=0.25
+"""
+
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    # Нет на Windows - пиковый RSS не измеряется
+    resource = None
+
+from dedupe_translations import load_json_keep_last
+from dedupe_translations_v2 import parse_top_level
+from final_duplicate_cleaner import find_duplicates, remove_duplicates_from_text
+from find_text_duplicates import scan_text_duplicates
+from json_events import read_bytes
+from remove_section_duplicates import find_duplicate_sections, identify_major_duplicates
+from span_index import SpanIndex
+
+BASELINE_FILE = Path(__file__).resolve().parent / "benchmark_baseline.json"
+# Допустимое падение пропускной способности относительно базовой линии
+DEFAULT_TOLERANCE = 0.25
+
+WORDS = ["university", "students", "faculty", "admission", "{{count}}",
+         "медицина", "студенты", "Learn more", "{placeholder}", "Salymbekov"]
+ESCAPES = ['\\"', "\\\\", "\\n", "\\t", "\\u00e9", "\\/"]
+
+def _string(rng, escape_density):
+    """Строка перевода; с вероятностью escape_density содержит escape-последовательности"""
+    text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 8)))
+    text = json.dumps(text, ensure_ascii=False)[1:-1]
+    if rng.random() < escape_density:
+        position = rng.randint(0, len(text))
+        text = text[:position] + rng.choice(ESCAPES) + text[position:]
+    return '"' + text + '"'
+
+def _object(rng, depth, indent, duplicate_rate, escape_density):
+    """Текст объекта; ключи могут повторяться с вероятностью duplicate_rate"""
+    pad = "  " * (indent + 1)
+    keys = []
+    members = []
+    for i in range(rng.randint(3, 8)):
+        if keys and rng.random() < duplicate_rate:
+            key = rng.choice(keys)
+        else:
+            key = f"item{i}"
+            keys.append(key)
+        if depth > 1 and rng.random() < 0.4:
+            value = _object(rng, depth - 1, indent + 1, duplicate_rate, escape_density)
+        else:
+            value = _string(rng, escape_density)
+        members.append(f'{pad}"{key}": {value}')
+    return "{\n" + ",\n".join(members) + "\n" + "  " * indent + "}"
+
+def generate_locale(target_bytes, depth=3, duplicate_rate=0.0, escape_density=0.1, seed=0):
+    """
+    Генерирует текст JSON файла переводов размером примерно target_bytes.
+    depth - максимальная глубина вложенности разделов,
+    duplicate_rate - доля повторяющихся ключей (на верхнем и вложенных уровнях),
+    escape_density - доля строк с escape-последовательностями.
+    """
+    rng = random.Random(seed)
+    parts = ["{\n"]
+    size = 2
+    names = []
+    index = 0
+    while size < target_bytes:
+        if names and rng.random() < duplicate_rate:
+            name = rng.choice(names)
+        else:
+            name = f"section{index}"
+            names.append(name)
+        body = _object(rng, max(depth - 1, 1), 1, duplicate_rate, escape_density)
+        chunk = f'  "{name}": {body}'
+        if index:
+            chunk = ",\n" + chunk
+        parts.append(chunk)
+        size += len(chunk.encode("utf-8"))
+        index += 1
+    parts.append("\n}\n")
+    return "".join(parts)
+
+def bench_dedupe(path):
+    """dedupe_translations.load_json_keep_last"""
+    load_json_keep_last(path)
+
+def bench_dedupe_v2(path):
+    """dedupe_translations_v2.parse_top_level"""
+    parse_top_level(path)
+
+def bench_final_cleaner(path):
+    """Индекс диапазонов, поиск и вырезание дубликатов final_duplicate_cleaner"""
+    index = SpanIndex.from_file(path)
+    with redirect_stdout(io.StringIO()):
+        remove_duplicates_from_text(index, find_duplicates(index))
+
+def bench_text_duplicates(path):
+    """find_text_duplicates.scan_text_duplicates"""
+    scan_text_duplicates(read_bytes(path))
+
+def bench_section_duplicates(path):
+    """Поиск дубликатов и план удаления remove_section_duplicates"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    identify_major_duplicates(find_duplicate_sections(data))
+
+def bench_reference(path):
+    """Эталон для отношения скоростей: чтение и json.loads того же файла"""
+    with open(path, 'rb') as f:
+        json.loads(f.read())
+
+# Основные функции инструментов, которые замеряются
+TOOLS = {
+    "dedupe_translations": bench_dedupe,
+    "dedupe_translations_v2": bench_dedupe_v2,
+    "final_duplicate_cleaner": bench_final_cleaner,
+    "find_text_duplicates": bench_text_duplicates,
+    "remove_section_duplicates": bench_section_duplicates,
+}
+
+def time_call(func, *args, repeat=3):
+    """Возвращает лучшее время выполнения func(*args) из repeat запусков"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def _measure(tool, path, repeat):
+    """
+    Выполняется в отдельном процессе: лучшее время инструмента, пиковый
+    RSS в KB и лучшее время эталона в том же процессе
+    """
+    elapsed = time_call(TOOLS[tool], path, repeat=repeat)
+    peak_rss = None
+    if resource is not None:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            # На macOS ru_maxrss в байтах
+            peak_rss //= 1024
+    # Эталон - после снятия RSS, чтобы не влиять на пиковую память инструмента
+    reference = time_call(bench_reference, path, repeat=repeat)
+    return elapsed, peak_rss, reference
+
+def run_suite(path, repeat=3, tools=None):
+    """Замеряет каждый инструмент в свежем процессе, чтобы RSS не смешивался"""
+    file_size = os.path.getsize(path)
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for tool in tools or TOOLS:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            elapsed, peak_rss, reference = executor.submit(_measure, tool, str(path), repeat).result()
+        results[tool] = {
+            "seconds": elapsed,
+            "mb_per_s": file_size / 1024 / 1024 / elapsed,
+            "peak_rss_kb": peak_rss,
+            # Скорость относительно json.loads в том же процессе
+            "relative": reference / elapsed,
+        }
+    return results
+
+def baseline_mismatch(params, baseline):
+    """
+    Параметры генератора, которые отличаются от параметров базовой линии:
+    [(имя, в базовой линии, сейчас)]. Замеры на разных данных несравнимы
+    """
+    saved = baseline.get("params", {})
+    return [(name, saved.get(name), value) for name, value in params.items() if saved.get(name) != value]
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    Возвращает список регрессий: падение скорости относительно эталона
+    (json.loads) больше tolerance
+    """
+    regressions = []
+    for tool, result in results.items():
+        reference = baseline["results"].get(tool)
+        if not reference:
+            continue
+        drop = 1 - result["relative"] / reference["relative"]
+        if drop > tolerance:
+            regressions.append((tool, reference["relative"], result["relative"], drop))
+    return regressions
+
+def run_dedupe_scaling(sizes_mb):
+    """Замеряет load_json_keep_last на файлах разного размера"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size_mb in sizes_mb:
+            path = os.path.join(tmp_dir, f"translation_{size_mb}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(generate_locale(int(size_mb * 1024 * 1024)))
+            file_size = os.path.getsize(path)
+            elapsed = time_call(load_json_keep_last, path)
+            results.append({
+                "size_bytes": file_size,
+                "seconds": elapsed,
+                "mb_per_s": file_size / 1024 / 1024 / elapsed,
+            })
+    return results
+
+def parse_options(argv):
+    """Разбирает аргументы вида --name=value"""
+    options = {}
+    for arg in argv:
+        if arg.startswith("--"):
+            name, _, value = arg[2:].partition("=")
+            options[name] = value
+    return options
+
+def scaling_main(options):
+    """Проверка линейности dedupe_translations.load_json_keep_last"""
+    print("⏱️  БЕНЧМАРК dedupe_translations.load_json_keep_last")
+    print("=" * 60)
+
+    sizes_mb = [float(value) for value in options.get("sizes", "0.25,1,4").split(",")]
+    results = run_dedupe_scaling(sizes_mb)
+    for result in results:
+        print(f"   📄 {result['size_bytes'] / 1024 / 1024:8.2f} MB: "
+              f"{result['seconds'] * 1000:9.1f} мс ({result['mb_per_s']:.1f} MB/s)")
+
+    # При линейной сложности пропускная способность не зависит от размера
+    first, last = results[0], results[-1]
+    ratio = first["mb_per_s"] / last["mb_per_s"]
+    print(f"\n📊 Падение пропускной способности от меньшего файла к большему: x{ratio:.2f}")
+    if ratio < 2:
+        print("✅ Время растет линейно с размером файла")
+    else:
+        print("⚠️  Время растет быстрее размера файла")
+
+    return 0
+
+def main():
+    """Основная функция"""
+    options = parse_options(sys.argv[1:])
+    if "scaling" in options:
+        return scaling_main(options)
+
+    print("⏱️  БЕНЧМАРК ИНСТРУМЕНТОВ ДЛЯ ФАЙЛОВ ПЕРЕВОДОВ")
+    print("=" * 60)
+
+    try:
+        size_mb = float(options.get("size", "2"))
+        depth = int(options.get("depth", "3"))
+        duplicate_rate = float(options.get("duplicates", "0.05"))
+        escape_density = float(options.get("escapes", "0.1"))
+        seed = int(options.get("seed", "0"))
+        repeat = int(options.get("repeat", "3"))
+        tolerance = float(options.get("tolerance", str(DEFAULT_TOLERANCE)))
+    except ValueError as e:
+        print(f"❌ Некорректный параметр: {e}")
+        return 1
+
+    tools = [tool for tool in options.get("tools", "").split(",") if tool] or None
+    if tools and any(tool not in TOOLS for tool in tools):
+        print(f"❌ Неизвестный инструмент. Доступны: {', '.join(TOOLS)}")
+        return 1
+
+    # Параметры генератора и замера сохраняются вместе с базовой линией
+    params = {"size": size_mb, "depth": depth, "duplicates": duplicate_rate,
+              "escapes": escape_density, "seed": seed, "repeat": repeat}
+
+    print(f"🧪 Синтетический файл: {size_mb} MB, глубина {depth}, "
+          f"дубликаты {duplicate_rate:.0%}, экранирование {escape_density:.0%}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "translation.json"
+        path.write_text(generate_locale(int(size_mb * 1024 * 1024), depth, duplicate_rate,
+                                        escape_density, seed), encoding="utf-8")
+        results = run_suite(path, repeat, tools)
+
+    for tool, result in results.items():
+        rss = f"{result['peak_rss_kb'] / 1024:7.1f} MB" if result["peak_rss_kb"] else "      - "
+        print(f"   🔧 {tool:28} {result['seconds'] * 1000:9.1f} мс "
+              f"{result['mb_per_s']:7.2f} MB/s  x{result['relative']:.3f} json.loads  RSS {rss}")
+
+    if "save-baseline" in options:
+        BASELINE_FILE.write_text(json.dumps({"params": params, "results": results}, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\n💾 Базовая линия сохранена: {BASELINE_FILE}")
+        print("💡 Скорости зависят от машины: сравнивайте с базовой линией, снятой там же")
+        return 0
+
+    if not BASELINE_FILE.exists():
+        print("\n💡 Базовой линии нет: запустите с --save-baseline")
+        return 0
+
+    baseline = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+    if any("relative" not in entry for entry in baseline.get("results", {}).values()):
+        print("\n⚠️  Базовая линия без относительных скоростей, сравнение пропущено")
+        print("💡 Пересохраните ее на этой машине: --save-baseline")
+        return 1
+    mismatch = baseline_mismatch(params, baseline)
+    if mismatch:
+        print("\n⚠️  Базовая линия снята с другими параметрами, сравнение пропущено:")
+        for name, before, after in mismatch:
+            print(f"   --{name}: {before} (базовая линия) ≠ {after}")
+        print("💡 Запустите с теми же параметрами или пересохраните: --save-baseline")
+        return 1
+
+    regressions = compare_with_baseline(results, baseline, tolerance)
+    if regressions:
+        print(f"\n⚠️  РЕГРЕССИИ (падение относительной скорости больше {tolerance:.0%}):")
+        for tool, before, after, drop in regressions:
+            print(f"   ❌ {tool}: x{before:.3f} → x{after:.3f} json.loads (-{drop:.0%})")
+        return 1
+
+    print(f"\n✅ Регрессий относительно базовой линии нет (допуск {tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Сборка файлов переводов для выкладки и контроль их размера.
+Для каждого translation.json и SEO-файла пишется минифицированный JSON с
+отсортированными ключами (одинаковый вывод при любом порядке ключей в
+исходнике) и рядом - сжатая копия .gz. Отчет показывает исходный,
+минифицированный и gzip размер, а суммарный gzip размер каждого языка
+сравнивается с бюджетом из locale_budgets.json: превышение - код выхода 1,
+поэтому рост переводов виден в CI.
+
+Запуск:
+    python build_locale_artifacts.py [--out=dist/locales] [--budget=KB] [--check]
+--budget задает бюджет (KB gzip) для языков, которых нет в locale_budgets.json,
+--check только считает размеры и ничего не пишет.
+"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+from locale_files import find_locales_dir
+from locale_parity import find_locale_groups
+
+DEFAULT_OUT_DIR = Path(__file__).resolve().parent.parent / "dist" / "locales"
+BUDGETS_FILE = Path(__file__).resolve().parent / "locale_budgets.json"
+
+def minify(json_data):
+    """Минифицированный JSON с отсортированными ключами (UTF-8 без экранирования)"""
+    return json.dumps(json_data, ensure_ascii=False, sort_keys=True,
+                      separators=(",", ":")).encode("utf-8")
+
+def compress(payload):
+    """gzip с максимальным сжатием; mtime=0, чтобы сборка была воспроизводимой"""
+    return gzip.compress(payload, compresslevel=9, mtime=0)
+
+def build_artifact(source_path):
+    """Возвращает (минифицированный JSON, gzip) для одного файла переводов"""
+    with open(source_path, 'r', encoding='utf-8') as f:
+        payload = minify(json.load(f))
+    return payload, compress(payload)
+
+def write_artifact(target, payload, compressed):
+    """Пишет файл и его .gz, если содержимое изменилось"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    gz_target = target.with_name(target.name + ".gz")
+    for path, data in ((target, payload), (gz_target, compressed)):
+        if not path.exists() or path.read_bytes() != data:
+            path.write_bytes(data)
+
+def load_budgets(budgets_file=BUDGETS_FILE):
+    """Бюджеты языков в KB gzip: {язык: KB}; ключ "default" - для остальных"""
+    if not budgets_file.exists():
+        return {}
+    with open(budgets_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def check_budgets(totals, budgets):
+    """
+    Сравнивает суммарный gzip размер языков {язык: bytes} с бюджетами.
+    Возвращает список превышений (язык, размер, бюджет) в байтах.
+    """
+    exceeded = []
+    for lang, size in sorted(totals.items()):
+        budget_kb = budgets.get(lang, budgets.get("default"))
+        if budget_kb is None:
+            continue
+        budget = int(budget_kb * 1024)
+        if size > budget:
+            exceeded.append((lang, size, budget))
+    return exceeded
+
+def main():
+    """Основная функция"""
+    print("📦 СБОРКА ФАЙЛОВ ПЕРЕВОДОВ ДЛЯ ВЫКЛАДКИ")
+    print("=" * 60)
+
+    out_dir = DEFAULT_OUT_DIR
+    check_only = "--check" in sys.argv
+    try:
+        budgets = load_budgets()
+        for arg in sys.argv[1:]:
+            if arg.startswith("--out="):
+                out_dir = Path(arg.split("=", 1)[1])
+            elif arg.startswith("--budget="):
+                budgets["default"] = float(arg.split("=", 1)[1])
+    except ValueError as e:
+        print(f"❌ Некорректный бюджет: {e}")
+        return 1
+
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
+        print("❌ Папка с переводами не найдена!")
+        return 1
+
+    groups = find_locale_groups(locales_dir)
+    if not groups:
+        print("❌ Файлы переводов не найдены!")
+        return 1
+
+    totals = {}
+    print(f"\n{'Файл':32} {'исходный':>10} {'минифиц.':>10} {'gzip':>10}")
+    for files in groups.values():
+        for lang, source_path in files.items():
+            try:
+                payload, compressed = build_artifact(source_path)
+            except Exception as e:
+                print(f"❌ Ошибка чтения файла {source_path}: {e}")
+                return 1
+
+            relative = source_path.relative_to(locales_dir)
+            if not check_only:
+                write_artifact(out_dir / relative, payload, compressed)
+            totals[lang] = totals.get(lang, 0) + len(compressed)
+            print(f"   {relative.as_posix():29} {source_path.stat().st_size / 1024:8.1f} KB "
+                  f"{len(payload) / 1024:7.1f} KB {len(compressed) / 1024:7.1f} KB")
+
+    print("\n📊 Итого по языкам (gzip):")
+    for lang, size in sorted(totals.items()):
+        budget_kb = budgets.get(lang, budgets.get("default"))
+        limit = f" / бюджет {budget_kb:.1f} KB" if budget_kb is not None else ""
+        print(f"   🌐 {lang}: {size / 1024:.1f} KB{limit}")
+
+    if not check_only:
+        print(f"\n💾 Файлы записаны в {out_dir}")
+
+    exceeded = check_budgets(totals, budgets)
+    if exceeded:
+        print("\n❌ ПРЕВЫШЕН БЮДЖЕТ:")
+        for lang, size, budget in exceeded:
+            print(f"   🌐 {lang}: {size / 1024:.1f} KB > {budget / 1024:.1f} KB "
+                  f"(+{(size - budget) / 1024:.1f} KB)")
+        return 1
+
+    print("\n✅ Все языки укладываются в бюджет")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,6 +1,8 @@
 import json
 from collections import OrderedDict
 
+from json_events import iter_top_level_members, read_bytes
+
 """
 Simple dedupe: read the JSON file, parse it with a streaming approach, and build an OrderedDict
 that preserves last value for duplicate top-level keys by re-parsing and updating.
@@ -12,51 +14,16 @@ OUT = SRC
 
 
 def load_json_keep_last(path):
-    # We'll load raw text and use a naive approach: parse full JSON multiple times
-    # to collect the top-level keys in order they appear. Python's json does not
-    # preserve duplicate keys, so we implement a custom parser to detect key positions.
-    text = open(path, 'r', encoding='utf-8').read()
-
-    # Find top-level keys by scanning for quoted keys at the top level.
-    # This is a heuristic that works for well-formed JSON where top-level keys are quoted and followed by :
-    import re
-    pattern = re.compile(r'"([^"]+)"\s*:\s*', re.M)
-
-    # Build list of matches with their index
-    matches = [(m.group(1), m.start()) for m in pattern.finditer(text)]
+    # Python's json does not preserve duplicate keys, so the top-level members
+    # are located in a single pass with json_events and each value is parsed
+    # on its own. Assigning into the OrderedDict keeps the position of the
+    # first occurrence and the value of the last one.
+    data = read_bytes(path)
 
-    # Filter only top-level keys by simple brace depth tracking
-    top_keys = []
-    depth = 0
-    key_positions = []
-    for m in pattern.finditer(text):
-        start = m.start()
-        # compute depth at this position
-        seg = text[:start]
-        depth = seg.count('{') - seg.count('}')
-        if depth == 1:  # directly inside outer object
-            key_positions.append((m.group(1), start))
-
-    # To keep last-seen, we'll iterate key_positions and capture the substring for each key value
     result = OrderedDict()
-    for i, (key, pos) in enumerate(key_positions):
-        # find the start of the value after the ':'
-        colon_index = text.find(':', pos)
-        # value starts after colon
-        value_start = colon_index + 1
-        # determine end by next top-level key or the last closing brace
-        if i + 1 < len(key_positions):
-            next_pos = key_positions[i + 1][1]
-            value_text = text[value_start:next_pos]
-        else:
-            # until the final closing brace
-            value_text = text[value_start:text.rfind('}')]
-
-        # reconstruct a small JSON for this key
-        snippet = '{' + f'"{key}":' + value_text + '}'
+    for key, value_start, value_end in iter_top_level_members(data):
         try:
-            parsed = json.loads(snippet)
-            result[key] = parsed[key]
+            result[key] = json.loads(data[value_start:value_end])
         except Exception as e:
             # fallback: skip on parse error
             print(f"Warning: failed to parse value for key {key}: {e}")
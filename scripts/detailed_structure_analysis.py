@@ -2,110 +2,197 @@
 """
 Детальный анализ структуры файлов переводов
 для поиска потенциальных дубликатов разделов
+
+Запуск:
+    python detailed_structure_analysis.py [--jobs N] [--stream] [--no-cache] [--export=names.json]
+        [--format=jsonl|sarif] [--output=report.jsonl]
 """
 
 import json
 import os
+import sys
 from pathlib import Path
-from collections import defaultdict, Counter
 
-def get_all_section_names(json_data, parent_path=""):
+from audit_cache import AuditCache, cache_enabled, cached_analysis
+from audit_report import open_report, parse_report_args
+from locale_files import find_locales_dir, find_translation_files, parse_jobs, run_per_file
+from path_store import PathStore
+from stream_audit import audit_file
+from tree_walk import LEAVE, iter_tree
+
+# Версия логики анализа: при ее изменении записи кэша становятся недействительными
+CACHE_VERSION = 2
+
+def get_all_section_names(json_data, store, parent=PathStore.ROOT):
     """
-    Получает все имена разделов (ключи верхнего уровня) из JSON
+    Получает все разделы (ключи любого уровня) из JSON в порядке обхода
+    в глубину: [(узел пути в store, тип значения)]. Имя раздела -
+    store.last(узел), строка пути собирается только при выводе
     """
-    sections = []
-    
-    if isinstance(json_data, dict):
-        for key, value in json_data.items():
-            current_path = f"{parent_path}.{key}" if parent_path else key
-            sections.append((key, current_path, type(value).__name__))
-            
-            # Если значение - это словарь, рекурсивно ищем вложенные разделы
-            if isinstance(value, dict):
-                nested_sections = get_all_section_names(value, current_path)
-                sections.extend(nested_sections)
-    
-    return sections
+    # Общий итеративный обход; списки - листья (разделами считаются только ключи)
+    return [(node, type(value).__name__)
+            for event, node, _, value in iter_tree(json_data, parent, store, descend=(dict,))
+            if event != LEAVE and node != parent]
+
+def build_name_index(sections, store):
+    """
+    Строит индекс имя -> узлы путей за один проход по списку разделов:
+    {name: {'paths': [...], 'types': [...]}}
+    """
+    index = {}
+    for node, value_type in sections:
+        name = store.last(node)
+        entry = index.get(name)
+        if entry is None:
+            entry = index[name] = {'paths': [], 'types': []}
+        entry['paths'].append(node)
+        entry['types'].append(value_type)
+    return index
+
+def materialize_index(index, store):
+    """Индекс с узлами -> индекс со строками путей (для вывода и --export)"""
+    return {name: {'paths': [store.dotted(node) for node in entry['paths']], 'types': entry['types']}
+            for name, entry in index.items()}
+
+def scan_file_data(data):
+    """
+    Получает все секции из содержимого файла (результат кэшируется
+    вместе с хранилищем путей, без строк полных путей)
+    """
+    store = PathStore()
+    sections = get_all_section_names(json.loads(data), store)
+    return {'store': store.dump(), 'sections': [list(section) for section in sections]}
+
+def load_sections(file_path, use_cache=True):
+    """(хранилище путей, разделы) файла; неизмененные файлы - из кэша"""
+    cache = AuditCache() if use_cache else None
+    result = cached_analysis("analyze_structure", CACHE_VERSION, file_path, scan_file_data, cache)
+    return PathStore.load(result['store']), result['sections']
+
+def scan_file(file_path, use_cache=True):
+    """Индекс имя -> пути для файла без печати; {'error': ...} - ошибка разбора"""
+    try:
+        store, sections = load_sections(file_path, use_cache)
+    except Exception as e:
+        return {'error': str(e)}
+    return {'index': materialize_index(build_name_index(sections, store), store)}
+
+def iter_findings(file_path, result):
+    """Повторяющиеся имена разделов как находки для слоя отчетов (audit_report)"""
+    file_name = str(file_path)
+    if 'error' in result:
+        yield {'rule': 'parse-error', 'severity': 'error', 'file': file_name, 'path': '',
+               'message': f"Ошибка чтения файла: {result['error']}"}
+        return
+    for name, entry in result['index'].items():
+        paths = entry['paths']
+        if len(paths) > 1:
+            yield {'rule': 'repeated-name', 'severity': 'info', 'file': file_name, 'path': paths[0],
+                   'message': f"'{name}' встречается {len(paths)} раз", 'paths': paths}
 
-def analyze_structure(file_path):
+def analyze_structure(file_path, use_cache=True):
     """Анализирует структуру файла"""
     print(f"\n📁 Файл: {file_path}")
     print("=" * 50)
     
+    # Получаем все секции (неизмененные файлы - из кэша)
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        store, sections = load_sections(file_path, use_cache)
     except Exception as e:
         print(f"❌ Ошибка чтения файла: {e}")
         return
     
-    # Получаем все секции
-    sections = get_all_section_names(data)
-    
-    # Считаем количество каждой секции
-    section_counter = Counter(section[0] for section in sections)
-    
-    # Группируем по типу значения
-    sections_by_type = defaultdict(list)
-    for name, path, value_type in sections:
-        sections_by_type[value_type].append((name, path))
+    # Индекс имя -> пути строится один раз; весь отчет - линейный проход по нему
+    name_index = build_name_index(sections, store)
     
     print(f"📊 Всего разделов: {len(sections)}")
-    print(f"📊 Уникальных названий разделов: {len(section_counter)}")
+    print(f"📊 Уникальных названий разделов: {len(name_index)}")
     
     # Показываем разделы-словари (основные разделы)
-    dict_sections = sections_by_type.get('dict', [])
+    dict_sections = sorted((store.last(node), store.dotted(node))
+                           for node, value_type in sections if value_type == 'dict')
     print(f"\n📁 Разделы-словари ({len(dict_sections)}):")
-    for name, path in sorted(dict_sections):
-        count = section_counter[name]
+    for name, path in dict_sections:
+        count = len(name_index[name]['paths'])
         if count > 1:
             print(f"   🔄 {name} (путь: {path}) - встречается {count} раз ⚠️")
         else:
             print(f"   📂 {name} (путь: {path})")
     
     # Показываем дубликаты
-    duplicates = {name: count for name, count in section_counter.items() if count > 1}
+    duplicates = {name: [store.dotted(node) for node in entry['paths']]
+                  for name, entry in name_index.items() if len(entry['paths']) > 1}
     if duplicates:
         print(f"\n⚠️  НАЙДЕНЫ ДУБЛИКАТЫ ({len(duplicates)}):")
-        for name, count in sorted(duplicates.items()):
-            print(f"   🔄 '{name}' встречается {count} раз")
+        for name, matching_paths in sorted(duplicates.items()):
+            print(f"   🔄 '{name}' встречается {len(matching_paths)} раз")
             # Показываем все пути где встречается этот раздел
-            matching_paths = [path for section_name, path, _ in sections if section_name == name]
             for i, path in enumerate(matching_paths, 1):
                 print(f"      {i}. {path}")
     else:
         print("\n✅ Дубликатов не найдено")
+    
+    return materialize_index(name_index, store)
+
+def report_main(translation_files, jobs, report_format, output):
+    """Машиночитаемый отчет (--format=jsonl|sarif или --output=...)"""
+    results = run_per_file(scan_file, translation_files, jobs, cache_enabled())
+    with open_report(report_format, output, "detailed_structure_analysis") as report:
+        for file_path, result in zip(translation_files, results):
+            for finding in iter_findings(file_path, result):
+                report.emit(finding)
+    return report.counts
 
 def main():
+    try:
+        jobs = parse_jobs()
+        report_format, output = parse_report_args()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    
+    # Отчет в JSONL/SARIF или в файл: без баннеров и построчной печати
+    if report_format != "human" or output:
+        locales_dir = find_locales_dir()
+        if locales_dir is None:
+            print("❌ Папка с переводами не найдена!", file=sys.stderr)
+            return
+        return report_main(find_translation_files(locales_dir), jobs, report_format, output)
+    
     print("🔍 ДЕТАЛЬНЫЙ АНАЛИЗ СТРУКТУРЫ ФАЙЛОВ ПЕРЕВОДОВ")
     print("=" * 60)
     
     # Путь к папке с переводами
-    locales_dir = Path("../src/locales")
-    if not locales_dir.exists():
-        locales_dir = Path("src/locales")
-    if not locales_dir.exists():
-        locales_dir = Path("locales")
-    
-    if not locales_dir.exists():
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
         print("❌ Папка с переводами не найдена!")
         return
     
-    # Находим все файлы переводов
-    translation_files = []
-    for lang_dir in locales_dir.iterdir():
-        if lang_dir.is_dir():
-            translation_file = lang_dir / "translation.json"
-            if translation_file.exists():
-                translation_files.append(translation_file)
+    # Находим все файлы переводов, включая SEO бандлы
+    translation_files = find_translation_files(locales_dir)
     
     if not translation_files:
         print("❌ Файлы переводов не найдены!")
         return
     
-    # Анализируем каждый файл
-    for file_path in translation_files:
-        analyze_structure(file_path)
+    # Анализируем каждый файл (при --jobs N - параллельно).
+    # --stream - потоковый режим без построения дерева для очень больших файлов
+    if "--stream" in sys.argv:
+        run_per_file(audit_file, translation_files, jobs)
+        return
+    
+    indexes = run_per_file(analyze_structure, translation_files, jobs, cache_enabled())
+    
+    # --export=names.json - индекс имя -> пути всех файлов для других инструментов
+    for arg in sys.argv[1:]:
+        if arg.startswith("--export="):
+            export_path = Path(arg.split("=", 1)[1])
+            export = {str(file_path): name_index
+                      for file_path, name_index in zip(translation_files, indexes)
+                      if name_index is not None}
+            with open(export_path, 'w', encoding='utf-8') as f:
+                json.dump(export, f, ensure_ascii=False, indent=2)
+            print(f"\n💾 Индекс имя → пути сохранен: {export_path}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Поиск дублирующихся ключей на любой глубине за один разбор JSON.
+Использует object_pairs_hook: стандартный json видит все пары ключ-значение
+до того, как дубликаты будут потеряны, поэтому достаточно одного json.loads
+без повторного сканирования текста для каждого ключа.
+"""
+
+import json
+import sys
+from collections import namedtuple, defaultdict
+from pathlib import Path
+
+from json_events import dotted
+
+# path - полный путь к ключу (кортеж), positions - номера вхождений ключа
+# среди пар объекта, values - значения всех вхождений по порядку
+DuplicateKey = namedtuple('DuplicateKey', ['path', 'key', 'positions', 'values'])
+
+class _Node(dict):
+    """Словарь, который помнит дубликаты в своем поддереве (пути относительные)"""
+    __slots__ = ('duplicates',)
+
+def _lift(value, prefix, out):
+    """Переносит дубликаты дочернего значения наверх, добавляя префикс пути"""
+    if isinstance(value, _Node):
+        if value.duplicates:
+            for dup in value.duplicates:
+                out.append(dup._replace(path=prefix + dup.path))
+        value.duplicates = None
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            if isinstance(item, (_Node, list)):
+                _lift(item, prefix + (index,), out)
+
+def _make_hook(keep):
+    def hook(pairs):
+        node = _Node()
+        found = []
+        occurrences = None
+        for position, (key, value) in enumerate(pairs):
+            _lift(value, (key,), found)
+            if key in node:
+                if occurrences is None:
+                    occurrences = defaultdict(list)
+                occurrences[key].append((position, value))
+                if keep == 'first':
+                    continue
+            node[key] = value
+
+        if occurrences:
+            # Первые вхождения дублированных ключей
+            first = {}
+            for position, (key, value) in enumerate(pairs):
+                if key in occurrences and key not in first:
+                    first[key] = (position, value)
+            for key, rest in occurrences.items():
+                entries = [first[key]] + rest
+                found.append(DuplicateKey(
+                    (key,), key,
+                    [position for position, _ in entries],
+                    [value for _, value in entries],
+                ))
+        node.duplicates = found
+        return node
+    return hook
+
+def load_with_duplicates(text, keep='last'):
+    """
+    Разбирает JSON и собирает все дублирующиеся ключи на любой глубине.
+    keep='last' повторяет поведение json.load, keep='first' оставляет
+    первое вхождение каждого ключа.
+    Возвращает (data, duplicates), duplicates упорядочены по пути.
+    """
+    if keep not in ('first', 'last'):
+        raise ValueError(f"keep должен быть 'first' или 'last', получено: {keep}")
+    data = json.loads(text, object_pairs_hook=_make_hook(keep))
+    duplicates = []
+    _lift(data, (), duplicates)
+    duplicates.sort(key=lambda dup: [str(part) for part in dup.path])
+    return data, duplicates
+
+def find_duplicate_keys(text):
+    """Возвращает список DuplicateKey для всех дубликатов в тексте JSON"""
+    return load_with_duplicates(text)[1]
+
+def describe(duplicates):
+    """Представляет дубликаты в виде словарей для отчетов"""
+    return [{
+        'path': dotted(dup.path),
+        'key': dup.key,
+        'count': len(dup.positions),
+        'same_values': all(value == dup.values[0] for value in dup.values[1:]),
+    } for dup in duplicates]
+
+def main():
+    """Основная функция"""
+    print("🔍 ПОИСК ДУБЛИРУЮЩИХСЯ КЛЮЧЕЙ НА ВСЕХ УРОВНЯХ")
+    print("=" * 60)
+
+    files = [Path(arg) for arg in sys.argv[1:]]
+    if not files:
+        locales_dir = Path("../src/locales")
+        if not locales_dir.exists():
+            locales_dir = Path("src/locales")
+        if not locales_dir.exists():
+            print("❌ Папка с переводами не найдена!")
+            return 1
+        files = sorted(locales_dir.glob("*/translation.json"))
+
+    total = 0
+    for file_path in files:
+        print(f"\n📁 {file_path}")
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                duplicates = find_duplicate_keys(f.read())
+        except Exception as e:
+            print(f"❌ Ошибка чтения файла: {e}")
+            return 1
+        if not duplicates:
+            print("✅ Дублирующихся ключей не найдено!")
+            continue
+        total += len(duplicates)
+        for item in describe(duplicates):
+            same = "одинаковые значения" if item['same_values'] else "разные значения"
+            print(f"   🔄 '{item['path']}' - {item['count']} раз ({same})")
+
+    print("\n" + "=" * 60)
+    print(f"📊 Всего дублирующихся ключей: {total}")
+    return 1 if total else 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Поиск одинаковых строк-значений в файлах переводов.
+Для каждого файла строится индекс значение -> пути всех строк-листьев
+(словарь по хэшу строки, пути - узлы PathStore), и для каждой группы
+одинаковых значений ("Подробнее", контактные блоки и т.п.) считается,
+сколько байт минифицированного файла освободится, если все вхождения
+заменить одним общим ключем раздела shared.
+
+С --emit собираются переписанные файлы: значения, одинаковые по одним и
+тем же путям во всех языках группы, переносятся в shared.<имя>, а рядом
+пишется карта псевдонимов {старый ключ: новый ключ} для компонентов.
+Псевдоним создается только если он верен для всех языков - иначе
+один и тот же вызов t() вернул бы в разных языках разные строки.
+
+Запуск:
+    python duplicate_values.py [--min-length=1] [--all] [--emit[=dist/locales-shared]]
+        [--format=jsonl|sarif] [--output=report.jsonl]
+"""
+
+import json
+import re
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from audit_report import open_report, parse_report_args
+from build_locale_artifacts import compress, minify, write_artifact
+from locale_files import find_locales_dir
+from locale_parity import find_locale_groups
+from path_store import PathStore
+from tree_walk import LEAF, iter_tree
+
+SHARED_SECTION = "shared"
+DEFAULT_MIN_LENGTH = 1
+DEFAULT_EMIT_DIR = Path(__file__).resolve().parent.parent / "dist" / "locales-shared"
+
+def member_size(key, value):
+    """Байты члена "ключ":значение, в минифицированном JSON (с запятой)"""
+    return len(minify({key: value})) - 1
+
+def build_value_index(json_data, store, min_length=DEFAULT_MIN_LENGTH):
+    """
+    Индекс строк-листьев: {значение: [узлы путей]} в порядке файла.
+    Элементы списков не учитываются - на них нельзя сослаться ключом
+    """
+    index = defaultdict(list)
+    for event, node, key, value in iter_tree(json_data, store=store, descend=(dict,)):
+        if event == LEAF and isinstance(value, str) and isinstance(key, str) and len(value) >= min_length:
+            index[value].append(node)
+    return index
+
+def shared_key_name(store, nodes, taken):
+    """
+    Имя общего ключа: самое частое имя среди вхождений (learnMore),
+    с номером, если имя уже занято
+    """
+    names = Counter(re.sub(r"[^\w-]", "_", store.last(node)) for node in nodes)
+    base = names.most_common(1)[0][0] or "value"
+    name = base
+    suffix = 2
+    while name in taken:
+        name = f"{base}_{suffix}"
+        suffix += 1
+    taken.add(name)
+    return name
+
+def find_value_groups(json_data, store, min_length=DEFAULT_MIN_LENGTH):
+    """
+    Группы повторяющихся значений файла, самые выгодные - первыми:
+    [{'value', 'paths' (узлы), 'shared_key', 'saved'}].
+    saved - байты минифицированного файла за вычетом нового общего ключа
+    """
+    existing = json_data.get(SHARED_SECTION) if isinstance(json_data, dict) else None
+    taken = set(existing) if isinstance(existing, dict) else set()
+    groups = []
+    for value, nodes in build_value_index(json_data, store, min_length).items():
+        if len(nodes) < 2:
+            continue
+        shared_key = shared_key_name(store, nodes, taken)
+        saved = sum(member_size(store.last(node), value) for node in nodes) - member_size(shared_key, value)
+        if saved > 0:
+            groups.append({'value': value, 'paths': nodes, 'shared_key': shared_key, 'saved': saved})
+        else:
+            taken.discard(shared_key)
+    groups.sort(key=lambda group: -group['saved'])
+    return groups
+
+def find_common_groups(lang_data, min_length=DEFAULT_MIN_LENGTH):
+    """
+    Группы путей, значения которых совпадают между собой в каждом языке
+    группы файлов {lang: json}, перенос которых в shared уменьшает файлы.
+    Возвращает (store, [{'paths', 'values', 'shared_key', 'saved'}])
+    """
+    store = PathStore()
+    leaves = {}
+    for lang, json_data in lang_data.items():
+        leaves[lang] = {node: value
+                        for value, nodes in build_value_index(json_data, store, min_length).items()
+                        for node in nodes}
+    common = set.intersection(*(set(values) for values in leaves.values())) if leaves else set()
+
+    # Класс пути - кортеж его значений во всех языках
+    classes = defaultdict(list)
+    for node in sorted(common):
+        classes[tuple(leaves[lang][node] for lang in lang_data)].append(node)
+
+    taken = set()
+    for json_data in lang_data.values():
+        existing = json_data.get(SHARED_SECTION)
+        if isinstance(existing, dict):
+            taken.update(existing)
+    groups = []
+    for values, nodes in classes.items():
+        if len(nodes) < 2:
+            continue
+        shared_key = shared_key_name(store, nodes, taken)
+        # Перенос должен уменьшать файлы в сумме по языкам
+        saved = sum(sum(member_size(store.last(node), value) for node in nodes) - member_size(shared_key, value)
+                    for value in values)
+        if saved > 0:
+            groups.append({'paths': nodes, 'values': dict(zip(lang_data, values)),
+                           'shared_key': shared_key, 'saved': saved})
+        else:
+            taken.discard(shared_key)
+    return store, groups
+
+def consolidate(json_data, store, groups, lang):
+    """
+    Копия данных, в которой вхождения групп удалены, а значения перенесены
+    в раздел shared. Разделы, опустевшие после удаления, тоже удаляются.
+    Возвращает (новые данные, карта псевдонимов {старый ключ: новый})
+    """
+    data = json.loads(json.dumps(json_data))
+    aliases = {}
+    shared = data.setdefault(SHARED_SECTION, {})
+    for group in groups:
+        shared_path = f"{SHARED_SECTION}.{group['shared_key']}"
+        shared[group['shared_key']] = group['values'][lang]
+        for node in group['paths']:
+            parts = store.parts(node)
+            parents = [data]
+            for part in parts[:-1]:
+                parents.append(parents[-1][part])
+            del parents[-1][parts[-1]]
+            # Удаляем опустевшие родительские разделы (кроме корня)
+            for depth in range(len(parents) - 1, 0, -1):
+                if parents[depth]:
+                    break
+                del parents[depth - 1][parts[depth - 1]]
+            aliases[store.dotted(node)] = shared_path
+    if not shared:
+        del data[SHARED_SECTION]
+    return data, aliases
+
+def load_json(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def scan_file(file_path, min_length=DEFAULT_MIN_LENGTH):
+    """Группы повторов файла со строками путей (для вывода)"""
+    json_data = load_json(file_path)
+    store = PathStore()
+    groups = find_value_groups(json_data, store, min_length)
+    for group in groups:
+        group['paths'] = [store.dotted(node) for node in group['paths']]
+    return {'size': len(minify(json_data)), 'groups': groups}
+
+def iter_findings(file_path, result):
+    """Группы повторов как находки для слоя отчетов (audit_report)"""
+    for group in result['groups']:
+        paths = group['paths']
+        yield {'rule': 'duplicate-value', 'severity': 'info', 'file': str(file_path), 'path': paths[0],
+               'message': f"значение {json.dumps(group['value'], ensure_ascii=False)[:60]} повторяется "
+                          f"{len(paths)} раз, экономия {group['saved']} B",
+               'paths': paths, 'saved': group['saved'], 'shared_key': f"{SHARED_SECTION}.{group['shared_key']}"}
+
+def print_file_report(file_path, result, limit):
+    groups = result['groups']
+    saved = sum(group['saved'] for group in groups)
+    print(f"\n📁 {file_path}: групп повторов {len(groups)}, "
+          f"экономия {saved / 1024:.1f} KB из {result['size'] / 1024:.1f} KB (минифицированный)")
+    shown = groups if limit is None else groups[:limit]
+    for group in shown:
+        value = json.dumps(group['value'], ensure_ascii=False)
+        if len(value) > 60:
+            value = value[:57] + '..."'
+        print(f"   🔁 {value} ×{len(group['paths'])}, -{group['saved']} B → {SHARED_SECTION}.{group['shared_key']}")
+        for path in group['paths'][:5]:
+            print(f"      = {path}")
+        if len(group['paths']) > 5:
+            print(f"      ... и еще {len(group['paths']) - 5}")
+    if len(shown) < len(groups):
+        print(f"   ... и еще {len(groups) - len(shown)} групп (--all для полного списка)")
+    return saved
+
+def emit_main(locales_dir, groups, out_dir, min_length, log=print):
+    """Пишет переписанные файлы и карты псевдонимов в out_dir"""
+    log(f"\n📦 Переписанные файлы: {out_dir}")
+    for group_name, files in groups.items():
+        lang_data = {lang: load_json(file_path) for lang, file_path in files.items()}
+        store, common = find_common_groups(lang_data, min_length)
+        aliases = {}
+        for lang, file_path in files.items():
+            data, aliases = consolidate(lang_data[lang], store, common, lang)
+            payload = minify(data)
+            compressed = compress(payload)
+            before = minify(lang_data[lang])
+            write_artifact(out_dir / file_path.relative_to(locales_dir), payload, compressed)
+            log(f"   💾 {file_path.relative_to(locales_dir)}: {len(before) / 1024:.1f} → "
+                  f"{len(payload) / 1024:.1f} KB, gzip {len(compress(before)) / 1024:.1f} → "
+                  f"{len(compressed) / 1024:.1f} KB")
+        alias_path = out_dir / f"{group_name}.aliases.json"
+        alias_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(alias_path, 'w', encoding='utf-8') as f:
+            json.dump(aliases, f, ensure_ascii=False, indent=2, sort_keys=True)
+        log(f"   🔗 {alias_path.name}: псевдонимов {len(aliases)} (групп, общих для всех языков: {len(common)})")
+
+def main():
+    """Основная функция"""
+    try:
+        report_format, output = parse_report_args()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    human = report_format == "human" and not output
+    limit = None if "--all" in sys.argv else 10
+    min_length = DEFAULT_MIN_LENGTH
+    emit_dir = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--min-length="):
+            try:
+                min_length = int(arg.split("=", 1)[1])
+            except ValueError:
+                print(f"❌ Некорректное значение {arg}")
+                return 1
+        elif arg == "--emit":
+            emit_dir = DEFAULT_EMIT_DIR
+        elif arg.startswith("--emit="):
+            emit_dir = Path(arg.split("=", 1)[1])
+
+    if human:
+        print("🔁 ПОИСК ОДИНАКОВЫХ ЗНАЧЕНИЙ В ФАЙЛАХ ПЕРЕВОДОВ")
+        print("=" * 60)
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
+        print("❌ Папка с переводами не найдена!", file=sys.stderr)
+        return 1
+    groups = find_locale_groups(locales_dir)
+    if not groups:
+        print("❌ Файлы переводов не найдены!", file=sys.stderr)
+        return 1
+
+    files = [file_path for group in groups.values() for file_path in group.values()]
+    try:
+        results = [(file_path, scan_file(file_path, min_length)) for file_path in files]
+    except Exception as e:
+        print(f"❌ Ошибка чтения файла: {e}", file=sys.stderr)
+        return 1
+
+    if human:
+        total = sum(print_file_report(file_path, result, limit) for file_path, result in results)
+        print("\n" + "=" * 60)
+        print(f"📊 Возможная экономия всех файлов: {total / 1024:.1f} KB (минифицированный JSON)")
+    else:
+        with open_report(report_format, output, "duplicate_values") as report:
+            for file_path, result in results:
+                for finding in iter_findings(file_path, result):
+                    report.emit(finding)
+
+    if emit_dir is not None:
+        # При машиночитаемом отчете в stdout сводка записи идет в stderr
+        emit_main(locales_dir, groups, emit_dir, min_length,
+                  log=print if human else (lambda line: print(line, file=sys.stderr)))
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -3,115 +3,64 @@
 ФИНАЛЬНЫЙ СКРИПТ: Безопасное удаление всех дублирующихся разделов.
 Этот скрипт найдет и удалит дублирующиеся разделы в JSON файлах переводов,
 сохраняя только первое вхождение каждого ключа.
+
+Запуск:
+    python final_duplicate_cleaner.py [--dry-run] [--yes] [--jobs N]
+--yes - без вопросов: изменения всех файлов планируются (параллельно при
+--jobs N), проверяются и записываются одной транзакцией - все или ни одного.
 """
 
-import re
+import hashlib
 import json
+import os
 import shutil
+import tempfile
 from pathlib import Path
-from collections import defaultdict
 import sys
 
+from backup_store import BackupStore
+from duplicate_keys import find_duplicate_keys, describe
+from json_events import dotted, find_object_sections
+from locale_files import find_locales_dir, find_translation_files, parse_jobs, run_per_file
+from span_index import SpanIndex, splice
+
 def find_json_sections_in_text(text):
     """
-    Находит все разделы (ключи первого уровня) в тексте JSON
+    Находит все разделы (ключи, значение которых - объект) в тексте JSON
+    на любой глубине, за один проход общего парсера json_events
     """
-    pattern = r'^\s*"([^"]+)"\s*:\s*\{'
-    sections = []
-    lines = text.split('\n')
-    
-    for line_num, line in enumerate(lines, 1):
-        match = re.match(pattern, line)
-        if match:
-            key = match.group(1)
-            sections.append({
-                'key': key,
-                'line': line_num,
-                'text': line.strip(),
-                'original_line': line
-            })
-    
-    return sections
+    return find_object_sections(text)
 
-def find_duplicates(sections):
+def find_duplicates(index):
     """
-    Находит дублирующиеся разделы
+    Находит дублирующиеся ключи (разделы и скалярные значения).
+    Дубликаты - ключи, повторяющиеся внутри одного объекта;
+    результат - список групп вхождений одного ключа в одном объекте
     """
-    key_counts = defaultdict(list)
-    
-    for section in sections:
-        key_counts[section['key']].append(section)
-    
-    duplicates = {}
-    for key, occurrences in key_counts.items():
-        if len(occurrences) > 1:
-            duplicates[key] = occurrences
-    
-    return duplicates
+    return index.duplicate_groups()
 
-def remove_duplicates_from_text(text, duplicates):
+def remove_duplicates_from_text(index, duplicates):
     """
-    Удаляет дублирующиеся разделы из текста, оставляя только первое вхождение
+    Удаляет дублирующиеся ключи из текста, оставляя только первое вхождение.
+    Диапазоны берутся из индекса, построенного один раз для файла,
+    после чего текст склеивается за один проход
     """
-    lines = text.split('\n')
-    lines_to_remove = set()
+    to_remove = []
     
-    # Определяем строки для удаления
-    for key, occurrences in duplicates.items():
+    for occurrences in duplicates:
+        key = dotted(occurrences[0].path)
         # Оставляем первое вхождение, удаляем остальные
         keep_first = occurrences[0]
-        remove_sections = occurrences[1:]
+        remove_members = occurrences[1:]
         
         print(f"  🔄 Ключ '{key}':")
-        print(f"     ✅ Сохраняем: строка {keep_first['line']}")
+        print(f"     ✅ Сохраняем: строка {keep_first.line}")
         
-        for section in remove_sections:
-            print(f"     ❌ Удаляем: строка {section['line']}")
-            # Находим начало и конец раздела для удаления
-            start_line = section['line'] - 1  # -1 потому что нумерация с 1
-            end_line = find_section_end(lines, start_line)
-            
-            # Добавляем все строки раздела в список для удаления
-            for i in range(start_line, end_line + 1):
-                lines_to_remove.add(i)
-    
-    # Удаляем строки
-    cleaned_lines = []
-    for i, line in enumerate(lines):
-        if i not in lines_to_remove:
-            cleaned_lines.append(line)
-    
-    return '\n'.join(cleaned_lines)
-
-def find_section_end(lines, start_line):
-    """
-    Находит конец JSON раздела, начинающегося с start_line
-    """
-    if start_line >= len(lines):
-        return start_line
-    
-    # Считаем уровень вложенности скобок
-    brace_count = 0
-    in_section = False
+        for member in remove_members:
+            print(f"     ❌ Удаляем: строка {member.line}")
+            to_remove.append(member)
     
-    for i in range(start_line, len(lines)):
-        line = lines[i]
-        
-        # Начинаем считать скобки после первой открывающей скобки раздела
-        if '{' in line and not in_section:
-            in_section = True
-        
-        if in_section:
-            # Считаем открывающие и закрывающие скобки
-            brace_count += line.count('{')
-            brace_count -= line.count('}')
-            
-            # Если скобки сбалансированы, значит раздел закончился
-            if brace_count == 0:
-                return i
-    
-    # Если не нашли конец, возвращаем последнюю строку
-    return len(lines) - 1
+    return splice(index.data, index.removal_spans(to_remove))
 
 def validate_json_text(text):
     """
@@ -125,42 +74,155 @@ def validate_json_text(text):
     except Exception as e:
         return False, f"Error: {e}"
 
+def validate_cleaned(cleaned_text):
+    """Возвращает описание проблемы очищенного текста или None"""
+    is_valid, validation_error = validate_json_text(cleaned_text)
+    if not is_valid:
+        return f"Получен невалидный JSON: {validation_error}"
+    remaining = find_duplicate_keys(cleaned_text)
+    if remaining:
+        return f"После очистки остались дубликаты: {[item['path'] for item in describe(remaining)]}"
+    return None
+
+def plan_file(file_path):
+    """
+    Готовит очистку одного файла без записи (выполняется и в пуле процессов).
+    Возвращает {'path', 'original', 'cleaned', 'removed', 'error'};
+    cleaned - None, если файл менять не нужно
+    """
+    print(f"\n📁 Планируем файл: {file_path}")
+    plan = {'path': str(file_path), 'original': None, 'cleaned': None, 'removed': 0, 'error': None}
+    try:
+        index = SpanIndex.from_file(file_path)
+        plan['original'] = index.data
+        duplicates = find_duplicates(index)
+        if not duplicates:
+            print("✅ Дублирующихся ключей не найдено")
+            return plan
+        cleaned_text = remove_duplicates_from_text(index, duplicates)
+    except Exception as e:
+        plan['error'] = f"Ошибка обработки файла: {e}"
+        print(f"❌ {plan['error']}")
+        return plan
+    
+    plan['error'] = validate_cleaned(cleaned_text)
+    if plan['error']:
+        print(f"❌ {plan['error']}")
+        return plan
+    plan['cleaned'] = cleaned_text
+    plan['removed'] = sum(len(occurrences) - 1 for occurrences in duplicates)
+    return plan
+
+def commit_batch(plans, store=None):
+    """
+    Записывает все очищенные файлы атомарно: либо все, либо ни одного.
+    Сначала все версии пишутся во временные файлы рядом с исходными,
+    затем заменяются через os.replace; при ошибке уже замененные
+    файлы возвращаются к исходному содержимому.
+    """
+    changes = [plan for plan in plans if plan['cleaned'] is not None]
+    if not changes:
+        return True
+    store = store or BackupStore()
+    
+    for plan in changes:
+        store.backup_file(plan['path'], "final_duplicate_cleaner", plan['original'])
+    
+    staged = []
+    replaced = []
+    try:
+        for plan in changes:
+            # Файл не должен был измениться с момента планирования
+            with open(plan['path'], 'rb') as f:
+                if f.read() != plan['original']:
+                    raise RuntimeError(f"Файл изменился во время обработки: {plan['path']}")
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(plan['path'])), suffix=".tmp")
+            staged.append((tmp_path, plan))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(plan['cleaned'])
+                f.flush()
+                os.fsync(f.fileno())
+            shutil.copymode(plan['path'], tmp_path)
+        
+        for tmp_path, plan in staged:
+            os.replace(tmp_path, plan['path'])
+            replaced.append(plan)
+        return True
+    except Exception as e:
+        print(f"❌ Ошибка записи: {e}")
+        for plan in replaced:
+            try:
+                store.restore_file(hashlib.sha256(plan['original']).hexdigest(), plan['path'])
+                print(f"🔄 Восстановлен: {plan['path']}")
+            except Exception as restore_error:
+                print(f"💥 Не удалось восстановить {plan['path']}: {restore_error}")
+        return False
+    finally:
+        for tmp_path, _ in staged:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+def batch_main(translation_files, jobs):
+    """Неинтерактивный режим --yes: план параллельно, запись одной транзакцией"""
+    plans = run_per_file(plan_file, translation_files, jobs)
+    
+    failed = [plan for plan in plans if plan['error']]
+    if failed:
+        print(f"\n❌ Проблемы в {len(failed)} файлах - ни один файл не изменен:")
+        for plan in failed:
+            print(f"   - {plan['path']}: {plan['error']}")
+        return 1
+    
+    changes = [plan for plan in plans if plan['cleaned'] is not None]
+    if not changes:
+        print("\n✅ Дублирующихся ключей не найдено ни в одном файле")
+        return 0
+    
+    if not commit_batch(plans):
+        print("❌ Транзакция отменена - файлы остались в исходном состоянии")
+        return 1
+    
+    print(f"\n✅ Обновлено файлов: {len(changes)}, удалено дубликатов: "
+          f"{sum(plan['removed'] for plan in changes)}")
+    for plan in changes:
+        print(f"   - {plan['path']}: {len(plan['original'])} → {len(plan['cleaned'])} байт")
+    return 0
+
 def process_file(file_path, dry_run=False):
     """
     Обрабатывает один файл переводов
     """
     print(f"\n📁 Обрабатываем файл: {file_path}")
     
-    # Читаем файл
+    # Читаем файл и строим индекс диапазонов (один проход)
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            original_text = f.read()
+        index = SpanIndex.from_file(file_path)
     except Exception as e:
         print(f"❌ Ошибка чтения файла: {e}")
         return False
     
-    # Находим разделы
-    sections = find_json_sections_in_text(original_text)
+    sections = [member for member in index.members if member.kind == 'object']
     print(f"📊 Найдено разделов: {len(sections)}")
     
-    # Находим дубликаты
-    duplicates = find_duplicates(sections)
+    # Находим дубликаты на любой глубине, включая скалярные ключи
+    duplicates = find_duplicates(index)
     
     if not duplicates:
         print("✅ Дублирующихся разделов не найдено!")
         return True
     
     # Подсчитываем статистику
-    total_duplicates = sum(len(occurrences) - 1 for occurrences in duplicates.values())
+    total_duplicates = sum(len(occurrences) - 1 for occurrences in duplicates)
     print(f"⚠️  Найдено {len(duplicates)} дублирующихся ключей")
     print(f"⚠️  Всего дубликатов для удаления: {total_duplicates}")
     
     if dry_run:
         print("\n🔍 РЕЖИМ ПРОСМОТРА:")
-        for key, occurrences in duplicates.items():
+        for occurrences in duplicates:
+            key = dotted(occurrences[0].path)
             keep = occurrences[0]
             remove = occurrences[1:]
-            print(f"  🔄 '{key}': сохранить строку {keep['line']}, удалить строки {[s['line'] for s in remove]}")
+            print(f"  🔄 '{key}': сохранить строку {keep.line}, удалить строки {[member.line for member in remove]}")
         return True
     
     # Запрашиваем подтверждение
@@ -170,12 +232,11 @@ def process_file(file_path, dry_run=False):
         print("❌ Операция отменена пользователем")
         return False
     
-    # Создаем резервную копию
-    from datetime import datetime
-    backup_path = f"{file_path}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    # Создаем резервную копию (одинаковые версии хранятся один раз)
+    store = BackupStore()
     try:
-        shutil.copy2(file_path, backup_path)
-        print(f"💾 Создана резервная копия: {backup_path}")
+        backup_digest = store.backup_file(file_path, "final_duplicate_cleaner", index.data)
+        print(f"💾 Создана резервная копия: {backup_digest[:12]}")
     except Exception as e:
         print(f"❌ Не удалось создать резервную копию: {e}")
         return False
@@ -183,33 +244,32 @@ def process_file(file_path, dry_run=False):
     # Удаляем дубликаты
     print("\n🧹 Удаляем дубликаты:")
     try:
-        cleaned_text = remove_duplicates_from_text(original_text, duplicates)
+        cleaned_text = remove_duplicates_from_text(index, duplicates)
     except Exception as e:
         print(f"❌ Ошибка при удалении дубликатов: {e}")
         return False
     
-    # Проверяем валидность JSON
-    is_valid, validation_error = validate_json_text(cleaned_text)
-    if not is_valid:
-        print(f"❌ Получен невалидный JSON: {validation_error}")
+    # Проверяем валидность JSON и отсутствие оставшихся дубликатов
+    error = validate_cleaned(cleaned_text)
+    if error:
+        print(f"❌ {error}")
         print("❌ Операция прервана для безопасности")
         return False
     
     # Сохраняем файл
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
+        with open(file_path, 'wb') as f:
             f.write(cleaned_text)
         print(f"✅ Файл успешно сохранен")
         
-        # Дополнительная проверка - пытаемся загрузить JSON
-        test_data = json.loads(cleaned_text)
-        new_section_count = len(test_data)
-        original_section_count = len(sections)
+        # Дополнительная проверка - пересчитываем ключи в сохраненном файле
+        original_key_count = len(index.members)
+        new_key_count = len(SpanIndex(cleaned_text).members)
         
         print(f"📊 Результат:")
-        print(f"   - Было разделов: {original_section_count}")
-        print(f"   - Стало разделов: {new_section_count}")
-        print(f"   - Удалено дубликатов: {original_section_count - new_section_count}")
+        print(f"   - Было ключей: {original_key_count}")
+        print(f"   - Стало ключей: {new_key_count}")
+        print(f"   - Удалено (вместе с вложенными): {original_key_count - new_key_count}")
         
         return True
         
@@ -217,7 +277,7 @@ def process_file(file_path, dry_run=False):
         print(f"❌ Ошибка сохранения файла: {e}")
         # Пытаемся восстановить из резервной копии
         try:
-            shutil.copy2(backup_path, file_path)
+            store.restore_file(backup_digest, file_path)
             print("🔄 Файл восстановлен из резервной копии")
         except:
             print("💥 Не удалось восстановить файл!")
@@ -230,26 +290,25 @@ def main():
     
     # Проверяем аргументы
     dry_run = "--dry-run" in sys.argv or "-d" in sys.argv
+    assume_yes = "--yes" in sys.argv or "-y" in sys.argv
     if dry_run:
         print("🔍 РЕЖИМ ПРОСМОТРА - изменения не применяются")
         print("=" * 60)
     
-    # Находим папку с переводами
-    locales_dir = Path("../src/locales")
-    if not locales_dir.exists():
-        locales_dir = Path("src/locales")
+    try:
+        jobs = parse_jobs()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
     
-    if not locales_dir.exists():
+    # Находим папку с переводами
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
         print("❌ Папка с переводами не найдена!")
         return 1
     
-    # Находим файлы переводов
-    translation_files = []
-    for lang_dir in locales_dir.iterdir():
-        if lang_dir.is_dir():
-            translation_file = lang_dir / "translation.json"
-            if translation_file.exists():
-                translation_files.append(translation_file)
+    # Находим файлы переводов, включая SEO бандлы
+    translation_files = find_translation_files(locales_dir)
     
     if not translation_files:
         print("❌ Файлы переводов не найдены!")
@@ -259,6 +318,10 @@ def main():
     for f in translation_files:
         print(f"   - {f}")
     
+    # --yes: без вопросов, все файлы или ни одного
+    if assume_yes and not dry_run:
+        return batch_main(translation_files, jobs)
+    
     if not dry_run:
         print(f"\n💡 Совет: сначала запустите с флагом --dry-run для просмотра")
         response = input("❓ Продолжить обработку файлов? (y/N): ").lower().strip()
@@ -285,7 +348,7 @@ def main():
             print("\n💡 Рекомендации:")
             print("   1. Проверьте работу фронтенда")  
             print("   2. Запустите тесты")
-            print("   3. Если что-то сломалось, восстановите из .backup файлов")
+            print("   3. Если что-то сломалось: python backup_store.py restore")
     else:
         print(f"⚠️  Обработано: {success_count}/{len(translation_files)}")
     
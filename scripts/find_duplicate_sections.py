@@ -3,6 +3,9 @@
 Скрипт для поиска дублирующихся разделов в файлах переводов.
 Дубликаты - это одинаковые разделы (главы) с одинаковыми ключами,
 а НЕ одинаковые значения в разных разделах.
+
+Запуск:
+    python find_duplicate_sections.py [--jobs N] [--no-cache] [--format=jsonl|sarif] [--output=report.jsonl]
 """
 
 import json
@@ -11,54 +14,104 @@ from pathlib import Path
 from collections import defaultdict, Counter
 import sys
 
-def find_duplicate_sections(json_data, path=""):
+from audit_cache import AuditCache, cache_enabled, cached_analysis
+from audit_report import open_report, parse_report_args
+from locale_files import find_locales_dir, find_translation_files, parse_jobs, run_per_file
+from structural_hash import DigestIndex
+
+# Версия логики анализа: при ее изменении записи кэша становятся недействительными
+CACHE_VERSION = 2
+
+def find_duplicate_sections(json_data, path="", index=None):
     """
-    Находит дублирующиеся разделы в JSON данных.
+    Находит дублирующиеся разделы в JSON данных: разделы с одинаковым
+    именем и одинаковым содержимым в любом месте дерева.
+    Содержимое сравнивается по структурным хэшам, посчитанным один раз.
     Возвращает словарь: {section_name: [(path, content), (path, content), ...]}
     """
-    duplicates = defaultdict(list)
-    section_contents = defaultdict(list)
+    if index is None:
+        index = DigestIndex(json_data)
     
-    if isinstance(json_data, dict):
-        for key, value in json_data.items():
-            current_path = f"{path}.{key}" if path else key
-            
-            if isinstance(value, dict):
-                # Это раздел - сохраняем его содержимое
-                section_contents[key].append((current_path, value))
-                
-                # Рекурсивно ищем вложенные дубликаты
-                nested_duplicates = find_duplicate_sections(value, current_path)
-                for dup_key, dup_list in nested_duplicates.items():
-                    duplicates[dup_key].extend(dup_list)
-    
-    # Находим разделы с одинаковыми именами
-    for section_name, occurrences in section_contents.items():
-        if len(occurrences) > 1:
-            # Проверяем, действительно ли это дубликаты (одинаковое содержимое)
-            contents = [occ[1] for occ in occurrences]
-            if len(set(json.dumps(content, sort_keys=True) for content in contents)) > 1:
-                # Разное содержимое - это не дубликаты
-                continue
-            elif len(set(json.dumps(content, sort_keys=True) for content in contents)) == 1:
-                # Одинаковое содержимое - это дубликаты
-                duplicates[section_name] = occurrences
+    # Разделы группируются по имени и хэшу содержимого
+    section_contents = defaultdict(list)
+    for section_path, digest in index.digests.items():
+        section_contents[(index.store.last(section_path), digest)].append(section_path)
+    
+    duplicates = {}
+    for (section_name, digest), paths in section_contents.items():
+        if len(paths) > 1:
+            # Разные группы с одинаковым именем различаются хэшем
+            name = section_name if section_name not in duplicates else f"{section_name} ({digest[:8]})"
+            duplicates[name] = [
+                (f"{path}.{index.dotted(section_path)}" if path else index.dotted(section_path),
+                 index.value_at(section_path))
+                for section_path in paths
+            ]
     
     return duplicates
 
-def analyze_file(file_path):
+def find_identical_subtrees(json_data, index=None):
+    """
+    Находит одинаковые поддеревья с любыми именами.
+    Возвращает список групп путей, самые крупные группы - первыми
+    """
+    if index is None:
+        index = DigestIndex(json_data)
+    groups = index.identical_groups()
+    return [[index.dotted(path) for path in paths] for paths in groups.values()]
+
+def scan_file_data(data):
+    """Находит дублирующиеся разделы в содержимом файла (результат кэшируется)"""
+    json_data = json.loads(data)
+    index = DigestIndex(json_data)
+    duplicates = find_duplicate_sections(json_data, index=index)
+    return {
+        'sections': {name: [[path, content] for path, content in occurrences]
+                     for name, occurrences in duplicates.items()},
+        'identical': find_identical_subtrees(json_data, index=index),
+    }
+
+def scan_file(file_path, use_cache=True):
+    """Результат scan_file_data для файла без печати; None - ошибка разбора"""
+    cache = AuditCache() if use_cache else None
+    try:
+        return cached_analysis("find_duplicate_sections", CACHE_VERSION, file_path, scan_file_data, cache)
+    except Exception as e:
+        return {'error': str(e)}
+
+def iter_findings(file_path, result):
+    """Находки по результату scan_file для слоя отчетов (audit_report)"""
+    file_name = str(file_path)
+    if 'error' in result:
+        yield {'rule': 'parse-error', 'severity': 'error', 'file': file_name, 'path': '',
+               'message': f"Ошибка чтения файла: {result['error']}"}
+        return
+    for section_name, occurrences in result['sections'].items():
+        paths = [path for path, _ in occurrences]
+        yield {'rule': 'duplicate-section', 'severity': 'warning', 'file': file_name, 'path': paths[0],
+               'message': f"Раздел '{section_name}' дублируется {len(occurrences)} раз", 'paths': paths}
+    for paths in result['identical']:
+        yield {'rule': 'identical-subtree', 'severity': 'info', 'file': file_name, 'path': paths[0],
+               'message': f"Одинаковое содержимое у {len(paths)} разделов", 'paths': paths}
+
+def analyze_file(file_path, use_cache=True):
     """Анализирует один файл переводов"""
     print(f"\n📁 Анализируем файл: {file_path}")
     
+    # Находим дублирующиеся разделы (неизмененные файлы - из кэша)
+    cache = AuditCache() if use_cache else None
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        result = cached_analysis("find_duplicate_sections", CACHE_VERSION, file_path, scan_file_data, cache)
     except Exception as e:
         print(f"❌ Ошибка чтения файла {file_path}: {e}")
         return None
     
-    # Находим дублирующиеся разделы
-    duplicates = find_duplicate_sections(data)
+    if result['identical']:
+        print(f"🧬 Одинаковых поддеревьев с разными путями: {len(result['identical'])}")
+        for paths in result['identical']:
+            print(f"   = {', '.join(paths)}")
+    
+    duplicates = result['sections']
     
     if not duplicates:
         print("✅ Дублирующихся разделов не найдено!")
@@ -78,31 +131,45 @@ def analyze_file(file_path):
     
     return duplicates
 
+def report_main(translation_files, jobs, report_format, output):
+    """Машиночитаемый отчет (--format=jsonl|sarif или --output=...)"""
+    results = run_per_file(scan_file, translation_files, jobs, cache_enabled())
+    with open_report(report_format, output, "find_duplicate_sections") as report:
+        for file_path, result in zip(translation_files, results):
+            for finding in iter_findings(file_path, result):
+                report.emit(finding)
+    return report.counts
+
 def main():
     """Основная функция"""
+    try:
+        jobs = parse_jobs()
+        report_format, output = parse_report_args()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    
+    # Отчет в JSONL/SARIF или в файл: без баннеров и построчной печати
+    if report_format != "human" or output:
+        locales_dir = find_locales_dir()
+        if locales_dir is None:
+            print("❌ Папка с переводами не найдена!", file=sys.stderr)
+            return
+        return report_main(find_translation_files(locales_dir), jobs, report_format, output)
+    
     print("🔍 Поиск дублирующихся разделов в файлах переводов")
     print("=" * 60)
     
     # Путь к папке с переводами
-    locales_dir = Path("../src/locales")
-    if not locales_dir.exists():
-        locales_dir = Path("src/locales")
-    if not locales_dir.exists():
-        locales_dir = Path("locales")
-    
-    if not locales_dir.exists():
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
         print("❌ Папка с переводами не найдена!")
         return
     
     print(f"📂 Папка с переводами: {locales_dir.absolute()}")
     
-    # Находим все файлы переводов
-    translation_files = []
-    for lang_dir in locales_dir.iterdir():
-        if lang_dir.is_dir():
-            translation_file = lang_dir / "translation.json"
-            if translation_file.exists():
-                translation_files.append(translation_file)
+    # Находим все файлы переводов, включая SEO бандлы
+    translation_files = find_translation_files(locales_dir)
     
     if not translation_files:
         print("❌ Файлы переводов не найдены!")
@@ -112,10 +179,10 @@ def main():
     for file in translation_files:
         print(f"   - {file}")
     
-    # Анализируем каждый файл
+    # Анализируем каждый файл (при --jobs N - параллельно)
     all_duplicates = {}
-    for file_path in translation_files:
-        duplicates = analyze_file(file_path)
+    results = run_per_file(analyze_file, translation_files, jobs, cache_enabled())
+    for file_path, duplicates in zip(translation_files, results):
         if duplicates:
             all_duplicates[str(file_path)] = duplicates
     
@@ -4,88 +4,79 @@
 Ищет дублирующиеся ключи до парсинга JSON.
 """
 
-import re
-import json
 from pathlib import Path
-from collections import defaultdict
+
+from audit_cache import AuditCache, cache_enabled, cached_analysis
+from duplicate_keys import find_duplicate_keys, describe
+from json_events import find_object_sections, group_duplicates
+
+# Версия логики анализа: при ее изменении записи кэша становятся недействительными
+CACHE_VERSION = 1
 
 def find_json_sections_in_text(text):
     """
-    Находит все разделы (ключи первого уровня) в тексте JSON
+    Находит все разделы (ключи, значение которых - объект) в тексте JSON
+    на любой глубине, за один проход общего парсера json_events
     """
-    # Паттерн для поиска ключей первого уровня
-    # Ищем "ключ": { в начале строки (с учетом пробелов)
-    pattern = r'^\s*"([^"]+)"\s*:\s*\{'
-    
-    sections = []
-    lines = text.split('\n')
-    
-    for line_num, line in enumerate(lines, 1):
-        match = re.match(pattern, line)
-        if match:
-            key = match.group(1)
-            sections.append({
-                'key': key,
-                'line': line_num,
-                'text': line.strip()
-            })
-    
-    return sections
+    return find_object_sections(text)
 
 def analyze_text_duplicates(sections):
     """
-    Анализирует найденные разделы на дубликаты
+    Анализирует найденные разделы на дубликаты.
+    Дубликаты - ключи, повторяющиеся внутри одного объекта;
+    результат сгруппирован по полному пути раздела
     """
-    key_counts = defaultdict(list)
-    
-    for section in sections:
-        key_counts[section['key']].append(section)
-    
-    duplicates = {}
-    for key, occurrences in key_counts.items():
-        if len(occurrences) > 1:
-            duplicates[key] = occurrences
-    
-    return duplicates
+    return group_duplicates(sections)
 
-def analyze_file(file_path):
+def scan_text_duplicates(data):
+    """
+    Находит все дубликаты на любой глубине, включая скалярные ключи,
+    за один разбор; для разделов-объектов добавляет номера строк.
+    Результат кэшируется по содержимому файла
+    """
+    duplicate_keys = find_duplicate_keys(data)
+    if not duplicate_keys:
+        return []
+    
+    # Номера строк известны для дублирующихся разделов-объектов
+    sections = find_json_sections_in_text(data)
+    section_lines = {
+        path: [occurrence['line'] for occurrence in occurrences]
+        for path, occurrences in analyze_text_duplicates(sections).items()
+    }
+    
+    items = describe(duplicate_keys)
+    for item in items:
+        item['lines'] = section_lines.get(item['path'], [])
+    return items
+
+def analyze_file(file_path, use_cache=True):
     """
     Анализирует файл на предмет дубликатов
     """
     print(f"\n📁 Анализируем файл: {file_path}")
     
+    cache = AuditCache() if use_cache else None
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        items = cached_analysis("find_text_duplicates", CACHE_VERSION, file_path, scan_text_duplicates, cache)
     except Exception as e:
-        print(f"❌ Ошибка чтения файла: {e}")
-        return False
-    
-    # Находим разделы в тексте
-    sections = find_json_sections_in_text(content)
-    print(f"📊 Найдено разделов: {len(sections)}")
-    
-    # Ищем дубликаты
-    duplicates = analyze_text_duplicates(sections)
+        print(f"❌ Ошибка анализа файла: {e}")
+        return None
     
-    if not duplicates:
-        print("✅ Дублирующихся разделов не найдено!")
-        return True
+    if not items:
+        print("✅ Дублирующихся ключей не найдено!")
+        return {}
     
-    print(f"⚠️  Найдено дублирующихся ключей: {len(duplicates)}")
+    print(f"⚠️  Найдено дублирующихся ключей: {len(items)}")
     
-    for key, occurrences in duplicates.items():
-        print(f"\n🔄 Ключ '{key}' встречается {len(occurrences)} раз:")
-        for i, occurrence in enumerate(occurrences, 1):
-            print(f"   {i}. Строка {occurrence['line']}: {occurrence['text']}")
-    
-    # Проверяем, что происходит при загрузке JSON
-    try:
-        parsed_data = json.loads(content)
-        print(f"\n📊 После парсинга JSON осталось разделов: {len(parsed_data)}")
-        print("💡 Python автоматически удаляет дубликаты при парсинге, оставляя последнее значение")
-    except Exception as e:
-        print(f"❌ Ошибка парсинга JSON: {e}")
+    duplicates = {}
+    for item in items:
+        lines = item['lines']
+        duplicates[item['path']] = {'count': item['count'], 'lines': lines}
+        same = "одинаковые значения" if item['same_values'] else "разные значения"
+        print(f"\n🔄 Ключ '{item['path']}' встречается {item['count']} раз ({same})")
+        if lines:
+            print(f"   Строки: {', '.join(str(line) for line in lines)}")
     
     return duplicates
 
@@ -113,8 +104,9 @@ def main():
     
     # Анализируем каждый файл
     total_duplicates = {}
+    use_cache = cache_enabled()
     for file_path in translation_files:
-        duplicates = analyze_file(file_path)
+        duplicates = analyze_file(file_path, use_cache)
         if duplicates:
             total_duplicates[str(file_path)] = duplicates
     
@@ -126,9 +118,11 @@ def main():
         print(f"⚠️  Файлов с дубликатами: {len(total_duplicates)}")
         for file_path, duplicates in total_duplicates.items():
             print(f"\n📁 {file_path}:")
-            for key, occurrences in duplicates.items():
-                lines = [str(occ['line']) for occ in occurrences]
-                print(f"   🔄 '{key}' на строках: {', '.join(lines)}")
+            for key, info in duplicates.items():
+                if info['lines']:
+                    print(f"   🔄 '{key}' на строках: {', '.join(str(line) for line in info['lines'])}")
+                else:
+                    print(f"   🔄 '{key}' - {info['count']} раз")
     else:
         print("✅ Дубликаты не найдены!")
 
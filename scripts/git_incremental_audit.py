@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Инкрементальный аудит переводов по диапазону ревизий git.
+Из обычного `git diff --unified=0` берутся измененные строки каждого файла
+переводов, по индексу строк разделов верхнего уровня они сопоставляются с
+разделами, и правила audit_rules выполняются только для затронутых
+разделов (плюс проверка повторов ключей верхнего уровня и сравнение
+переменных тех же разделов в других языках). Разбирается только то, что
+изменилось, поэтому время аудита коммита зависит от размера изменения,
+а не от размера файлов.
+
+Если структура вокруг изменения неоднозначна (правка внешних скобок или
+строк между разделами, несколько разделов в одной строке, минимизированный
+или новый файл, раздел не разбирается отдельно) - файл проверяется целиком.
+
+Проверки одинаковых разделов и повторяющихся имен (duplicate-sections,
+section-names) сравнивают весь файл и выполняются только при полной проверке.
+
+Запуск:
+    python git_incremental_audit.py [BASE..HEAD] [--max-length=500] [--format=jsonl|sarif] [--output=...]
+    python git_incremental_audit.py HEAD        # HEAD против рабочей копии
+    python git_incremental_audit.py main...HEAD  # изменения ветки от общего предка с main
+По умолчанию диапазон - HEAD~1..HEAD.
+"""
+
+import json
+import re
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+from audit_report import open_report, parse_report_args
+from audit_rules import DEFAULT_MAX_LENGTH, ERROR, RULES, PlaceholdersRule, run_rules
+from json_events import read_bytes
+from locale_files import find_locales_dir
+from locale_parity import find_locale_groups
+from watch_translations import analyze_section, scan_top_level
+
+DEFAULT_RANGE = "HEAD~1..HEAD"
+
+# @@ -12,3 +12,4 @@ - нужна только новая сторона
+_HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+# Ключ в начале строки: "name":
+_LINE_KEY = re.compile(rb'^([ \t]+)"((?:[^"\\\r\n]|\\.)*)"[ \t]*:', re.M)
+
+class Ambiguous(Exception):
+    """Изменение нельзя однозначно отнести к разделам - нужна полная проверка"""
+
+def git(args, cwd):
+    """Вывод команды git (bytes); ошибка git - RuntimeError"""
+    result = subprocess.run(["git", "-c", "core.quotePath=false"] + args, cwd=cwd,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", "replace").strip())
+    return result.stdout
+
+def parse_range(revision_range):
+    """
+    'A..B' и 'A...B' -> (A, B, три точки ли); 'A' -> (A, None, False) -
+    сравнение с рабочей копией
+    """
+    for separator in ("...", ".."):
+        if separator in revision_range:
+            base, end = revision_range.split(separator, 1)
+            return base or "HEAD", end or "HEAD", separator == "..."
+    return revision_range, None, False
+
+def resolve_range(root, revision_range):
+    """
+    (база diff, конечная ревизия) диапазона. Для 'A...B', как и в git diff,
+    база - общий предок A и B: изменения, сделанные только в A, не попадают
+    в аудит
+    """
+    base, end, symmetric = parse_range(revision_range)
+    if symmetric:
+        base = git(["merge-base", base, end], root).decode("utf-8").strip()
+    return base, end
+
+def parse_diff(diff_text):
+    """
+    Измененные строки новой версии каждого файла:
+    {путь: {'lines': set, 'added': bool}}; удаленные файлы пропускаются
+    """
+    files = {}
+    current = None
+    old_missing = False
+    for line in diff_text.splitlines():
+        if line.startswith("diff --git "):
+            current = None
+            old_missing = False
+        elif line.startswith("--- "):
+            old_missing = line == "--- /dev/null"
+        elif line.startswith("+++ "):
+            if line == "+++ /dev/null":
+                # Удаленный файл не проверяется
+                current = None
+                continue
+            path = line[4:]
+            if path.startswith("b/"):
+                path = path[2:]
+            current = files.setdefault(path, {"lines": set(), "added": old_missing})
+        elif current is not None:
+            match = _HUNK.match(line)
+            if match:
+                start = int(match.group(1))
+                count = 1 if match.group(2) is None else int(match.group(2))
+                if count == 0:
+                    # Чистое удаление после строки start - затронута сама строка start
+                    current["lines"].add(max(start, 1))
+                else:
+                    current["lines"].update(range(start, start + count))
+    return files
+
+class LineIndex:
+    """
+    Границы разделов верхнего уровня по строкам. Ключи верхнего уровня -
+    строки вида `  "name":` с отступом первого ключа файла; содержимое
+    раздела при этом не разбирается. Проверка раздела (verify) разбирает
+    только его байты и подтверждает, что это ровно один член "ключ": значение.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        opening = len(data) - len(data.lstrip())
+        if data[opening:opening + 1] != b'{':
+            raise Ambiguous("файл не начинается с объекта")
+        self.closing = data.rindex(b'}')
+        if data[self.closing + 1:].strip():
+            raise Ambiguous("данные после закрывающей скобки")
+
+        matches = list(_LINE_KEY.finditer(data, opening + 1, self.closing))
+        if not matches:
+            raise Ambiguous("нет ключей в начале строк (минимизированный файл?)")
+        indent = matches[0].group(1)
+        self.keys = []
+        line = 1
+        position = 0
+        for match in matches:
+            if match.group(1) != indent:
+                continue
+            line += data.count(b'\n', position, match.start())
+            position = match.start()
+            self.keys.append((json.loads(b'"' + match.group(2) + b'"'), match.start() + len(indent), line))
+        if data[opening + 1:self.keys[0][1]].strip():
+            raise Ambiguous("данные перед первым ключом")
+        self.closing_line = line + data.count(b'\n', position, self.closing)
+
+    def section_at(self, line):
+        """Номер раздела, которому принадлежит строка"""
+        if line < self.keys[0][2] or line >= self.closing_line:
+            raise Ambiguous(f"строка {line} вне разделов")
+        low, high = 0, len(self.keys) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.keys[middle][2] <= line:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def verify(self, number):
+        """Байты значения раздела number; Ambiguous, если раздел не отделяется"""
+        key, offset, _ = self.keys[number]
+        end = self.keys[number + 1][1] if number + 1 < len(self.keys) else self.closing
+        body = self.data[offset:end].rstrip()
+        if number + 1 < len(self.keys):
+            if not body.endswith(b','):
+                raise Ambiguous(f"раздел '{key}' не отделяется запятой")
+            body = body[:-1]
+        try:
+            members = scan_top_level(b'{' + body + b'}')
+        except ValueError as e:
+            raise Ambiguous(f"раздел '{key}' не разбирается отдельно: {e}")
+        if len(members) != 1 or members[0][0] != key:
+            raise Ambiguous(f"раздел '{key}' содержит несколько ключей верхнего уровня")
+        _, _, value_start, value_end = members[0]
+        return body[value_start - 1:value_end - 1]
+
+    def duplicate_keys(self):
+        """Повторяющиеся ключи верхнего уровня (по индексу строк)"""
+        counts = Counter(key for key, _, _ in self.keys)
+        return {key: count for key, count in counts.items() if count > 1}
+
+def audit_sections(data, lines, options):
+    """
+    Правила для разделов, затронутых строками lines.
+    Возвращает (находки, переменные, затронутые ключи); Ambiguous - нужна полная проверка
+    """
+    if not lines:
+        return [], {}, set()
+    index = LineIndex(data)
+    numbers = sorted(set(index.section_at(line) for line in lines))
+    touched = set(index.keys[number][0] for number in numbers)
+
+    findings = []
+    placeholders = {}
+    for number in numbers:
+        key = index.keys[number][0]
+        try:
+            result = analyze_section(key, index.verify(number), options)
+        except ValueError as e:
+            raise Ambiguous(f"раздел '{key}': {e}")
+        findings.extend(result["findings"])
+        placeholders.update(result["states"].get(PlaceholdersRule.name, {}))
+    for key, count in index.duplicate_keys().items():
+        if key in touched:
+            findings.append({"rule": "duplicate-keys", "severity": ERROR, "path": key,
+                             "message": f"ключ '{key}' повторяется {count} раз"})
+    return findings, placeholders, touched
+
+def section_placeholders(data, keys, options):
+    """Переменные только разделов keys (для сравнения с измененным языком)"""
+    try:
+        index = LineIndex(data)
+        placeholders = {}
+        for number, (key, _, _) in enumerate(index.keys):
+            if key in keys:
+                text = b'{' + json.dumps(key, ensure_ascii=False).encode('utf-8') + b':' + index.verify(number) + b'}'
+                placeholders.update(run_rules(text, ["placeholders"], options)["states"]["placeholders"])
+        return placeholders
+    except (Ambiguous, ValueError):
+        result = run_rules(data, ["placeholders"], options)
+        return {path: names for path, names in result["states"]["placeholders"].items()
+                if path.split(".", 1)[0] in keys}
+
+class RevisionReader:
+    """Содержимое файлов в конечной ревизии диапазона (или в рабочей копии)"""
+
+    def __init__(self, root, revision):
+        self.root = root
+        self.revision = revision
+
+    def read(self, relative_path):
+        if self.revision is None:
+            path = self.root / relative_path
+            return read_bytes(path) if path.exists() else None
+        try:
+            return git(["show", f"{self.revision}:{relative_path}"], self.root)
+        except RuntimeError:
+            return None
+
+def audit_range(root, locales_dir, revision_range, options, log=print):
+    """
+    Аудит изменений диапазона. Возвращает находки с полем 'file';
+    log получает строки плана (какие разделы проверяются и почему)
+    """
+    base, end = resolve_range(root, revision_range)
+    relative_locales = locales_dir.resolve().relative_to(root).as_posix()
+    diff_args = ["diff", "--unified=0", "--no-color", "--no-ext-diff", "--no-renames", base]
+    if end is not None:
+        diff_args.append(end)
+    changes = parse_diff(git(diff_args + ["--", relative_locales], root).decode("utf-8", "replace"))
+
+    # Файл (относительно корня) -> (группа, язык)
+    owners = {}
+    groups = find_locale_groups(locales_dir)
+    for group_name, group in groups.items():
+        for lang, file_path in group.items():
+            owners[file_path.resolve().relative_to(root).as_posix()] = (group_name, lang)
+
+    reader = RevisionReader(root, end)
+    findings = []
+    # группа -> {язык: переменные}, затронутые ключи (None - все)
+    group_states = {}
+    for relative_path, change in sorted(changes.items()):
+        if relative_path not in owners:
+            continue
+        group_name, lang = owners[relative_path]
+        data = reader.read(relative_path)
+        if data is None:
+            continue
+        states, scope = group_states.setdefault(group_name, ({}, set()))
+        try:
+            if change["added"]:
+                raise Ambiguous("новый файл")
+            file_findings, placeholders, touched = audit_sections(data, change["lines"], options)
+            log(f"📝 {relative_path}: строк {len(change['lines'])}, разделов {len(touched)}"
+                + (f" ({', '.join(sorted(touched)[:5])})" if touched else ""))
+            if scope is not None:
+                scope.update(touched)
+        except Ambiguous as e:
+            log(f"🔁 {relative_path}: полная проверка - {e}")
+            try:
+                result = run_rules(data, list(RULES), options)
+            except ValueError as error:
+                findings.append({"rule": "parse-error", "severity": ERROR, "path": "",
+                                 "message": str(error), "file": relative_path})
+                continue
+            file_findings = result["findings"]
+            placeholders = result["states"].get(PlaceholdersRule.name, {})
+            group_states[group_name] = (states, None)
+        states[lang] = placeholders
+        findings.extend(dict(finding, file=relative_path) for finding in file_findings)
+
+    # Переменные тех же разделов в остальных языках группы
+    for group_name, (states, scope) in group_states.items():
+        if scope is not None and not scope:
+            continue
+        for lang, file_path in groups[group_name].items():
+            relative_path = file_path.resolve().relative_to(root).as_posix()
+            if lang in states and scope is not None:
+                continue
+            data = reader.read(relative_path)
+            if data is None:
+                continue
+            try:
+                if scope is None:
+                    states[lang] = run_rules(data, ["placeholders"], options)["states"]["placeholders"]
+                else:
+                    states[lang] = section_placeholders(data, scope, options)
+            except ValueError:
+                continue
+        findings.extend(dict(finding, file=group_name) for finding in PlaceholdersRule.compare(states))
+    return findings
+
+def main():
+    """Основная функция"""
+    try:
+        report_format, output = parse_report_args()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    human = report_format == "human" and not output
+    revision_range = DEFAULT_RANGE
+    options = {"max_length": DEFAULT_MAX_LENGTH}
+    for arg in sys.argv[1:]:
+        if arg.startswith("--max-length="):
+            try:
+                options["max_length"] = int(arg.split("=", 1)[1])
+            except ValueError:
+                print(f"❌ Некорректное значение {arg}")
+                return 1
+        elif not arg.startswith("-"):
+            revision_range = arg
+
+    if human:
+        print("🧩 ИНКРЕМЕНТАЛЬНЫЙ АУДИТ ПЕРЕВОДОВ ПО ИЗМЕНЕНИЯМ GIT")
+        print("=" * 60)
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
+        print("❌ Папка с переводами не найдена!", file=sys.stderr)
+        return 1
+    try:
+        root = Path(git(["rev-parse", "--show-toplevel"], locales_dir).decode("utf-8").strip()).resolve()
+        findings = audit_range(root, locales_dir, revision_range, options,
+                               log=print if human else (lambda line: None))
+    except RuntimeError as e:
+        print(f"❌ Ошибка git: {e}", file=sys.stderr)
+        return 1
+
+    if human and not findings:
+        print(f"\n✅ Изменения {revision_range}: находок нет")
+        return 0
+    with open_report(report_format, output, "git_incremental_audit") as report:
+        for finding in findings:
+            report.emit(finding)
+    return 1 if report.counts.get(ERROR) else 0
+
+if __name__ == "__main__":
+    exit(main())
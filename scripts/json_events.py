@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Общий потоковый разбор JSON для скриптов поиска и удаления дубликатов.
+Файл проходится один раз, для каждого ключа на любой глубине выдается
+событие (event, path, offset, line), где offset - смещение в байтах.
+В отличие от json.load, дублирующиеся ключи не теряются.
+"""
+
+import json
+import re
+from collections import namedtuple, defaultdict
+
+# Пробелы перед токеном + сам токен: структурный символ, строка или литерал
+_TOKEN = re.compile(
+    rb'[ \t\r\n]*(?:([{}\[\],:])|("(?:[^"\\]|\\.)*")|(-?[0-9][0-9.eE+-]*|true|false|null))',
+    re.S,
+)
+_TRAILING_SPACE = re.compile(rb'[ \t\r\n]*')
+
+Event = namedtuple('Event', ['event', 'path', 'offset', 'line'])
+
+class EventParser:
+    """
+    Потоковый (pull) парсер JSON.
+    При итерации выдает события Event(event, path, offset, line):
+      start_object / end_object, start_array / end_array - границы контейнеров,
+      key - ключ объекта (path уже включает этот ключ),
+      value - скалярное значение.
+    offset - смещение начала токена в байтах, line - номер строки (с 1).
+    После каждого события в атрибутах доступны:
+      end - смещение конца токена,
+      value - раскодированный ключ или скалярное значение.
+    """
+
+    def __init__(self, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.data = data
+        self.end = 0
+        self.value = None
+
+    def __iter__(self):
+        data = self.data
+        match = _TOKEN.match
+        path = []
+        # Стек контейнеров: '{' или '['
+        stack = []
+        # Что ожидается дальше: value, key, colon, comma
+        expect = 'value'
+        pos = 0
+        line = 1
+
+        while True:
+            m = match(data, pos)
+            if m is None:
+                tail = _TRAILING_SPACE.match(data, pos)
+                if tail.end() == len(data) and not stack and expect == 'comma':
+                    return
+                raise ValueError(f'Неожиданный символ на позиции {tail.end()} (строка {line})')
+
+            token = m.group(0)
+            if b'\n' in token:
+                line += token.count(b'\n')
+            pos = m.end()
+            self.end = pos
+
+            structural = m.group(1)
+            if structural is not None:
+                offset = m.start(1)
+                if structural == b'{' or structural == b'[':
+                    if expect != 'value':
+                        raise ValueError(f'Неожиданный {structural.decode()} на позиции {offset} (строка {line})')
+                    if structural == b'{':
+                        yield Event('start_object', tuple(path), offset, line)
+                        stack.append('{')
+                        expect = 'key'
+                    else:
+                        yield Event('start_array', tuple(path), offset, line)
+                        stack.append('[')
+                        path.append(0)
+                        expect = 'value'
+                elif structural == b'}' or structural == b']':
+                    kind = '{' if structural == b'}' else '['
+                    if not stack or stack[-1] != kind:
+                        raise ValueError(f'Непарная скобка на позиции {offset} (строка {line})')
+                    # Пустой контейнер или закрытие после значения
+                    if kind == '{':
+                        if expect not in ('key', 'comma'):
+                            raise ValueError(f'Неожиданная скобка на позиции {offset} (строка {line})')
+                        if expect == 'comma':
+                            path.pop()
+                    else:
+                        if expect not in ('value', 'comma'):
+                            raise ValueError(f'Неожиданная скобка на позиции {offset} (строка {line})')
+                        path.pop()
+                    stack.pop()
+                    yield Event('end_object' if kind == '{' else 'end_array', tuple(path), offset, line)
+                    expect = 'comma'
+                elif structural == b':':
+                    if expect != 'colon':
+                        raise ValueError(f'Неожиданное двоеточие на позиции {offset} (строка {line})')
+                    expect = 'value'
+                else:
+                    if expect != 'comma' or not stack:
+                        raise ValueError(f'Неожиданная запятая на позиции {offset} (строка {line})')
+                    if stack[-1] == '{':
+                        path.pop()
+                        expect = 'key'
+                    else:
+                        path[-1] += 1
+                        expect = 'value'
+                continue
+
+            string = m.group(2)
+            if string is not None:
+                offset = m.start(2)
+                if expect == 'key':
+                    key = json.loads(string)
+                    path.append(key)
+                    self.value = key
+                    yield Event('key', tuple(path), offset, line)
+                    expect = 'colon'
+                    continue
+                if expect != 'value':
+                    raise ValueError(f'Неожиданная строка на позиции {offset} (строка {line})')
+                self.value = json.loads(string)
+            else:
+                offset = m.start(3)
+                if expect != 'value':
+                    raise ValueError(f'Неожиданное значение на позиции {offset} (строка {line})')
+                self.value = json.loads(m.group(3))
+            yield Event('value', tuple(path), offset, line)
+            expect = 'comma'
+
+def iter_events(data):
+    """Выдает события разбора для bytes или str"""
+    return iter(EventParser(data))
+
+def read_bytes(file_path):
+    """Читает файл целиком в bytes (смещения событий считаются в байтах)"""
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+Member = namedtuple('Member', ['path', 'offset', 'line', 'value_start', 'value_end', 'kind', 'parent_offset'])
+
+def iter_members(data):
+    """
+    Выдает Member на каждый ключ объекта на любой глубине:
+    путь, смещение и строка ключа, границы значения в байтах,
+    тип значения ('object', 'array' или 'scalar') и смещение
+    родительского объекта. Записи выдаются в порядке окончания значений.
+    """
+    parser = EventParser(data)
+    # Смещения открытых контейнеров
+    containers = []
+    # Ключи, значения которых еще не закончились
+    open_members = []
+    pending = None
+
+    for event, path, offset, line in parser:
+        if event == 'key':
+            pending = (path, offset, line, containers[-1])
+            continue
+        if pending is not None:
+            if event == 'value':
+                yield Member(*pending[:3], offset, parser.end, 'scalar', pending[3])
+            else:
+                kind = 'object' if event == 'start_object' else 'array'
+                open_members.append((pending, offset, kind, len(containers)))
+            pending = None
+
+        if event == 'start_object' or event == 'start_array':
+            containers.append(offset)
+        elif event == 'end_object' or event == 'end_array':
+            containers.pop()
+            if open_members and open_members[-1][3] == len(containers):
+                member, value_start, kind, _ = open_members.pop()
+                yield Member(*member[:3], value_start, parser.end, kind, member[3])
+
+def iter_top_level_members(data):
+    """
+    Выдает (key, value_start, value_end) для каждого ключа внешнего объекта,
+    включая дубликаты, в порядке появления в файле.
+    """
+    for member in iter_members(data):
+        if len(member.path) == 1:
+            yield member.path[0], member.value_start, member.value_end
+
+def line_text(data, offset):
+    """Возвращает текст строки, в которой находится offset"""
+    start = data.rfind(b'\n', 0, offset) + 1
+    end = data.find(b'\n', offset)
+    if end == -1:
+        end = len(data)
+    return data[start:end].decode('utf-8').rstrip('\r')
+
+def dotted(path):
+    """Превращает путь-кортеж в строку вида section.key.0"""
+    return '.'.join(str(part) for part in path)
+
+def find_object_sections(data):
+    """
+    Находит все разделы (ключи, значение которых - объект) на любой глубине.
+    Возвращает список словарей в порядке появления в файле.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    sections = []
+    for member in iter_members(data):
+        if member.kind != 'object':
+            continue
+        original_line = line_text(data, member.offset)
+        sections.append({
+            'key': member.path[-1],
+            'path': dotted(member.path),
+            'line': member.line,
+            'offset': member.offset,
+            'parent_offset': member.parent_offset,
+            'text': original_line.strip(),
+            'original_line': original_line,
+        })
+    sections.sort(key=lambda section: section['offset'])
+    return sections
+
+def group_duplicates(sections):
+    """
+    Группирует разделы по полному пути. Дубликаты - это ключи,
+    повторяющиеся внутри одного и того же объекта, поэтому вложенные
+    ключи внутри дублированного раздела сами дубликатами не считаются.
+    """
+    by_parent = defaultdict(list)
+    for section in sections:
+        by_parent[(section['parent_offset'], section['key'])].append(section)
+    duplicates = {}
+    for occurrences in by_parent.values():
+        if len(occurrences) > 1:
+            duplicates[occurrences[0]['path']] = occurrences
+    return duplicates
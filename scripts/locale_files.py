@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Общие функции для поиска файлов переводов и их параллельной обработки.
+Файлы раздаются пулу процессов, а вывод и результаты каждого файла
+собираются в исходном порядке, поэтому отчет не зависит от того,
+какой процесс закончил работу первым.
+"""
+
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+def find_locales_dir():
+    """Находит папку с переводами относительно текущей директории"""
+    for candidate in ("../src/locales", "src/locales", "locales"):
+        locales_dir = Path(candidate)
+        if locales_dir.exists():
+            return locales_dir
+    return None
+
+def find_translation_files(locales_dir, include_seo=True):
+    """
+    Возвращает отсортированный список файлов переводов:
+    <язык>/translation.json и, если include_seo, seo/seo*.json
+    """
+    translation_files = []
+    for lang_dir in sorted(locales_dir.iterdir()):
+        if lang_dir.is_dir():
+            translation_file = lang_dir / "translation.json"
+            if translation_file.exists():
+                translation_files.append(translation_file)
+
+    if include_seo:
+        seo_dir = locales_dir / "seo"
+        if seo_dir.is_dir():
+            translation_files.extend(sorted(seo_dir.glob("seo*.json")))
+
+    return translation_files
+
+def parse_jobs(argv=None):
+    """
+    Читает количество процессов из --jobs N, --jobs=N или -j N.
+    --jobs 0 означает "по числу ядер". По умолчанию - 1 (без пула).
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    jobs = 1
+    for i, arg in enumerate(argv):
+        value = None
+        if arg.startswith("--jobs="):
+            value = arg.split("=", 1)[1]
+        elif arg in ("--jobs", "-j") and i + 1 < len(argv):
+            value = argv[i + 1]
+        if value is not None:
+            try:
+                jobs = int(value)
+            except ValueError:
+                raise ValueError(f"Некорректное значение --jobs: {value}")
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return jobs
+
+def _run_captured(func, file_path, args):
+    """Выполняет func в процессе пула, перехватывая его вывод"""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        result = func(file_path, *args)
+    return buffer.getvalue(), result
+
+def run_per_file(func, files, jobs=1, *args):
+    """
+    Вызывает func(file_path, *args) для каждого файла.
+    При jobs > 1 файлы обрабатываются пулом процессов; вывод каждого
+    файла печатается целиком и в порядке списка files.
+    Возвращает список результатов в том же порядке.
+    """
+    if jobs <= 1 or len(files) <= 1:
+        return [func(file_path, *args) for file_path in files]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+        futures = [executor.submit(_run_captured, func, file_path, args) for file_path in files]
+        for future in futures:
+            output, result = future.result()
+            sys.stdout.write(output)
+            results.append(result)
+    return results
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Сравнение наборов ключей между языками (замена extract_keys.js).
+Каждый файл переводов один раз разворачивается в множество ключей,
+после чего отсутствующие и лишние ключи для каждого языка считаются
+операциями над множествами - за линейное время для любого числа языков.
+"""
+
+import json
+import re
+import sys
+
+from locale_files import find_locales_dir
+from path_store import PathStore
+
+def flatten_keys(json_data, store=None):
+    """
+    Возвращает множество полных ключей (section.sub.key) для всех значений,
+    которые не являются словарями. Списки считаются значениями, как в extract_keys.js.
+    С общим для языков хранилищем store (PathStore) ключи - узлы путей:
+    одинаковые ключи разных языков - одинаковые числа, без строк
+    """
+    if store is None:
+        store = PathStore()
+        return set(store.dotted(node) for node in flatten_keys(json_data, store))
+    keys = set()
+    stack = [(PathStore.ROOT, json_data)]
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in node.items():
+            full_key = store.child(prefix, key)
+            if isinstance(value, dict):
+                stack.append((full_key, value))
+            else:
+                keys.add(full_key)
+    return keys
+
+def compare_locales(key_sets, store=None):
+    """
+    Сравнивает множества ключей языков {lang: set(keys)}.
+    Если ключи - узлы store, в отчет попадают их строки.
+    Для каждого языка возвращает:
+      missing - ключи, которые есть хотя бы в одном другом языке, но не в этом,
+      extra   - ключи, которые есть только в этом языке
+    """
+    all_keys = set().union(*key_sets.values()) if key_sets else set()
+    # Сколько языков содержит каждый ключ
+    counts = {}
+    for keys in key_sets.values():
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
+
+    name = store.dotted if store is not None else (lambda key: key)
+    report = {}
+    for lang, keys in key_sets.items():
+        report[lang] = {
+            'total': len(keys),
+            'missing': sorted(name(key) for key in all_keys - keys),
+            'extra': sorted(name(key) for key in keys if counts[key] == 1) if len(key_sets) > 1 else [],
+        }
+    return report
+
+def find_locale_groups(locales_dir):
+    """
+    Находит группы файлов для сравнения:
+    translation - <язык>/translation.json, seo - seo/seo<Язык>.json
+    """
+    groups = {}
+    translation = {}
+    for lang_dir in sorted(locales_dir.iterdir()):
+        translation_file = lang_dir / "translation.json"
+        if lang_dir.is_dir() and translation_file.exists():
+            translation[lang_dir.name] = translation_file
+    if translation:
+        groups['translation'] = translation
+
+    seo = {}
+    seo_dir = locales_dir / "seo"
+    if seo_dir.is_dir():
+        for seo_file in sorted(seo_dir.glob("seo*.json")):
+            match = re.match(r"seo(\w+)\.json$", seo_file.name)
+            if match:
+                seo[match.group(1).lower()] = seo_file
+    if seo:
+        groups['seo'] = seo
+    return groups
+
+def print_keys(title, keys, limit):
+    """Печатает список ключей, ограничивая его длину"""
+    if not keys:
+        return
+    print(f"   {title}: {len(keys)}")
+    shown = keys if limit is None else keys[:limit]
+    for key in shown:
+        print(f"      - {key}")
+    if len(shown) < len(keys):
+        print(f"      ... и еще {len(keys) - len(shown)} (--all для полного списка)")
+
+def main():
+    """Основная функция"""
+    print("🌐 СРАВНЕНИЕ КЛЮЧЕЙ ПЕРЕВОДОВ МЕЖДУ ЯЗЫКАМИ")
+    print("=" * 60)
+
+    limit = None if "--all" in sys.argv else 20
+
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
+        print("❌ Папка с переводами не найдена!")
+        return 1
+
+    groups = find_locale_groups(locales_dir)
+    if not groups:
+        print("❌ Файлы переводов не найдены!")
+        return 1
+
+    mismatches = 0
+    for group_name, files in groups.items():
+        print(f"\n📂 Группа '{group_name}': {', '.join(files)}")
+        # Одно хранилище путей на группу: ключи языков сравниваются как числа
+        store = PathStore()
+        key_sets = {}
+        for lang, file_path in files.items():
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    key_sets[lang] = flatten_keys(json.load(f), store)
+            except Exception as e:
+                print(f"❌ Ошибка чтения файла {file_path}: {e}")
+                return 1
+
+        report = compare_locales(key_sets, store)
+        for lang, result in report.items():
+            if not result['missing'] and not result['extra']:
+                print(f"\n✅ {lang}: {result['total']} ключей, расхождений нет")
+                continue
+            mismatches += len(result['missing']) + len(result['extra'])
+            print(f"\n⚠️  {lang}: {result['total']} ключей")
+            print_keys("❌ Отсутствуют", result['missing'], limit)
+            print_keys("➕ Есть только в этом языке", result['extra'], limit)
+
+    print("\n" + "=" * 60)
+    if mismatches:
+        print(f"⚠️  Найдено расхождений: {mismatches}")
+        return 1
+    print("✅ Наборы ключей совпадают во всех языках")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Компактное хранилище путей для анализаторов переводов.
+Путь - это целое число (узел), а не строка section.sub.key: каждый узел
+хранит ссылку на родителя и номер последнего сегмента, а сами сегменты
+(ключи и индексы списков) хранятся один раз. Общие префиксы тысяч путей
+не копируются, строка пути собирается только при выводе отчета (dotted).
+
+Одно хранилище можно передать нескольким файлам (например, всем языкам
+группы): одинаковые пути получат одинаковые номера и сравниваются как
+числа.
+"""
+
+from array import array
+
+from json_events import dotted as dotted_parts
+
+class PathStore:
+    """Сегменты и узлы путей; узел ROOT - пустой путь (корень файла)"""
+    __slots__ = ("segments", "_segment_ids", "_parents", "_last", "_children")
+
+    ROOT = 0
+
+    def __init__(self):
+        # номер сегмента -> сегмент (строка-ключ или индекс списка)
+        self.segments = []
+        self._segment_ids = {}
+        # узел -> родитель и узел -> номер сегмента (у корня -1)
+        self._parents = array('i', [-1])
+        self._last = array('i', [-1])
+        # родитель << 32 | номер сегмента -> узел (одно число вместо кортежа)
+        self._children = {}
+
+    def __len__(self):
+        """Количество узлов (вместе с корнем)"""
+        return len(self._parents)
+
+    def intern(self, segment):
+        """Номер сегмента (один на все пути хранилища)"""
+        segment_id = self._segment_ids.get(segment)
+        if segment_id is None:
+            segment_id = self._segment_ids[segment] = len(self.segments)
+            self.segments.append(segment)
+        return segment_id
+
+    def child(self, parent, segment):
+        """Узел пути parent + (segment,); создается при первом обращении"""
+        segment_id = self.intern(segment)
+        key = parent << 32 | segment_id
+        node = self._children.get(key)
+        if node is None:
+            node = self._children[key] = len(self._parents)
+            self._parents.append(parent)
+            self._last.append(segment_id)
+        return node
+
+    def parent(self, node):
+        """Узел родителя (для ROOT - None)"""
+        parent = self._parents[node]
+        return None if parent < 0 else parent
+
+    def last(self, node):
+        """Последний сегмент пути (для ROOT - None)"""
+        segment_id = self._last[node]
+        return None if segment_id < 0 else self.segments[segment_id]
+
+    def parts(self, node):
+        """Путь узла кортежем сегментов от корня"""
+        parts = []
+        while node > 0:
+            parts.append(self.segments[self._last[node]])
+            node = self._parents[node]
+        return tuple(reversed(parts))
+
+    def dotted(self, node):
+        """Строка пути section.key.0 - только для вывода"""
+        return dotted_parts(self.parts(node))
+
+    def dump(self):
+        """JSON-совместимое представление (для кэша результатов анализа)"""
+        return {"segments": self.segments,
+                "parents": self._parents.tolist(),
+                "last": self._last.tolist()}
+
+    @classmethod
+    def load(cls, dumped):
+        """Хранилище из результата dump()"""
+        store = cls()
+        for segment in dumped["segments"]:
+            store.intern(segment)
+        store._parents = array('i', dumped["parents"])
+        store._last = array('i', dumped["last"])
+        for node in range(1, len(store._parents)):
+            store._children[store._parents[node] << 32 | store._last[node]] = node
+        return store
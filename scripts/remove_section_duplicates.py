@@ -8,38 +8,52 @@ import json
 import os
 from pathlib import Path
 from collections import defaultdict
-import shutil
 import sys
 
-def find_duplicate_sections(json_data, path=""):
+from backup_store import BackupStore, current_run_id
+from json_events import dotted
+from locale_files import find_locales_dir, find_translation_files, parse_jobs, run_per_file
+from span_index import SpanIndex
+from span_rewriter import SpanRewriter
+from structural_hash import structural_digest
+from tree_walk import ENTER, LEAVE, iter_tree
+
+def find_duplicate_sections(json_data, path="", digests=None, parts=()):
     """
-    Находит дублирующиеся разделы в JSON данных
+    Находит дублирующиеся разделы в JSON данных.
+    Содержимое сравнивается по структурным хэшам, которые считаются
+    один раз для всего дерева (parts - путь в виде кортежа ключей).
+    Обход итеративный (tree_walk); дубликаты вложенных разделов
+    идут раньше дубликатов их родителя
     """
-    duplicates = []
-    section_paths = defaultdict(list)
+    if digests is None:
+        digests = {}
+        structural_digest(json_data, parts, digests)
     
-    if isinstance(json_data, dict):
-        for key, value in json_data.items():
-            current_path = f"{path}.{key}" if path else key
-            
-            if isinstance(value, dict):
+    duplicates = []
+    # Открытые словари: (строка пути, {(имя, хэш): [пути разделов-детей]})
+    open_sections = []
+    
+    for event, current_parts, key, value in iter_tree(json_data, parts, descend=(dict,)):
+        if event == ENTER:
+            if open_sections:
+                parent_path = open_sections[-1][0]
+                current_path = f"{parent_path}.{key}" if parent_path else key
                 # Сохраняем путь к этому разделу
-                section_content = json.dumps(value, sort_keys=True)
-                section_paths[f"{key}:{section_content}"].append(current_path)
-                
-                # Рекурсивно ищем вложенные дубликаты
-                nested_duplicates = find_duplicate_sections(value, current_path)
-                duplicates.extend(nested_duplicates)
-    
-    # Находим разделы с одинаковым содержимым
-    for section_key, paths in section_paths.items():
-        if len(paths) > 1:
-            section_name = section_key.split(':')[0]
-            duplicates.append({
-                'section_name': section_name,
-                'paths': paths,
-                'content_hash': section_key.split(':', 1)[1]
-            })
+                open_sections[-1][1][(key, digests[current_parts])].append(current_path)
+            else:
+                current_path = path
+            open_sections.append((current_path, defaultdict(list)))
+        elif event == LEAVE:
+            # Находим разделы с одинаковым содержимым
+            _, section_paths = open_sections.pop()
+            for (section_name, section_hash), paths in section_paths.items():
+                if len(paths) > 1:
+                    duplicates.append({
+                        'section_name': section_name,
+                        'paths': paths,
+                        'content_hash': section_hash
+                    })
     
     return duplicates
 
@@ -71,38 +85,27 @@ def identify_major_duplicates(duplicates):
     
     return major_duplicates
 
-def remove_duplicates_from_data(data, duplicates_to_remove):
+def remove_duplicates_from_data(index, duplicates_to_remove):
     """
-    Удаляет дублирующиеся разделы из данных
+    Удаляет дублирующиеся разделы из текста файла (SpanIndex) правками
+    байтовых диапазонов - остальной файл не переформатируется.
+    Возвращает (rewriter, cleaned_bytes)
     """
+    members_by_path = defaultdict(list)
+    for member in index.members:
+        members_by_path[dotted(member.path)].append(member)
+    
+    rewriter = SpanRewriter(index)
     for dup in duplicates_to_remove:
         for remove_path in dup['remove']:
-            # Разбиваем путь на компоненты
-            path_parts = remove_path.split('.')
-            
-            # Находим родительский объект
-            current = data
-            parent = None
-            last_key = None
-            
-            try:
-                for i, part in enumerate(path_parts):
-                    if i == len(path_parts) - 1:
-                        last_key = part
-                        parent = current
-                        break
-                    else:
-                        current = current[part]
-                
-                # Удаляем раздел
-                if parent is not None and last_key in parent:
-                    print(f"  ❌ Удаляем дублированный раздел: {remove_path}")
-                    del parent[last_key]
-                
-            except (KeyError, TypeError) as e:
-                print(f"  ⚠️  Не удалось удалить раздел {remove_path}: {e}")
-    
-    return data
+            members = members_by_path.get(remove_path)
+            if members:
+                print(f"  ❌ Удаляем дублированный раздел: {remove_path}")
+                rewriter.delete(members)
+            else:
+                print(f"  ⚠️  Не удалось удалить раздел {remove_path}: не найден в файле")
+    
+    return rewriter, rewriter.render()
 
 def process_file(file_path, dry_run=False):
     """
@@ -111,15 +114,12 @@ def process_file(file_path, dry_run=False):
     print(f"\n📁 Обрабатываем файл: {file_path}")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            original_data = json.load(f)
+        index = SpanIndex.from_file(file_path)
+        data = json.loads(index.data)
     except Exception as e:
         print(f"❌ Ошибка чтения файла {file_path}: {e}")
         return False
     
-    # Создаем копию данных
-    data = json.loads(json.dumps(original_data))
-    
     # Находим дубликаты
     duplicates = find_duplicate_sections(data)
     major_duplicates = identify_major_duplicates(duplicates)
@@ -139,25 +139,30 @@ def process_file(file_path, dry_run=False):
         print("🔍 Режим просмотра - изменения не применяются")
         return True
     
-    # Создаем резервную копию
-    backup_path = f"{file_path}.backup"
-    shutil.copy2(file_path, backup_path)
-    print(f"💾 Создана резервная копия: {backup_path}")
+    # Создаем резервную копию (одинаковые версии хранятся один раз)
+    store = BackupStore()
+    backup_digest = store.backup_file(file_path, "remove_section_duplicates", index.data)
+    print(f"💾 Создана резервная копия: {backup_digest[:12]}")
     
     # Удаляем дубликаты
     print("🧹 Удаляем дублирующиеся разделы:")
-    cleaned_data = remove_duplicates_from_data(data, major_duplicates)
+    rewriter, cleaned = remove_duplicates_from_data(index, major_duplicates)
     
-    # Сохраняем файл
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(cleaned_data, f, ensure_ascii=False, indent=2)
-        print(f"✅ Файл успешно обновлен: {file_path}")
+        json.loads(cleaned)
+    except ValueError as e:
+        print(f"❌ После удаления разделов JSON невалиден, файл не изменен: {e}")
+        return False
+    
+    # Сохраняем файл: пишутся только байты начиная с первого изменения
+    try:
+        written = rewriter.write(file_path, cleaned)
+        print(f"✅ Файл успешно обновлен: {file_path} (записано {written} байт)")
         return True
     except Exception as e:
         print(f"❌ Ошибка записи файла {file_path}: {e}")
         # Восстанавливаем из резервной копии
-        shutil.copy2(backup_path, file_path)
+        store.restore_file(backup_digest, file_path)
         print("🔄 Файл восстановлен из резервной копии")
         return False
 
@@ -172,24 +177,20 @@ def main():
         print("🔍 РЕЖИМ ПРОСМОТРА - никаких изменений не будет сделано")
         print("=" * 60)
     
-    # Путь к папке с переводами
-    locales_dir = Path("../src/locales")
-    if not locales_dir.exists():
-        locales_dir = Path("src/locales")
-    if not locales_dir.exists():
-        locales_dir = Path("locales")
+    try:
+        jobs = parse_jobs()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
     
-    if not locales_dir.exists():
+    # Путь к папке с переводами
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
         print("❌ Папка с переводами не найдена!")
         return 1
     
-    # Находим все файлы переводов
-    translation_files = []
-    for lang_dir in locales_dir.iterdir():
-        if lang_dir.is_dir():
-            translation_file = lang_dir / "translation.json"
-            if translation_file.exists():
-                translation_files.append(translation_file)
+    # Находим все файлы переводов, включая SEO бандлы
+    translation_files = find_translation_files(locales_dir)
     
     if not translation_files:
         print("❌ Файлы переводов не найдены!")
@@ -197,11 +198,13 @@ def main():
     
     print(f"📄 Найдено файлов переводов: {len(translation_files)}")
     
-    # Обрабатываем каждый файл
-    success_count = 0
-    for file_path in translation_files:
-        if process_file(file_path, dry_run):
-            success_count += 1
+    # Идентификатор запуска создается до пула: процессы наследуют его
+    # через окружение, и резервные копии всех файлов попадают в один run
+    current_run_id()
+    
+    # Обрабатываем каждый файл (при --jobs N - параллельно)
+    results = run_per_file(process_file, translation_files, jobs, dry_run)
+    success_count = sum(1 for result in results if result)
     
     # Итоговый отчет
     print("\n" + "=" * 60)
@@ -213,7 +216,7 @@ def main():
             print("✅ Все файлы проанализированы. Запустите без --dry-run для применения изменений.")
         else:
             print("✅ Все файлы успешно обработаны!")
-            print("💾 Резервные копии сохранены с расширением .backup")
+            print("💾 Резервные копии: python backup_store.py list")
     else:
         print(f"⚠️  Обработано успешно: {success_count}/{len(translation_files)}")
         if not dry_run:
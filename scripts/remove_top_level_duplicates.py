@@ -7,41 +7,29 @@
 import json
 import os
 from pathlib import Path
-from collections import defaultdict
-import shutil
 import sys
 
-def find_top_level_duplicates(json_data):
+from backup_store import BackupStore, current_run_id
+from duplicate_keys import load_with_duplicates
+from locale_files import find_locales_dir, find_translation_files, parse_jobs, run_per_file
+from span_index import SpanIndex
+from span_rewriter import SpanRewriter
+
+def find_top_level_duplicates(duplicate_keys):
     """
-    Находит дублирующиеся разделы верхнего уровня
+    Выбирает дублирующиеся разделы верхнего уровня из результатов
+    duplicate_keys.load_with_duplicates (json.load их уже не видит)
     """
-    if not isinstance(json_data, dict):
-        return []
-    
-    # Считаем количество каждого ключа
-    key_counts = defaultdict(int)
-    key_positions = defaultdict(list)
-    
-    # Создаем список для отслеживания порядка ключей
-    keys_order = []
-    position = 0
-    
-    for key in json_data.keys():
-        key_counts[key] += 1
-        key_positions[key].append(position)
-        keys_order.append(key)
-        position += 1
-    
-    # Находим дубликаты
     duplicates = []
-    for key, count in key_counts.items():
-        if count > 1:
-            duplicates.append({
-                'key': key,
-                'count': count,
-                'positions': key_positions[key],
-                'values': [json_data[key] for _ in range(count)]  # Для анализа
-            })
+    for dup in duplicate_keys:
+        if len(dup.path) != 1:
+            continue
+        duplicates.append({
+            'key': dup.key,
+            'count': len(dup.positions),
+            'positions': dup.positions,
+            'values': dup.values  # Для анализа
+        })
     
     return duplicates
 
@@ -70,58 +58,58 @@ def analyze_duplicates(duplicates, data):
     
     return removal_plan
 
-def remove_duplicate_keys(data, removal_plan):
+def remove_duplicate_keys(index, removal_plan):
     """
-    Удаляет дублирующиеся ключи, оставляя только первое вхождение
+    Удаляет повторные вхождения разделов верхнего уровня, оставляя первое.
+    Правка идет по байтовым диапазонам (SpanRewriter): остальной текст,
+    в том числе вложенные повторяющиеся ключи, остается как был -
+    инструмент меняет только то, что показал пользователю
     """
-    if not removal_plan:
-        return data
-    
-    # Создаем новый словарь с уникальными ключами
-    new_data = {}
-    seen_keys = set()
-    
-    for key, value in data.items():
-        if key not in seen_keys:
-            new_data[key] = value
-            seen_keys.add(key)
-            print(f"  ✅ Сохранен раздел: {key}")
-        else:
-            print(f"  ❌ Удален дубликат: {key}")
-    
-    return new_data
+    planned = set(plan['key'] for plan in removal_plan)
+    rewriter = SpanRewriter(index)
+    for occurrences in index.duplicate_groups():
+        if len(occurrences[0].path) == 1 and occurrences[0].path[0] in planned:
+            rewriter.delete(occurrences[1:])
+    for plan in removal_plan:
+        print(f"  ❌ Удалено дубликатов раздела '{plan['key']}': {plan['remove_count']}")
+    
+    return rewriter
 
-def validate_json_structure(data):
+def validate_json_structure(text):
     """
-    Проверяет, что JSON структура валидна после изменений
+    Проверяет, что текст JSON валиден после изменений
     """
     try:
-        json.dumps(data, ensure_ascii=False)
+        json.loads(text)
         return True, "OK"
     except Exception as e:
         return False, str(e)
 
-def process_file(file_path, dry_run=False):
+def process_file(file_path, dry_run=False, assume_yes=False):
     """
     Обрабатывает один файл переводов
     """
     print(f"\n📁 Анализируем файл: {file_path}")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            original_data = json.load(f)
+        index = SpanIndex.from_file(file_path)
+        original_data, duplicate_keys = load_with_duplicates(index.data.decode('utf-8'), keep='first')
     except Exception as e:
         print(f"❌ Ошибка чтения файла {file_path}: {e}")
         return False
     
     # Находим дубликаты верхнего уровня
-    duplicates = find_top_level_duplicates(original_data)
+    duplicates = find_top_level_duplicates(duplicate_keys)
     
     if not duplicates:
         print("✅ Дублирующихся разделов верхнего уровня не найдено!")
         return True
     
     print(f"⚠️  Найдено дублирующихся разделов: {len(duplicates)}")
+    nested = sum(1 for dup in duplicate_keys if len(dup.path) > 1)
+    if nested:
+        print(f"💡 Вложенных повторяющихся ключей: {nested} - они не изменяются "
+              f"(см. final_duplicate_cleaner.py)")
     
     # Анализируем дубликаты
     removal_plan = analyze_duplicates(duplicates, original_data)
@@ -132,39 +120,40 @@ def process_file(file_path, dry_run=False):
     
     # Подтверждение от пользователя
     print(f"\n⚠️  ВНИМАНИЕ! Будет удалено {sum(plan['remove_count'] for plan in removal_plan)} дублирующихся разделов.")
-    response = input("Продолжить? (y/N): ").lower().strip()
-    if response not in ['y', 'yes', 'да']:
-        print("❌ Операция отменена пользователем")
-        return False
+    if not assume_yes:
+        response = input("Продолжить? (y/N): ").lower().strip()
+        if response not in ['y', 'yes', 'да']:
+            print("❌ Операция отменена пользователем")
+            return False
     
-    # Создаем резервную копию
-    backup_path = f"{file_path}.backup"
-    shutil.copy2(file_path, backup_path)
-    print(f"💾 Создана резервная копия: {backup_path}")
+    # Создаем резервную копию (одинаковые версии хранятся один раз)
+    store = BackupStore()
+    backup_digest = store.backup_file(file_path, "remove_top_level_duplicates", index.data)
+    print(f"💾 Создана резервная копия: {backup_digest[:12]}")
     
     # Удаляем дубликаты
     print("\n🧹 Удаляем дублирующиеся разделы:")
-    cleaned_data = remove_duplicate_keys(original_data, removal_plan)
+    rewriter = remove_duplicate_keys(index, removal_plan)
+    cleaned_text = rewriter.render()
     
     # Проверяем валидность
-    is_valid, validation_message = validate_json_structure(cleaned_data)
+    is_valid, validation_message = validate_json_structure(cleaned_text)
     if not is_valid:
         print(f"❌ Ошибка валидации JSON: {validation_message}")
         return False
     
-    # Сохраняем файл
+    # Сохраняем файл: пишутся только байты после первого изменения
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(cleaned_data, f, ensure_ascii=False, indent=2)
+        rewriter.write(file_path, cleaned_text)
         
         print(f"✅ Файл успешно обновлен: {file_path}")
         
         # Проверяем, что файл можно прочитать обратно
         with open(file_path, 'r', encoding='utf-8') as f:
-            test_data = json.load(f)
+            json.load(f)
         
-        original_sections = len(original_data)
-        new_sections = len(cleaned_data)
+        new_sections = len(original_data)
+        original_sections = new_sections + sum(plan['remove_count'] for plan in removal_plan)
         removed_sections = original_sections - new_sections
         
         print(f"📊 Статистика:")
@@ -177,7 +166,7 @@ def process_file(file_path, dry_run=False):
     except Exception as e:
         print(f"❌ Ошибка записи файла {file_path}: {e}")
         # Восстанавливаем из резервной копии
-        shutil.copy2(backup_path, file_path)
+        store.restore_file(backup_digest, file_path)
         print("🔄 Файл восстановлен из резервной копии")
         return False
 
@@ -192,24 +181,20 @@ def main():
         print("🔍 РЕЖИМ ПРОСМОТРА - никаких изменений не будет сделано")
         print("=" * 60)
     
-    # Путь к папке с переводами
-    locales_dir = Path("../src/locales")
-    if not locales_dir.exists():
-        locales_dir = Path("src/locales")
-    if not locales_dir.exists():
-        locales_dir = Path("locales")
+    try:
+        jobs = parse_jobs()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
     
-    if not locales_dir.exists():
+    # Путь к папке с переводами
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
         print("❌ Папка с переводами не найдена!")
         return 1
     
-    # Находим все файлы переводов
-    translation_files = []
-    for lang_dir in locales_dir.iterdir():
-        if lang_dir.is_dir():
-            translation_file = lang_dir / "translation.json"
-            if translation_file.exists():
-                translation_files.append(translation_file)
+    # Находим все файлы переводов, включая SEO бандлы
+    translation_files = find_translation_files(locales_dir)
     
     if not translation_files:
         print("❌ Файлы переводов не найдены!")
@@ -217,11 +202,22 @@ def main():
     
     print(f"📄 Найдено файлов переводов: {len(translation_files)}")
     
-    # Обрабатываем каждый файл
-    success_count = 0
-    for file_path in translation_files:
-        if process_file(file_path, dry_run):
-            success_count += 1
+    # В пуле процессов нет доступа к stdin - подтверждение запрашивается один раз
+    assume_yes = False
+    if jobs > 1 and not dry_run:
+        response = input("Удалить дубликаты во всех файлах? (y/N): ").lower().strip()
+        if response not in ['y', 'yes', 'да']:
+            print("❌ Операция отменена пользователем")
+            return 1
+        assume_yes = True
+    
+    # Идентификатор запуска создается до пула: процессы наследуют его
+    # через окружение, и резервные копии всех файлов попадают в один run
+    current_run_id()
+    
+    # Обрабатываем каждый файл (при --jobs N - параллельно)
+    results = run_per_file(process_file, translation_files, jobs, dry_run, assume_yes)
+    success_count = sum(1 for result in results if result)
     
     # Итоговый отчет
     print("\n" + "=" * 60)
@@ -234,7 +230,7 @@ def main():
             print("💡 Для применения изменений запустите без --dry-run")
         else:
             print("✅ Все файлы успешно обработаны!")
-            print("💾 Резервные копии сохранены с расширением .backup")
+            print("💾 Резервные копии: python backup_store.py list")
     else:
         print(f"⚠️  Обработано успешно: {success_count}/{len(translation_files)}")
     
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Разбиение переводов по маршрутам приложения.
+Маршруты берутся из <Route path=... element={<Компонент />}> в App.jsx и из
+PUBLIC_ROUTES (utils/mainRoutes.js, подключаются через routes/index.jsx).
+От компонента каждого маршрута строится граф импортов, по индексу t()
+собираются достижимые ключи, и для каждого маршрута и языка пишется
+отдельный минифицированный набор переводов. Ключи общих компонентов
+(Navbar, Footer и все, что импортирует App.jsx помимо страниц) попадают
+в общий набор "_shared".
+
+Запуск:
+    python route_chunks.py [--out=public/i18n/routes] [--jobs N] [--no-cache]
+"""
+
+import json
+import re
+import sys
+from collections import deque
+from pathlib import Path
+
+from locale_files import find_locales_dir, parse_jobs
+from split_translations import chunk_file_name, serialize_chunk, write_language
+from t_usage_index import INDEX_VERSION, is_used, load_index, save_index, update_index
+
+DEFAULT_OUT_DIR = Path(__file__).resolve().parent.parent / "public" / "i18n" / "routes"
+SHARED_CHUNK = "_shared"
+RESOLVE_SUFFIXES = ("", ".jsx", ".js", "/index.jsx", "/index.js")
+
+# import X from '...', import { A, B as C } from '...', import '...', export ... from '...'
+_IMPORT = re.compile(r'''(?:import|export)\s+(?:([\w$*{}\s,]+?)\s+from\s+)?['"]([^'"]+)['"]''')
+# import('...') - динамический импорт (React.lazy)
+_DYNAMIC_IMPORT = re.compile(r'''(?<![\w$.])import\(\s*['"]([^'"]+)['"]\s*\)''')
+_ROUTE = re.compile(r'''<Route\s[^>]*?path=["']([^"']+)["'][^>]*?element=\{\s*<([A-Z][\w$.]*)''')
+_ROUTE_OBJECT = re.compile(r'''path:\s*['"]([^'"]+)['"][^}]*?page:\s*([A-Z][\w$]*)''')
+_JSX_COMMENT = re.compile(r'\{/\*.*?\*/\}', re.S)
+_COMMENT = re.compile(r'/\*.*?\*/|(?<![:"\'])//[^\n]*', re.S)
+
+def strip_comments(text):
+    """Убирает закомментированный код, чтобы не учитывать отключенные маршруты"""
+    return _COMMENT.sub("", _JSX_COMMENT.sub("", text))
+
+def parse_imports(text):
+    """
+    Возвращает (specifiers, bindings): используемые модули и соответствие
+    локальное имя -> модуль для default- и именованных импортов.
+    Импорты, имена которых в файле не используются (например, страницы
+    закомментированных маршрутов), не учитываются - сборщик их тоже отбросит.
+    """
+    body = _IMPORT.sub("", text)
+    used_names = set(re.findall(r"[\w$]+", body))
+    specifiers = []
+    bindings = {}
+    for clause, specifier in _IMPORT.findall(text):
+        names = []
+        for name in re.split(r"[{},]", clause):
+            name = name.strip()
+            if name:
+                # B as C, * as ns - локальное имя C / ns
+                names.append(name.split(" as ")[-1].strip())
+        if names and not any(name in used_names for name in names):
+            continue
+        specifiers.append(specifier)
+        for name in names:
+            bindings[name] = specifier
+    specifiers.extend(_DYNAMIC_IMPORT.findall(text))
+    return specifiers, bindings
+
+def resolve_import(src_dir, importer, specifier):
+    """Путь импортируемого файла относительно src/ или None для пакетов и ассетов"""
+    if not specifier.startswith("."):
+        return None
+    base = (src_dir / importer).parent / specifier
+    for suffix in RESOLVE_SUFFIXES:
+        candidate = Path(str(base) + suffix)
+        if candidate.is_file() and candidate.suffix in (".js", ".jsx"):
+            try:
+                return candidate.resolve().relative_to(src_dir.resolve()).as_posix()
+            except ValueError:
+                return None
+    return None
+
+class ImportGraph:
+    """Граф импортов модулей src/; файлы читаются лениво, по одному разу"""
+
+    def __init__(self, src_dir):
+        self.src_dir = src_dir
+        self.edges = {}
+        self.bindings = {}
+
+    def _load(self, name):
+        try:
+            text = (self.src_dir / name).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            text = ""
+        specifiers, bindings = parse_imports(strip_comments(text))
+        edges = []
+        for specifier in specifiers:
+            target = resolve_import(self.src_dir, name, specifier)
+            if target is not None and target not in edges:
+                edges.append(target)
+        self.edges[name] = edges
+        self.bindings[name] = {local: resolve_import(self.src_dir, name, specifier)
+                               for local, specifier in bindings.items()}
+
+    def imports(self, name):
+        if name not in self.edges:
+            self._load(name)
+        return self.edges[name]
+
+    def binding(self, name, local):
+        """Файл, из которого в модуле name импортировано имя local"""
+        self.imports(name)
+        return self.bindings[name].get(local)
+
+    def reachable(self, roots, blocked=()):
+        """Обход в ширину от roots; в модули из blocked обход не заходит"""
+        seen = set(roots)
+        queue = deque(roots)
+        while queue:
+            name = queue.popleft()
+            for target in self.imports(name):
+                if target not in seen and target not in blocked:
+                    seen.add(target)
+                    queue.append(target)
+        return seen
+
+def find_routes(graph, app_file="App.jsx"):
+    """
+    Возвращает {путь маршрута: файл компонента} из App.jsx и PUBLIC_ROUTES.
+    Маршруты с нераспознанным компонентом пропускаются.
+    """
+    routes = {}
+    sources = [(app_file, _ROUTE)]
+    for name in graph.reachable([app_file]):
+        if name.endswith("mainRoutes.js"):
+            sources.append((name, _ROUTE_OBJECT))
+
+    for name, pattern in sources:
+        try:
+            text = strip_comments((graph.src_dir / name).read_text(encoding="utf-8"))
+        except OSError:
+            continue
+        for path, component in pattern.findall(text):
+            target = graph.binding(name, component.split(".")[0])
+            if target is not None:
+                routes.setdefault(path, target)
+    return routes
+
+def collect_usage(index, modules):
+    """Ключи и динамические префиксы t(), найденные в наборе модулей"""
+    referenced = set()
+    prefixes = set()
+    for name in modules:
+        entry = index["files"].get(name)
+        if entry is None:
+            continue
+        referenced.update(key for key, _ in entry["keys"])
+        prefixes.update(prefix for prefix, _ in entry["prefixes"])
+    return referenced, sorted(prefixes)
+
+def iter_leaves(json_data):
+    """Листья дерева переводов: (путь-кортеж, значение); списки считаются листьями"""
+    stack = [((), json_data)]
+    while stack:
+        path, node = stack.pop()
+        for key, value in node.items():
+            if isinstance(value, dict):
+                stack.append((path + (key,), value))
+            else:
+                yield path + (key,), value
+
+def build_subset(leaves):
+    """Собирает вложенный словарь из списка (путь, значение)"""
+    subset = {}
+    for path, value in leaves:
+        node = subset
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return subset
+
+def route_name(route):
+    """Имя части для пути маршрута: / -> index, /hsm/:id -> hsm__id"""
+    name = route.strip("/").replace(":", "").replace("/", "__")
+    return name or "index"
+
+def route_names(routes):
+    """
+    Имена частей для маршрутов без совпадений: {маршрут: имя}.
+    route_name не взаимно однозначно (/a/:id и /a/id дают a__id), поэтому
+    совпавшему имени добавляется номер: a__id, a__id-2
+    """
+    taken = {SHARED_CHUNK}
+    names = {}
+    for route in sorted(routes):
+        base = route_name(route)
+        name = base
+        suffix = 2
+        while name in taken:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        taken.add(name)
+        names[route] = name
+    return names
+
+def assign_owners(json_data, usages):
+    """
+    Для каждого листа - множество наборов (маршрутов или SHARED_CHUNK),
+    которым он нужен. usages: {набор: (referenced, prefixes)}
+    """
+    owners = []
+    for path, value in iter_leaves(json_data):
+        names = frozenset(name for name, (referenced, prefixes) in usages.items()
+                          if is_used(path, referenced, prefixes))
+        if names:
+            owners.append((path, value, names))
+    return owners
+
+def build_route_chunks(json_data, usages):
+    """
+    Возвращает части языка {набор: (имя файла, bytes)} и статистику
+    байт по наборам: total - размер части, exclusive - ключи только этого набора
+    """
+    owners = assign_owners(json_data, usages)
+    # Общие ключи загружаются один раз и в маршрутные части не дублируются
+    shared_leaves = [(path, value) for path, value, names in owners if SHARED_CHUNK in names]
+
+    chunks = {}
+    stats = {}
+    for name in usages:
+        if name == SHARED_CHUNK:
+            leaves = shared_leaves
+        else:
+            leaves = [(path, value) for path, value, names in owners
+                      if name in names and SHARED_CHUNK not in names]
+        exclusive = [(path, value) for path, value, names in owners if names == {name}]
+        payload = serialize_chunk(build_subset(leaves))
+        file_name, _ = chunk_file_name(name, payload)
+        chunks[name] = (file_name, payload)
+        stats[name] = {
+            "file": file_name,
+            "keys": len(leaves),
+            "bytes": len(payload),
+            "exclusive_bytes": len(serialize_chunk(build_subset(exclusive))) if exclusive else 0,
+        }
+
+    # Ключи, которые нужны нескольким маршрутам (но не общим компонентам)
+    cross_route = [(path, value) for path, value, names in owners
+                   if len(names) > 1 and SHARED_CHUNK not in names]
+    unreachable = len(serialize_chunk(json_data)) - len(serialize_chunk(build_subset(
+        [(path, value) for path, value, _ in owners])))
+    summary = {
+        "cross_route_bytes": len(serialize_chunk(build_subset(cross_route))) if cross_route else 0,
+        "unreachable_bytes": unreachable,
+    }
+    return chunks, stats, summary
+
+def main():
+    """Основная функция"""
+    print("🧭 РАЗБИЕНИЕ ПЕРЕВОДОВ ПО МАРШРУТАМ")
+    print("=" * 60)
+
+    try:
+        jobs = parse_jobs()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    use_cache = "--no-cache" not in sys.argv
+    out_dir = DEFAULT_OUT_DIR
+    for arg in sys.argv[1:]:
+        if arg.startswith("--out="):
+            out_dir = Path(arg.split("=", 1)[1])
+
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
+        print("❌ Папка с переводами не найдена!")
+        return 1
+    src_dir = locales_dir.parent
+
+    index = load_index() if use_cache else {"version": INDEX_VERSION, "files": {}}
+    update_index(index, src_dir, jobs)
+    if use_cache:
+        save_index(index)
+
+    graph = ImportGraph(src_dir)
+    entry = "main.jsx" if (src_dir / "main.jsx").exists() else "App.jsx"
+    routes = find_routes(graph)
+    if not routes:
+        print("❌ Маршруты не найдены в App.jsx / routes!")
+        return 1
+
+    # Страницы не входят в общий набор, даже если их импортирует App.jsx
+    pages = set(routes.values())
+    shared_modules = graph.reachable([entry], blocked=pages)
+    usages = {SHARED_CHUNK: collect_usage(index, shared_modules)}
+    chunk_names = route_names(routes)
+    renamed = [route for route, name in chunk_names.items() if name != route_name(route)]
+    if renamed:
+        print(f"⚠️  Совпадающие имена частей, добавлен номер: "
+              f"{', '.join(f'{route} → {chunk_names[route]}' for route in renamed)}")
+    route_modules = {}
+    for route, component in sorted(routes.items()):
+        modules = graph.reachable([component])
+        route_modules[route] = (component, len(modules))
+        usages[chunk_names[route]] = collect_usage(index, modules)
+    print(f"📄 Маршрутов: {len(routes)}, общих модулей: {len(shared_modules)}")
+
+    manifest = {"shared": SHARED_CHUNK, "routes": {}, "languages": {}}
+    for route, (component, module_count) in sorted(route_modules.items()):
+        manifest["routes"][route] = {
+            "chunk": chunk_names[route],
+            "component": component,
+            "modules": module_count,
+        }
+
+    for lang_dir in sorted(locales_dir.iterdir()):
+        translation_file = lang_dir / "translation.json"
+        if not (lang_dir.is_dir() and translation_file.exists()):
+            continue
+        try:
+            with open(translation_file, 'r', encoding='utf-8') as f:
+                json_data = json.load(f)
+        except Exception as e:
+            print(f"❌ Ошибка чтения файла {translation_file}: {e}")
+            return 1
+
+        lang = lang_dir.name
+        chunks, stats, summary = build_route_chunks(json_data, usages)
+        write_language(out_dir, lang, chunks)
+        manifest["languages"][lang] = {
+            "chunks": {name: dict(entry, file=f"{lang}/{entry['file']}") for name, entry in stats.items()},
+            **summary,
+        }
+
+        full_size = len(serialize_chunk(json_data))
+        route_stats = [entry for name, entry in stats.items() if name != SHARED_CHUNK]
+        exclusive = sum(entry["exclusive_bytes"] for entry in route_stats)
+        largest = max(route_stats, key=lambda entry: entry["bytes"])
+        print(f"\n🌐 {lang}: полный набор {full_size / 1024:.1f} KB (минифицировано)")
+        print(f"   🤝 Общие компоненты: {stats[SHARED_CHUNK]['bytes'] / 1024:.1f} KB")
+        print(f"   🔀 Нужны нескольким маршрутам: {summary['cross_route_bytes'] / 1024:.1f} KB")
+        print(f"   📌 Только одному маршруту: {exclusive / 1024:.1f} KB")
+        print(f"   👻 Не достижимы ни с одного маршрута: {summary['unreachable_bytes'] / 1024:.1f} KB")
+        print(f"   📦 Самая большая часть маршрута: {largest['file']} ({largest['bytes'] / 1024:.1f} KB)")
+
+    if not manifest["languages"]:
+        print("❌ Файлы переводов не найдены!")
+        return 1
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"\n✅ Манифест: {manifest_path}")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
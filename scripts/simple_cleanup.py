@@ -4,81 +4,59 @@
 """
 
 import json
-import shutil
 from pathlib import Path
-from collections import OrderedDict
 import sys
 
-def remove_duplicates_from_dict(data):
-    """
-    Удаляет дублирующиеся ключи из словаря
-    Python автоматически сохраняет только последнее значение при дублирующихся ключах
-    Эта функция перестраивает словарь, оставляя только первое вхождение каждого ключа
-    """
-    if not isinstance(data, dict):
-        return data
-    
-    # Используем OrderedDict для сохранения порядка
-    result = OrderedDict()
-    
-    for key, value in data.items():
-        if key not in result:
-            # Рекурсивно обрабатываем вложенные словари
-            if isinstance(value, dict):
-                result[key] = remove_duplicates_from_dict(value)
-            elif isinstance(value, list):
-                # Обрабатываем списки, которые могут содержать словари
-                result[key] = [remove_duplicates_from_dict(item) if isinstance(item, dict) else item for item in value]
-            else:
-                result[key] = value
-    
-    return dict(result)
+from backup_store import BackupStore
+from span_index import SpanIndex
+from span_rewriter import drop_shadowed
 
 def process_file(file_path):
     """Обрабатывает файл переводов"""
     print(f"📁 Обрабатываем: {file_path}")
     
-    # Создаем резервную копию
-    backup_path = f"{file_path}.backup"
-    try:
-        shutil.copy2(file_path, backup_path)
-        print(f"💾 Резервная копия: {backup_path}")
-    except Exception as e:
-        print(f"❌ Ошибка создания резервной копии: {e}")
-        return False
-    
-    # Читаем и парсим JSON
+    # Индексируем байтовые диапазоны ключей (json.load потерял бы дубликаты)
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        index = SpanIndex.from_file(file_path)
     except Exception as e:
         print(f"❌ Ошибка чтения JSON: {e}")
         return False
     
-    original_keys = len(data)
-    print(f"📊 Исходное количество разделов: {original_keys}")
+    groups = index.duplicate_groups()
+    if not groups:
+        print("✅ Дубликатов не найдено, файл не изменен")
+        return True
+    print(f"📊 Ключей с дубликатами: {len(groups)}")
     
-    # Удаляем дубликаты (на самом деле они уже удалены при парсинге JSON)
-    cleaned_data = remove_duplicates_from_dict(data)
+    # Оставляем последнее вхождение каждого ключа (его сейчас видит JSON.parse),
+    # предыдущие удаляем из текста
+    rewriter = drop_shadowed(index)
+    cleaned = rewriter.render()
     
-    final_keys = len(cleaned_data)
-    print(f"📊 Итоговое количество разделов: {final_keys}")
+    try:
+        json.loads(cleaned)
+    except ValueError as e:
+        print(f"❌ После удаления дубликатов JSON невалиден: {e}")
+        return False
     
-    if original_keys == final_keys:
-        print("✅ Дубликатов на уровне JSON объекта не найдено (они удалились при парсинге)")
-    else:
-        print(f"🧹 Удалено {original_keys - final_keys} дублирующихся разделов")
+    # Создаем резервную копию (одинаковые версии хранятся один раз)
+    store = BackupStore()
+    try:
+        backup_digest = store.backup_file(file_path, "simple_cleanup", index.data)
+        print(f"💾 Резервная копия: {backup_digest[:12]}")
+    except Exception as e:
+        print(f"❌ Ошибка создания резервной копии: {e}")
+        return False
     
-    # Сохраняем очищенный файл
+    # Сохраняем очищенный файл: пишутся только байты после первого изменения
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(cleaned_data, f, ensure_ascii=False, indent=2)
-        print("✅ Файл успешно сохранен")
+        written = rewriter.write(file_path, cleaned)
+        print(f"🧹 Удалено {len(index.data) - len(cleaned)} байт, записано {written} байт")
         return True
     except Exception as e:
         print(f"❌ Ошибка сохранения: {e}")
         # Восстанавливаем из резервной копии
-        shutil.copy2(backup_path, file_path)
+        store.restore_file(backup_digest, file_path)
         print("🔄 Файл восстановлен из резервной копии")
         return False
 
@@ -123,8 +101,8 @@ def main():
     
     if success_count == len(translation_files):
         print("✅ Все файлы успешно обработаны!")
-        print("💡 Дубликаты на уровне ключей JSON были удалены автоматически при парсинге")
-        print("💾 Резервные копии сохранены с расширением .backup")
+        print("💡 Оставлены последние вхождения ключей (их видит JSON.parse), форматирование файлов сохранено")
+        print("💾 Резервные копии: python backup_store.py list")
     else:
         print(f"⚠️  Успешно обработано: {success_count}/{len(translation_files)}")
     
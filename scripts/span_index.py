@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Индекс байтовых диапазонов для файла переводов.
+Строится один раз за проход json_events и хранит (start, end) каждого
+значения и каждого ключа. Удаление разделов превращается в один проход
+склейки по списку непересекающихся диапазонов - без разбиения на строки
+и без подсчета скобок внутри строковых значений вроде "{placeholder}".
+"""
+
+from collections import defaultdict
+
+from json_events import iter_members, read_bytes, dotted
+
+class SpanIndex:
+    """Байтовые диапазоны всех ключей файла JSON"""
+
+    def __init__(self, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.data = data
+        # Все ключи в порядке появления в файле
+        self.members = sorted(iter_members(data), key=lambda member: member.offset)
+        # Ключи каждого объекта по смещению объекта
+        self.children = defaultdict(list)
+        for member in self.members:
+            self.children[member.parent_offset].append(member)
+
+    @classmethod
+    def from_file(cls, file_path):
+        return cls(read_bytes(file_path))
+
+    def object_spans(self):
+        """Возвращает {путь: [(start, end), ...]} для каждого значения-объекта"""
+        spans = defaultdict(list)
+        for member in self.members:
+            if member.kind == 'object':
+                spans[dotted(member.path)].append((member.value_start, member.value_end))
+        return dict(spans)
+
+    def duplicate_groups(self):
+        """
+        Группирует ключи, повторяющиеся внутри одного объекта.
+        Возвращает список групп [Member, ...] в порядке появления. Группа -
+        это ключ внутри конкретного объекта-родителя: у повторяющихся
+        родителей (a и еще раз a) пути групп совпадают, но это разные группы
+        """
+        groups = []
+        for siblings in self.children.values():
+            by_key = defaultdict(list)
+            for member in siblings:
+                by_key[member.path[-1]].append(member)
+            for occurrences in by_key.values():
+                if len(occurrences) > 1:
+                    groups.append(occurrences)
+        return sorted(groups, key=lambda occurrences: occurrences[0].offset)
+
+    def removal_spans(self, members):
+        """
+        Вычисляет непересекающиеся диапазоны для удаления ключей вместе
+        со значениями и разделяющими запятыми. Ключи внутри уже удаляемых
+        значений пропускаются.
+        """
+        remove = set(member.offset for member in members)
+        spans = []
+        for parent_offset, siblings in self.children.items():
+            if not any(member.offset in remove for member in siblings):
+                continue
+            kept_before = False
+            for i, member in enumerate(siblings):
+                if member.offset not in remove:
+                    kept_before = True
+                    continue
+                if kept_before:
+                    # Удаляем от конца предыдущего значения: ', "key": value'
+                    spans.append((siblings[i - 1].value_end, member.value_end))
+                elif i + 1 < len(siblings):
+                    # Ведущий ключ: '"key": value, ' до следующего ключа
+                    spans.append((member.offset, siblings[i + 1].offset))
+                else:
+                    # Удаляются все ключи объекта
+                    spans.append((member.offset, member.value_end))
+        return merge_spans(spans)
+
+def merge_spans(spans):
+    """Сортирует диапазоны и отбрасывает вложенные в уже выбранные"""
+    result = []
+    for start, end in sorted(spans):
+        if result and start < result[-1][1]:
+            if end > result[-1][1]:
+                raise ValueError(f'Пересекающиеся диапазоны: {result[-1]} и {(start, end)}')
+            continue
+        result.append((start, end))
+    return result
+
+def splice(data, spans):
+    """Вырезает непересекающиеся отсортированные диапазоны за один проход"""
+    parts = []
+    position = 0
+    for start, end in spans:
+        parts.append(data[position:start])
+        position = end
+    parts.append(data[position:])
+    return b''.join(parts)
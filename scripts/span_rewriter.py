@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Переписывание файлов переводов правками байтовых диапазонов.
+Удаления и замены применяются к исходному тексту, поэтому форматирование,
+порядок ключей и отступы всех нетронутых частей файла сохраняются
+байт в байт. Файл записывается только при наличии изменений и только
+начиная с первого измененного байта: запись пропорциональна хвосту файла
+после правки, а не всему файлу.
+"""
+
+import json
+
+# Размер блока при поиске первого отличающегося байта
+_COMPARE_BLOCK = 64 * 1024
+
+def apply_edits(data, edits):
+    """
+    Применяет правки [(start, end, replacement), ...] за один проход.
+    Правки внутри уже удаляемых или заменяемых диапазонов отбрасываются,
+    частично пересекающиеся правки - ошибка.
+    """
+    parts = []
+    position = 0
+    last_end = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: (edit[0], -edit[1])):
+        if start < last_end:
+            if end > last_end:
+                raise ValueError(f'Пересекающиеся правки: {(start, end)} и конец {last_end}')
+            continue
+        parts.append(data[position:start])
+        parts.append(replacement)
+        position = last_end = end
+    parts.append(data[position:])
+    return b''.join(parts)
+
+def first_difference(original, updated):
+    """Смещение первого отличающегося байта (len, если одно - префикс другого)"""
+    length = min(len(original), len(updated))
+    position = 0
+    # Сначала блоками (сравнение срезов выполняется в C), затем побайтно
+    while position < length:
+        end = min(position + _COMPARE_BLOCK, length)
+        if original[position:end] != updated[position:end]:
+            break
+        position = end
+    else:
+        return length
+    while original[position] == updated[position]:
+        position += 1
+    return position
+
+def write_changes(file_path, original, updated):
+    """
+    Записывает updated поверх файла с содержимым original.
+    Ничего не пишет, если содержимое не изменилось; иначе пишет
+    от первого отличающегося байта и обрезает файл.
+    Возвращает количество записанных байт.
+    """
+    if original == updated:
+        return 0
+    start = first_difference(original, updated)
+    with open(file_path, 'r+b') as f:
+        f.seek(start)
+        f.write(updated[start:])
+        f.truncate()
+    return len(updated) - start
+
+class SpanRewriter:
+    """Накапливает правки к файлу, проиндексированному SpanIndex"""
+
+    def __init__(self, index):
+        self.index = index
+        self.removed = []
+        self.edits = []
+
+    def delete(self, members):
+        """Удаляет ключи вместе со значениями и разделяющими запятыми"""
+        self.removed.extend(members)
+
+    def replace(self, start, end, replacement):
+        """Заменяет произвольный диапазон байт"""
+        self.edits.append((start, end, replacement))
+
+    def replace_value(self, member, value):
+        """Заменяет значение ключа, не трогая сам ключ и форматирование вокруг"""
+        payload = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        self.replace(member.value_start, member.value_end, payload)
+
+    def render(self):
+        """Содержимое файла после всех правок"""
+        edits = list(self.edits)
+        if self.removed:
+            edits.extend((start, end, b'') for start, end in self.index.removal_spans(self.removed))
+        return apply_edits(self.index.data, edits)
+
+    def write(self, file_path, updated=None):
+        """Записывает изменения (updated - уже посчитанный render()); возвращает число байт"""
+        if updated is None:
+            updated = self.render()
+        return write_changes(file_path, self.index.data, updated)
+
+def drop_shadowed(index):
+    """
+    Удаляет повторные вхождения ключей на всех уровнях, оставляя последнее -
+    то значение, которое сейчас видят json.load и JSON.parse в браузере.
+    Возвращает SpanRewriter с удалениями (файл не записывается)
+    """
+    rewriter = SpanRewriter(index)
+    for occurrences in index.duplicate_groups():
+        rewriter.delete(occurrences[:-1])
+    return rewriter
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Разбиение файлов переводов на части по разделам верхнего уровня.
+Для каждого языка и каждого раздела (namespace) пишется отдельный
+минифицированный JSON с хэшем содержимого в имени, а manifest.json
+перечисляет размеры и хэши частей. Приложение может загружать только
+активный язык и нужные маршруту разделы вместо трех полных translation.json.
+
+Запуск:
+    python split_translations.py [--out=public/i18n]
+Скалярные значения верхнего уровня (loading, title, ...) попадают в раздел "_root".
+"""
+
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+from locale_files import find_locales_dir
+
+DEFAULT_OUT_DIR = Path(__file__).resolve().parent.parent / "public" / "i18n"
+ROOT_NAMESPACE = "_root"
+# Имя части, которое пишет chunk_file_name: <раздел>.<10 символов sha256>.json
+_CHUNK_NAME = re.compile(r"^[\w-]+\.[0-9a-f]{10}\.json$")
+
+def split_by_namespace(json_data):
+    """Разбивает переводы на {namespace: данные}; скаляры верхнего уровня - в ROOT_NAMESPACE"""
+    namespaces = {}
+    root = {}
+    for key, value in json_data.items():
+        if isinstance(value, dict):
+            namespaces[key] = value
+        else:
+            root[key] = value
+    if root:
+        namespaces[ROOT_NAMESPACE] = root
+    return namespaces
+
+def serialize_chunk(value):
+    """Минифицированный JSON части (UTF-8 без экранирования)"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def chunk_file_name(name, payload):
+    """Имя файла части с хэшем содержимого: (имя, полный sha256)"""
+    digest = hashlib.sha256(payload).hexdigest()
+    safe_name = re.sub(r"[^\w-]", "_", name)
+    return f"{safe_name}.{digest[:10]}.json", digest
+
+def build_chunks(lang, json_data):
+    """
+    Возвращает {namespace: (имя файла, bytes)} и записи манифеста языка.
+    Имя файла содержит хэш содержимого, поэтому части можно кэшировать навсегда.
+    """
+    chunks = {}
+    entries = {}
+    for namespace, value in split_by_namespace(json_data).items():
+        payload = serialize_chunk(value)
+        file_name, digest = chunk_file_name(namespace, payload)
+        chunks[namespace] = (file_name, payload)
+        entries[namespace] = {
+            "file": f"{lang}/{file_name}",
+            "bytes": len(payload),
+            "sha256": digest,
+        }
+    return chunks, entries
+
+def previous_chunk_files(out_dir, lang):
+    """Имена частей языка из прошлого manifest.json; None - манифеста нет"""
+    try:
+        with open(out_dir / "manifest.json", 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    language = manifest.get("languages", {}).get(lang, {})
+    # namespaces - split_translations, chunks - route_chunks
+    entries = list(language.get("namespaces", {}).values()) + list(language.get("chunks", {}).values())
+    return set(Path(entry["file"]).name for entry in entries if "file" in entry)
+
+def write_language(out_dir, lang, chunks):
+    """
+    Пишет части языка и удаляет устаревшие части из прошлых запусков.
+    Удаляются только файлы с именем части (<раздел>.<хэш>.json), которые
+    перечислены в прошлом манифесте, - папка может быть общей с другими файлами
+    """
+    previous = previous_chunk_files(out_dir, lang)
+    lang_dir = out_dir / lang
+    lang_dir.mkdir(parents=True, exist_ok=True)
+    current = set()
+    for file_name, payload in chunks.values():
+        current.add(file_name)
+        target = lang_dir / file_name
+        # Имя содержит хэш: существующий файл уже имеет нужное содержимое
+        if not target.exists():
+            target.write_bytes(payload)
+    for stale in lang_dir.glob("*.json"):
+        if stale.name in current or not _CHUNK_NAME.match(stale.name):
+            continue
+        if previous is None or stale.name in previous:
+            stale.unlink()
+
+def main():
+    """Основная функция"""
+    print("✂️  РАЗБИЕНИЕ ПЕРЕВОДОВ ПО РАЗДЕЛАМ")
+    print("=" * 60)
+
+    out_dir = DEFAULT_OUT_DIR
+    for arg in sys.argv[1:]:
+        if arg.startswith("--out="):
+            out_dir = Path(arg.split("=", 1)[1])
+
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
+        print("❌ Папка с переводами не найдена!")
+        return 1
+
+    manifest = {"languages": {}}
+    for lang_dir in sorted(locales_dir.iterdir()):
+        translation_file = lang_dir / "translation.json"
+        if not (lang_dir.is_dir() and translation_file.exists()):
+            continue
+        try:
+            with open(translation_file, 'r', encoding='utf-8') as f:
+                json_data = json.load(f)
+        except Exception as e:
+            print(f"❌ Ошибка чтения файла {translation_file}: {e}")
+            return 1
+
+        lang = lang_dir.name
+        chunks, entries = build_chunks(lang, json_data)
+        write_language(out_dir, lang, chunks)
+        manifest["languages"][lang] = {
+            "source_bytes": translation_file.stat().st_size,
+            "total_bytes": sum(entry["bytes"] for entry in entries.values()),
+            "namespaces": entries,
+        }
+
+        largest = sorted(entries.items(), key=lambda item: item[1]["bytes"], reverse=True)[:5]
+        print(f"\n🌐 {lang}: {len(entries)} разделов, "
+              f"{translation_file.stat().st_size / 1024:.1f} KB → "
+              f"{manifest['languages'][lang]['total_bytes'] / 1024:.1f} KB (минифицировано)")
+        for namespace, entry in largest:
+            print(f"   📦 {namespace}: {entry['bytes'] / 1024:.1f} KB")
+
+    if not manifest["languages"]:
+        print("❌ Файлы переводов не найдены!")
+        return 1
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"\n✅ Манифест: {manifest_path}")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Потоковый аудит больших файлов переводов с ограниченным потреблением памяти.
+Файл отображается в память через mmap и разбирается json_events без
+построения дерева. В памяти держатся:
+  - путь до текущего ключа;
+  - множества ключей открытых объектов (только объектов на текущем пути;
+    без них нельзя точно найти повтор ключа) - их пиковый размер
+    выводится в сводке;
+  - счетчики имен разделов, не больше MAX_TRACKED_NAMES: при переполнении
+    остаются самые частые имена, и число уникальных названий становится
+    нижней оценкой.
+Находки (дублирующиеся ключи) выдаются сразу, по мере разбора.
+"""
+
+import mmap
+import sys
+from collections import Counter
+from contextlib import contextmanager
+
+from json_events import EventParser, dotted
+from locale_files import find_locales_dir, find_translation_files, parse_jobs, run_per_file
+
+# Сколько путей запоминать для каждого повторяющегося имени раздела
+MAX_PATHS_PER_NAME = 5
+# Сколько разных имен разделов считать; при переполнении остается половина самых частых
+MAX_TRACKED_NAMES = 10000
+
+@contextmanager
+def open_stream(file_path):
+    """Открывает файл как mmap (только чтение); пустой файл - как b''"""
+    with open(file_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap не поддерживает пустые файлы
+            yield b''
+            return
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+def prune_names(names, name_paths, keep):
+    """Оставляет счетчики keep самых частых имен разделов"""
+    kept = dict(names.most_common(keep))
+    for name in list(names):
+        if name not in kept:
+            del names[name]
+            name_paths.pop(name, None)
+
+def stream_findings(data, max_names=MAX_TRACKED_NAMES):
+    """
+    Разбирает JSON (bytes или mmap) и выдает находки по мере обнаружения:
+      {'type': 'duplicate_key', 'path', 'line'} - повтор ключа внутри объекта,
+      {'type': 'summary', ...} - итоговая статистика в конце разбора.
+    """
+    parser = EventParser(data)
+    # Ключи каждого открытого объекта (None для массивов)
+    open_keys = []
+    # Ожидается значение ключа, который только что прочитан
+    pending_key = None
+    names = Counter()
+    name_paths = {}
+    names_truncated = False
+    total_keys = 0
+    sections = 0
+    max_depth = 0
+    # Ключи во множествах открытых объектов: сейчас и в пике
+    open_key_count = 0
+    max_open_keys = 0
+
+    for event, path, offset, line in parser:
+        if event == 'key':
+            total_keys += 1
+            key = path[-1]
+            keys = open_keys[-1]
+            if key in keys:
+                yield {'type': 'duplicate_key', 'path': dotted(path), 'line': line}
+            else:
+                keys.add(key)
+                open_key_count += 1
+                max_open_keys = max(max_open_keys, open_key_count)
+            pending_key = path
+            continue
+
+        if event == 'start_object':
+            if pending_key is not None:
+                # Раздел: ключ, значение которого - объект
+                name = pending_key[-1]
+                sections += 1
+                names[name] += 1
+                if len(names) > max_names:
+                    prune_names(names, name_paths, max_names // 2)
+                    names_truncated = True
+                paths = name_paths.setdefault(name, [])
+                if len(paths) < MAX_PATHS_PER_NAME:
+                    paths.append(dotted(pending_key))
+            open_keys.append(set())
+            max_depth = max(max_depth, len(open_keys))
+        elif event == 'start_array':
+            open_keys.append(None)
+        elif event == 'end_object' or event == 'end_array':
+            keys = open_keys.pop()
+            if keys:
+                open_key_count -= len(keys)
+        pending_key = None
+
+    repeated = {name: count for name, count in names.items() if count > 1}
+    yield {
+        'type': 'summary',
+        'total_keys': total_keys,
+        'sections': sections,
+        'unique_section_names': len(names),
+        'names_truncated': names_truncated,
+        'max_depth': max_depth,
+        'max_open_keys': max_open_keys,
+        'repeated_names': {name: {'count': count, 'paths': name_paths[name]}
+                           for name, count in sorted(repeated.items())},
+    }
+
+def audit_file(file_path):
+    """Потоковый аудит одного файла с печатью находок по мере разбора"""
+    print(f"\n📁 Файл (потоковый режим): {file_path}")
+    duplicates = 0
+    summary = None
+    try:
+        with open_stream(file_path) as data:
+            for finding in stream_findings(data):
+                if finding['type'] == 'duplicate_key':
+                    duplicates += 1
+                    print(f"   🔄 Дублирующийся ключ '{finding['path']}' (строка {finding['line']})")
+                else:
+                    summary = finding
+    except Exception as e:
+        print(f"❌ Ошибка разбора файла: {e}")
+        return None
+
+    unique = summary['unique_section_names']
+    if summary['names_truncated']:
+        unique = f"не меньше {unique} (счетчик ограничен {MAX_TRACKED_NAMES})"
+    print(f"📊 Ключей: {summary['total_keys']}, разделов: {summary['sections']}, "
+          f"уникальных названий: {unique}, глубина: {summary['max_depth']}")
+    print(f"🧠 В памяти: до {summary['max_open_keys']} ключей открытых объектов, "
+          f"до {MAX_TRACKED_NAMES} названий разделов")
+    print(f"🔁 Повторяющихся названий разделов: {len(summary['repeated_names'])}")
+    if duplicates:
+        print(f"⚠️  Дублирующихся ключей: {duplicates}")
+    else:
+        print("✅ Дублирующихся ключей не найдено")
+    summary['duplicate_keys'] = duplicates
+    return summary
+
+def main():
+    """Основная функция"""
+    print("🌊 ПОТОКОВЫЙ АУДИТ ФАЙЛОВ ПЕРЕВОДОВ")
+    print("=" * 60)
+
+    try:
+        jobs = parse_jobs()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    files = [arg for arg in sys.argv[1:] if arg.endswith(".json")]
+    if not files:
+        locales_dir = find_locales_dir()
+        if locales_dir is None:
+            print("❌ Папка с переводами не найдена!")
+            return 1
+        files = find_translation_files(locales_dir)
+
+    results = run_per_file(audit_file, files, jobs)
+    failed = sum(1 for result in results if result is None)
+    with_duplicates = sum(1 for result in results if result and result['duplicate_keys'])
+
+    print("\n" + "=" * 60)
+    print(f"📊 Файлов: {len(files)}, с дубликатами: {with_duplicates}, с ошибками: {failed}")
+    return 0 if not failed and not with_duplicates else 1
+
+if __name__ == "__main__":
+    exit(main())
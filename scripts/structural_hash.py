@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Структурные хэши (дерево Меркла) для поддеревьев JSON.
+Хэш каждого поддерева считается один раз снизу вверх из хэшей детей,
+поэтому сравнение двух разделов - это сравнение двух строк, а одинаковые
+поддеревья находятся по индексу хэш -> пути независимо от их имен.
+Порядок ключей не влияет на хэш (как json.dumps(..., sort_keys=True)).
+"""
+
+import hashlib
+import json
+from collections import defaultdict
+
+from path_store import PathStore
+from tree_walk import ENTER, LEAF, iter_tree
+
+def scalar_digest(value):
+    """Хэш скалярного значения (строки, числа, bool, null)"""
+    return hashlib.blake2b(b's' + json.dumps(value, ensure_ascii=False).encode('utf-8'),
+                           digest_size=16).hexdigest()
+
+def dict_digest(child_digests):
+    """Хэш словаря по хэшам его значений {key: digest}; порядок ключей не важен"""
+    h = hashlib.blake2b(b'd', digest_size=16)
+    for key in sorted(child_digests):
+        h.update(json.dumps(key, ensure_ascii=False).encode('utf-8'))
+        h.update(child_digests[key].encode('ascii'))
+    return h.hexdigest()
+
+def list_digest(item_digests):
+    """Хэш списка по хэшам элементов (по порядку)"""
+    h = hashlib.blake2b(b'l', digest_size=16)
+    for digest in item_digests:
+        h.update(digest.encode('ascii'))
+    return h.hexdigest()
+
+def structural_digest(value, path=(), digests=None, store=None):
+    """
+    Возвращает хэш значения. Если передан словарь digests, в него
+    записывается хэш каждого поддерева-словаря и списка: {path: digest}.
+    С хранилищем store (PathStore) пути - его узлы, а не кортежи ключей.
+    Обход итеративный (tree_walk): хэш узла считается при выходе из него.
+    """
+    if not isinstance(value, (dict, list)):
+        return scalar_digest(value)
+
+    # Хэши детей открытых узлов: {ключ/индекс: digest}
+    pending = []
+    for event, node_path, key, node in iter_tree(value, path, store):
+        if event == ENTER:
+            pending.append({})
+        elif event == LEAF:
+            pending[-1][key] = scalar_digest(node)
+        else:
+            child_digests = pending.pop()
+            if isinstance(node, dict):
+                digest = dict_digest(child_digests)
+            else:
+                digest = list_digest(child_digests.values())
+            if digests is not None:
+                digests[node_path] = digest
+            if pending:
+                pending[-1][key] = digest
+    return digest
+
+class DigestIndex:
+    """Хэши всех поддеревьев-словарей и индекс хэш -> пути (узлы PathStore)"""
+
+    def __init__(self, data, store=None):
+        self.data = data
+        self.store = store if store is not None else PathStore()
+        digests = {}
+        structural_digest(data, PathStore.ROOT, digests, self.store)
+        # Только словари под ключами объектов - разделы переводов
+        # (элементы списков разделами не считаются)
+        self.digests = {}
+        self.paths_by_digest = defaultdict(list)
+        for path, digest in digests.items():
+            if isinstance(self.store.last(path), str) and isinstance(self.value_at(path), dict):
+                self.digests[path] = digest
+                self.paths_by_digest[digest].append(path)
+
+    def value_at(self, path):
+        value = self.data
+        for part in self.store.parts(path):
+            value = value[part]
+        return value
+
+    def dotted(self, path):
+        """Строка пути узла - для отчета"""
+        return self.store.dotted(path)
+
+    def identical_groups(self, min_keys=1):
+        """
+        Группы одинаковых поддеревьев (с любыми именами), начиная с самых
+        крупных. Группы, которые лишь повторяют вложенные части уже
+        найденной группы (родители тоже одинаковые), пропускаются.
+        """
+        groups = {}
+        for digest, paths in self.paths_by_digest.items():
+            if len(paths) < 2 or len(self.value_at(paths[0])) < min_keys:
+                continue
+            parents = set(self.digests.get(self.store.parent(path)) for path in paths)
+            if len(parents) == 1:
+                parent = next(iter(parents))
+                if parent is not None and len(self.paths_by_digest[parent]) >= 2:
+                    continue
+            groups[digest] = paths
+        return groups
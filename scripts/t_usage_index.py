@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Индекс использования ключей переводов t('...') в исходниках src/.
+Каждый .js/.jsx файл сканируется один раз, результаты кэшируются по
+mtime и размеру файла, поэтому повторный запуск пересканирует только
+измененные компоненты. По индексу ключ -> места вызова строится отчет:
+неиспользуемые ключи каждого языка, сколько байт сэкономит их удаление,
+и ключи, которые используются в коде, но отсутствуют в переводах.
+
+Запуск:
+    python t_usage_index.py [--jobs N] [--all] [--index-out=usage.json] [--no-cache]
+"""
+
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from audit_cache import CACHE_DIR
+from json_events import dotted
+from locale_files import find_locales_dir, parse_jobs
+from span_index import SpanIndex, splice
+
+INDEX_FILE = CACHE_DIR / "t-usage-index.json"
+INDEX_VERSION = 1
+SOURCE_SUFFIXES = (".js", ".jsx")
+
+# t('key'), t("key"), i18n.t('key') - статические ключи
+_STATIC_CALL = re.compile(r'''(?<![\w$])t\(\s*(['"])((?:(?!\1)[^\\\n]|\\.)+)\1''')
+# t(`...`) - шаблонная строка; часть до ${ считается динамическим префиксом
+_TEMPLATE_CALL = re.compile(r'(?<![\w$])t\(\s*`([^`]*)`')
+
+def scan_source(text):
+    """
+    Находит вызовы t() в тексте файла.
+    Возвращает (keys, prefixes): списки [ключ, строка] и [префикс, строка]
+    """
+    calls = []
+    for match in _STATIC_CALL.finditer(text):
+        calls.append((match.start(), "key", match.group(2)))
+    for match in _TEMPLATE_CALL.finditer(text):
+        template = match.group(1)
+        if "${" in template:
+            calls.append((match.start(), "prefix", template.split("${", 1)[0]))
+        else:
+            calls.append((match.start(), "key", template))
+    calls.sort()
+
+    keys = []
+    prefixes = []
+    line = 1
+    position = 0
+    for start, kind, value in calls:
+        # Номера строк считаются инкрементально - один проход по тексту
+        line += text.count("\n", position, start)
+        position = start
+        if kind == "key":
+            keys.append([value, line])
+        elif value:
+            prefixes.append([value, line])
+    return keys, prefixes
+
+def scan_file(path):
+    """Сканирует один файл (выполняется и в пуле процессов)"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return scan_source(f.read())
+
+def iter_source_files(src_dir):
+    """Все .js/.jsx файлы в src/, кроме папки переводов"""
+    for root, dirs, files in os.walk(src_dir):
+        dirs[:] = sorted(d for d in dirs if d not in ("locales", "node_modules"))
+        for name in sorted(files):
+            if name.endswith(SOURCE_SUFFIXES):
+                yield Path(root) / name
+
+def load_index(index_file=INDEX_FILE):
+    """Загружает сохраненный индекс или возвращает пустой"""
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {"version": INDEX_VERSION, "files": {}}
+
+def save_index(index, index_file=INDEX_FILE):
+    """Сохраняет индекс атомарно"""
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_file.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_path, index_file)
+
+def update_index(index, src_dir, jobs=1):
+    """
+    Инкрементально обновляет индекс: пересканируются только файлы,
+    у которых изменились mtime или размер; удаленные файлы убираются.
+    Возвращает количество пересканированных файлов.
+    """
+    files = index["files"]
+    seen = set()
+    changed = []
+    for path in iter_source_files(src_dir):
+        name = path.relative_to(src_dir).as_posix()
+        seen.add(name)
+        stat = path.stat()
+        entry = files.get(name)
+        if entry is None or entry["mtime"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            changed.append((name, path, stat))
+
+    for name in list(files):
+        if name not in seen:
+            del files[name]
+
+    paths = [path for _, path, _ in changed]
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(scan_file, paths, chunksize=16))
+    else:
+        results = [scan_file(path) for path in paths]
+
+    for (name, _, stat), (keys, prefixes) in zip(changed, results):
+        files[name] = {
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "keys": keys,
+            "prefixes": prefixes,
+        }
+    return len(changed)
+
+def build_call_sites(index):
+    """
+    Строит индекс ключ -> места вызова и префикс -> места вызова.
+    Место вызова - строка "файл:строка".
+    """
+    keys = defaultdict(list)
+    prefixes = defaultdict(list)
+    for name in sorted(index["files"]):
+        entry = index["files"][name]
+        for key, line in entry["keys"]:
+            keys[key].append(f"{name}:{line}")
+        for prefix, line in entry["prefixes"]:
+            prefixes[prefix].append(f"{name}:{line}")
+    return dict(keys), dict(prefixes)
+
+def is_used(path, referenced, prefixes):
+    """
+    Ключ используется, если на него (или на его родительский раздел -
+    returnObjects) есть ссылка, либо он попадает под динамический префикс
+    """
+    full_key = dotted(path)
+    for depth in range(1, len(path) + 1):
+        if dotted(path[:depth]) in referenced:
+            return True
+    return any(full_key.startswith(prefix) for prefix in prefixes)
+
+def analyze_locale(file_path, referenced, prefixes):
+    """
+    Возвращает отчет по одному файлу переводов: неиспользуемые ключи,
+    точная экономия в байтах при их удалении и отсутствующие ключи
+    """
+    index = SpanIndex.from_file(file_path)
+    leaves = [member for member in index.members if member.kind != 'object']
+    unused = [member for member in leaves if not is_used(member.path, referenced, prefixes)]
+
+    # Экономия считается по реальным диапазонам удаления (с запятыми)
+    cleaned = splice(index.data, index.removal_spans(unused))
+    existing = set(dotted(member.path) for member in index.members)
+    missing = sorted(key for key in referenced if key not in existing)
+
+    return {
+        "leaves": len(leaves),
+        "unused": [dotted(member.path) for member in unused],
+        "size": len(index.data),
+        "savings": len(index.data) - len(cleaned),
+        "missing": missing,
+    }
+
+def print_keys(title, keys, limit):
+    """Печатает список ключей, ограничивая его длину"""
+    if not keys:
+        return
+    print(f"   {title}: {len(keys)}")
+    shown = keys if limit is None else keys[:limit]
+    for key in shown:
+        print(f"      - {key}")
+    if len(shown) < len(keys):
+        print(f"      ... и еще {len(keys) - len(shown)} (--all для полного списка)")
+
+def main():
+    """Основная функция"""
+    print("🔎 ИНДЕКС ИСПОЛЬЗОВАНИЯ КЛЮЧЕЙ ПЕРЕВОДОВ")
+    print("=" * 60)
+
+    try:
+        jobs = parse_jobs()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    limit = None if "--all" in sys.argv else 20
+    use_cache = "--no-cache" not in sys.argv
+    index_out = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--index-out="):
+            index_out = Path(arg.split("=", 1)[1])
+
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
+        print("❌ Папка с переводами не найдена!")
+        return 1
+    src_dir = locales_dir.parent
+
+    index = load_index() if use_cache else {"version": INDEX_VERSION, "files": {}}
+    rescanned = update_index(index, src_dir, jobs)
+    if use_cache:
+        save_index(index)
+    print(f"📄 Файлов в индексе: {len(index['files'])}, пересканировано: {rescanned}")
+
+    call_sites, prefix_sites = build_call_sites(index)
+    print(f"🔑 Статических ключей: {len(call_sites)}, динамических префиксов: {len(prefix_sites)}")
+
+    if index_out is not None:
+        index_out.write_text(json.dumps({"keys": call_sites, "prefixes": prefix_sites},
+                                        ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"💾 Индекс ключ → места вызова: {index_out}")
+
+    referenced = set(call_sites)
+    prefixes = sorted(prefix_sites)
+    for lang_dir in sorted(locales_dir.iterdir()):
+        translation_file = lang_dir / "translation.json"
+        if not (lang_dir.is_dir() and translation_file.exists()):
+            continue
+        try:
+            report = analyze_locale(translation_file, referenced, prefixes)
+        except Exception as e:
+            print(f"❌ Ошибка чтения файла {translation_file}: {e}")
+            return 1
+
+        print(f"\n🌐 {lang_dir.name}: {report['leaves']} ключей, "
+              f"не используется {len(report['unused'])}")
+        print(f"   💾 Экономия при удалении: {report['savings'] / 1024:.1f} KB "
+              f"из {report['size'] / 1024:.1f} KB ({report['savings'] / report['size']:.0%})")
+        print_keys("🗑️  Не используются", report['unused'], limit)
+        print_keys("❌ Используются в коде, но отсутствуют", report['missing'], limit)
+
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,49 @@
+"""Тесты обхода правил аудита (audit_rules.walk)"""
+
+from audit_rules import RULES, Rule, audit_file, walk
+from structural_hash import structural_digest
+
+class Recorder(Rule):
+    needs_digests = True
+
+    def __init__(self):
+        super().__init__()
+        self.events = []
+        self.digests = {}
+
+    def enter(self, path, node):
+        self.events.append(("enter", path))
+
+    def leaf(self, path, value):
+        self.events.append(("leaf", path))
+
+    def leave(self, path, node, digest):
+        self.events.append(("leave", path))
+        self.digests[path] = digest
+
+def test_walk_calls_hooks_in_tree_order():
+    rule = Recorder()
+    walk({"a": {"b": 1}, "c": [2]}, [rule])
+    assert rule.events == [
+        ("enter", ()), ("enter", ("a",)), ("leaf", ("a", "b")), ("leave", ("a",)),
+        ("enter", ("c",)), ("leaf", ("c", 0)), ("leave", ("c",)), ("leave", ()),
+    ]
+
+def test_walk_digests_match_structural_hash():
+    data = {"a": {"b": 1, "c": [True, None]}, "d": "x"}
+    rule = Recorder()
+    walk(data, [rule])
+    assert rule.digests[()] == structural_digest(data)
+    assert rule.digests[("a", "c")] == structural_digest(data["a"]["c"])
+
+def test_walk_scalar_root_is_a_leaf():
+    rule = Recorder()
+    walk("text", [rule])
+    assert rule.events == [("leaf", ())]
+
+def test_audit_file_returns_parse_error_without_printing(tmp_path, capsys):
+    file_path = tmp_path / "translation.json"
+    file_path.write_text('{"broken": ', encoding="utf-8")
+    result = audit_file(file_path, list(RULES), {}, use_cache=False)
+    assert "Expecting value" in result["error"]
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,66 @@
+"""Тесты хранилища резервных копий (backup_store)"""
+
+from backup_store import RUN_ENV, BackupStore, current_run_id, restore_main
+from locale_files import run_per_file
+
+def backup_one(file_path, root):
+    """Резервная копия одного файла в процессе пула"""
+    return BackupStore(root).backup_file(file_path, "test")
+
+def test_backup_deduplicates_objects(tmp_path):
+    store = BackupStore(tmp_path / "store")
+    file_path = tmp_path / "a.json"
+    file_path.write_bytes(b'{"a": 1}')
+    first = store.backup_file(file_path, "test")
+    second = store.backup_file(file_path, "test")
+    assert first == second
+    assert len(list(store.root.glob("objects/*/*.gz"))) == 1
+    assert store.get_object(first) == b'{"a": 1}'
+
+def test_pool_workers_share_run_id(tmp_path, monkeypatch):
+    # Пустое значение: current_run_id создаст новый run, а monkeypatch вернет окружение
+    monkeypatch.setenv(RUN_ENV, "")
+    files = []
+    for lang in ("en", "kg", "ru"):
+        file_path = tmp_path / f"{lang}.json"
+        file_path.write_text(f'{{"lang": "{lang}"}}', encoding="utf-8")
+        files.append(file_path)
+
+    run_id = current_run_id()
+    run_per_file(backup_one, files, 3, tmp_path / "store")
+
+    runs = BackupStore(tmp_path / "store").runs()
+    assert list(runs) == [run_id]
+    assert len(runs[run_id]) == len(files)
+
+def test_restore_main_restores_every_file_of_run(tmp_path, monkeypatch):
+    store = BackupStore(tmp_path / "store")
+    files = [tmp_path / "en.json", tmp_path / "ru.json"]
+    monkeypatch.setenv(RUN_ENV, "run-1")
+    for file_path in files:
+        file_path.write_bytes(b'{"before": "' + file_path.stem.encode() + b'"}')
+        store.backup_file(file_path, "test")
+        # Повторная копия в том же запуске: восстанавливается первая версия
+        file_path.write_bytes(b'{"step": 1}')
+        store.backup_file(file_path, "test")
+    monkeypatch.setenv(RUN_ENV, "run-2")
+    for file_path in files:
+        file_path.write_bytes(b'{"step": 2}')
+        store.backup_file(file_path, "test")
+        file_path.write_bytes(b'{}')
+
+    assert restore_main(store, ["run-1"]) == 0
+    assert [file_path.read_bytes() for file_path in files] == [b'{"before": "en"}', b'{"before": "ru"}']
+    # Без аргументов восстанавливается последний запуск
+    assert restore_main(store, []) == 0
+    assert [file_path.read_bytes() for file_path in files] == [b'{"step": 2}', b'{"step": 2}']
+
+def test_prune_keeps_last_runs(tmp_path, monkeypatch):
+    store = BackupStore(tmp_path / "store")
+    file_path = tmp_path / "a.json"
+    for number in range(3):
+        monkeypatch.setenv(RUN_ENV, f"run-{number}")
+        file_path.write_bytes(b'{"n": %d}' % number)
+        store.backup_file(file_path, "test")
+    assert store.prune(keep=1) == (2, 2)
+    assert list(store.runs()) == ["run-2"]
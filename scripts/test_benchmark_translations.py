@@ -0,0 +1,20 @@
+"""Тесты сравнения с базовой линией (benchmark_translations)"""
+
+from benchmark_translations import baseline_mismatch, compare_with_baseline
+
+BASELINE = {
+    "params": {"size": 2.0, "seed": 0, "repeat": 3},
+    "results": {"tool": {"mb_per_s": 8.0, "relative": 0.1}},
+}
+
+def test_compare_uses_speed_relative_to_reference():
+    # Медленная машина: MB/s упали вдвое, но и эталон тоже - не регрессия
+    assert compare_with_baseline({"tool": {"mb_per_s": 4.0, "relative": 0.1}}, BASELINE, 0.25) == []
+    regressions = compare_with_baseline({"tool": {"mb_per_s": 8.0, "relative": 0.05}}, BASELINE, 0.25)
+    assert [(tool, round(drop, 2)) for tool, _, _, drop in regressions] == [("tool", 0.5)]
+    assert compare_with_baseline({"tool": {"mb_per_s": 8.0, "relative": 0.05}}, BASELINE, 0.6) == []
+
+def test_mismatched_parameters_are_reported():
+    params = {"size": 0.5, "seed": 0, "repeat": 3}
+    assert baseline_mismatch(params, BASELINE) == [("size", 2.0, 0.5)]
+    assert baseline_mismatch(BASELINE["params"], BASELINE) == []
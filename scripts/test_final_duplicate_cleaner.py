@@ -0,0 +1,58 @@
+"""Тесты пакетной записи final_duplicate_cleaner (commit_batch)"""
+
+import json
+import os
+from pathlib import Path
+
+import final_duplicate_cleaner
+from backup_store import BackupStore
+from final_duplicate_cleaner import commit_batch, plan_file
+
+SOURCES = {
+    "en.json": b'{"title": "A", "title": "B", "menu": {"home": "Home"}}',
+    "ru.json": b'{"menu": {"home": "1", "home": "2"}, "footer": "x"}',
+    "kg.json": b'{"title": "C", "title": "D"}',
+}
+
+def plan_all(tmp_path):
+    plans = []
+    for name, data in SOURCES.items():
+        file_path = tmp_path / name
+        file_path.write_bytes(data)
+        plans.append(plan_file(file_path))
+    return plans
+
+def contents(tmp_path):
+    return {name: (tmp_path / name).read_bytes() for name in SOURCES}
+
+def test_commit_batch_writes_every_file(tmp_path):
+    plans = plan_all(tmp_path)
+    store = BackupStore(tmp_path / "store")
+    assert commit_batch(plans, store)
+    assert contents(tmp_path) == {Path(plan['path']).name: plan['cleaned'] for plan in plans}
+    assert json.loads((tmp_path / "ru.json").read_bytes()) == {"menu": {"home": "1"}, "footer": "x"}
+    assert not list(tmp_path.glob("*.tmp"))
+    # Все исходные версии сохранены в одном запуске хранилища
+    assert [len(entries) for entries in store.runs().values()] == [len(SOURCES)]
+
+def test_commit_batch_rolls_back_on_replace_error(tmp_path, monkeypatch):
+    plans = plan_all(tmp_path)
+    failing = str(tmp_path / "ru.json")
+    real_replace = os.replace
+
+    def replace(src, dst):
+        # Падает только подмена ru.json временным файлом; восстановление работает
+        if str(dst) == failing and str(src).endswith(".tmp"):
+            raise OSError("disk full")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(final_duplicate_cleaner.os, "replace", replace)
+    assert not commit_batch(plans, BackupStore(tmp_path / "store"))
+    assert contents(tmp_path) == SOURCES
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_commit_batch_refuses_file_changed_after_planning(tmp_path):
+    plans = plan_all(tmp_path)
+    (tmp_path / "kg.json").write_bytes(b'{"title": "E"}')
+    assert not commit_batch(plans, BackupStore(tmp_path / "store"))
+    assert contents(tmp_path) == {**SOURCES, "kg.json": b'{"title": "E"}'}
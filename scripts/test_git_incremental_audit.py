@@ -0,0 +1,32 @@
+"""Тесты разбора диапазонов ревизий (git_incremental_audit)"""
+
+import subprocess
+
+from git_incremental_audit import git, parse_range, resolve_range
+
+def commit(root, name, text):
+    (root / name).write_text(text, encoding="utf-8")
+    subprocess.run(["git", "add", name], cwd=root, check=True)
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com",
+                    "commit", "-q", "-m", name], cwd=root, check=True)
+    return git(["rev-parse", "HEAD"], root).decode("utf-8").strip()
+
+def test_parse_range_forms():
+    assert parse_range("A..B") == ("A", "B", False)
+    assert parse_range("A...B") == ("A", "B", True)
+    assert parse_range("..B") == ("HEAD", "B", False)
+    assert parse_range("HEAD") == ("HEAD", None, False)
+
+def test_three_dot_range_diffs_from_merge_base(tmp_path):
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=tmp_path, check=True)
+    fork = commit(tmp_path, "a.json", "{}")
+    subprocess.run(["git", "checkout", "-q", "-b", "feature"], cwd=tmp_path, check=True)
+    commit(tmp_path, "b.json", "{}")
+    subprocess.run(["git", "checkout", "-q", "main"], cwd=tmp_path, check=True)
+    commit(tmp_path, "c.json", "{}")
+
+    assert resolve_range(tmp_path, "main...feature") == (fork, "feature")
+    assert resolve_range(tmp_path, "main..feature") == ("main", "feature")
+    base, end = resolve_range(tmp_path, "main...feature")
+    changed = git(["diff", "--name-only", base, end], tmp_path).decode("utf-8").split()
+    assert changed == ["b.json"]
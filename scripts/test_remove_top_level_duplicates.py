@@ -0,0 +1,12 @@
+"""Тесты удаления повторяющихся разделов верхнего уровня"""
+
+import remove_top_level_duplicates
+from backup_store import BackupStore
+
+def test_nested_duplicates_are_left_untouched(tmp_path, monkeypatch):
+    monkeypatch.setattr(remove_top_level_duplicates, "BackupStore", lambda: BackupStore(tmp_path / "store"))
+    file_path = tmp_path / "translation.json"
+    file_path.write_bytes(b'{\n  "a": {"x": 1, "x": 2},\n  "b": 2,\n  "a": {"y": 1}\n}\n')
+
+    assert remove_top_level_duplicates.process_file(file_path, assume_yes=True)
+    assert file_path.read_bytes() == b'{\n  "a": {"x": 1, "x": 2},\n  "b": 2\n}\n'
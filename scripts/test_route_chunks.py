@@ -0,0 +1,22 @@
+"""Тесты имен частей маршрутов (route_chunks)"""
+
+from route_chunks import SHARED_CHUNK, build_route_chunks, route_name, route_names
+
+def test_colliding_routes_get_distinct_names():
+    routes = ["/a/:id", "/a/id", "/", "/_shared"]
+    assert route_name("/a/:id") == route_name("/a/id")
+    names = route_names(routes)
+    assert names == {"/": "index", "/_shared": "_shared-2", "/a/:id": "a__id", "/a/id": "a__id-2"}
+
+def test_colliding_routes_keep_their_own_chunks():
+    json_data = {"detail": {"title": "Detail"}, "list": {"title": "List"}}
+    names = route_names(["/a/:id", "/a/id"])
+    usages = {
+        SHARED_CHUNK: (set(), []),
+        names["/a/:id"]: ({"detail.title"}, []),
+        names["/a/id"]: ({"list.title"}, []),
+    }
+    chunks, stats, _ = build_route_chunks(json_data, usages)
+    assert stats[names["/a/:id"]]["keys"] == 1
+    assert stats[names["/a/id"]]["keys"] == 1
+    assert chunks[names["/a/:id"]][1] != chunks[names["/a/id"]][1]
@@ -0,0 +1,29 @@
+"""Тесты простой очистки дубликатов (simple_cleanup)"""
+
+import json
+
+import simple_cleanup
+from backup_store import BackupStore
+
+def use_store(tmp_path, monkeypatch):
+    store = BackupStore(tmp_path / "store")
+    monkeypatch.setattr(simple_cleanup, "BackupStore", lambda: store)
+    return store
+
+def test_keeps_last_occurrence_like_json_parse(tmp_path, monkeypatch):
+    use_store(tmp_path, monkeypatch)
+    file_path = tmp_path / "translation.json"
+    data = b'{\n  "title": "Old",\n  "menu": {"home": "1", "home": "2"},\n  "title": "New"\n}\n'
+    file_path.write_bytes(data)
+    assert simple_cleanup.process_file(file_path)
+    assert json.loads(file_path.read_bytes()) == json.loads(data)
+    assert file_path.read_bytes() == b'{\n  "menu": {"home": "2"},\n  "title": "New"\n}\n'
+
+def test_clean_file_is_neither_backed_up_nor_written(tmp_path, monkeypatch):
+    store = use_store(tmp_path, monkeypatch)
+    file_path = tmp_path / "translation.json"
+    file_path.write_bytes(b'{"a": 1}')
+    mtime = file_path.stat().st_mtime_ns
+    assert simple_cleanup.process_file(file_path)
+    assert store.entries() == []
+    assert file_path.stat().st_mtime_ns == mtime
@@ -0,0 +1,49 @@
+"""Тесты индекса байтовых диапазонов и склейки (span_index)"""
+
+import json
+
+from final_duplicate_cleaner import plan_file
+from json_events import dotted
+from span_index import SpanIndex, merge_spans, splice
+from span_rewriter import drop_shadowed
+
+NESTED_REPEATS = b'{"a":{"x":1,"x":2},"a":{"x":3,"x":4}}'
+
+def test_splice_removes_spans():
+    assert splice(b'0123456789', [(1, 3), (5, 8)]) == b'03489'
+
+def test_splice_without_spans_keeps_data():
+    assert splice(b'{"a": 1}', []) == b'{"a": 1}'
+
+def test_merge_spans_drops_nested():
+    assert merge_spans([(5, 8), (0, 10), (12, 14)]) == [(0, 10), (12, 14)]
+
+def test_removal_keeps_formatting_and_separators():
+    data = b'{\n  "a": 1,\n  "b": {"c": 2},\n  "a": 3\n}\n'
+    index = SpanIndex(data)
+    second_a = [member for member in index.members if member.path == ('a',)][1]
+    assert splice(data, index.removal_spans([second_a])) == b'{\n  "a": 1,\n  "b": {"c": 2}\n}\n'
+
+def test_removal_of_leading_key():
+    data = b'{"a": 1, "b": 2}'
+    index = SpanIndex(data)
+    first = index.members[0]
+    assert splice(data, index.removal_spans([first])) == b'{"b": 2}'
+
+def test_duplicate_groups_keep_repeated_parents_apart():
+    # Регрессия: группы a.x из двух разных объектов 'a' не должны затирать друг друга
+    groups = SpanIndex(NESTED_REPEATS).duplicate_groups()
+    assert [dotted(occurrences[0].path) for occurrences in groups] == ['a', 'a.x', 'a.x']
+    assert all(len(occurrences) == 2 for occurrences in groups)
+
+def test_final_cleaner_handles_repeated_parents(tmp_path):
+    file_path = tmp_path / "translation.json"
+    file_path.write_bytes(NESTED_REPEATS)
+    plan = plan_file(file_path)
+    assert plan['error'] is None
+    assert json.loads(plan['cleaned']) == {"a": {"x": 1}}
+
+def test_drop_shadowed_keeps_last_occurrences():
+    cleaned = drop_shadowed(SpanIndex(NESTED_REPEATS)).render()
+    assert json.loads(cleaned) == {"a": {"x": 4}}
+    assert cleaned.count(b'"x"') == 1
@@ -0,0 +1,52 @@
+"""Тесты переписывания файлов правками диапазонов (span_rewriter)"""
+
+import json
+
+import pytest
+
+from span_index import SpanIndex
+from span_rewriter import SpanRewriter, apply_edits, first_difference, write_changes
+
+DATA = b'{\n  "title": "Old",\n  "items": [1, 2],\n  "title": "New",\n  "tail": "x"\n}\n'
+
+def test_apply_edits_drops_nested_and_rejects_overlaps():
+    assert apply_edits(b'0123456789', [(2, 6, b'-'), (3, 4, b'!'), (8, 9, b'')]) == b'01-679'
+    with pytest.raises(ValueError):
+        apply_edits(b'0123456789', [(2, 6, b''), (4, 8, b'')])
+
+def test_first_difference_of_prefix_is_length():
+    assert first_difference(b'abc', b'abcdef') == 3
+    assert first_difference(b'abXd', b'abcd') == 2
+
+def test_tail_write_matches_render(tmp_path):
+    file_path = tmp_path / "translation.json"
+    file_path.write_bytes(DATA)
+    index = SpanIndex(DATA)
+    titles = [member for member in index.members if member.path == ('title',)]
+    rewriter = SpanRewriter(index)
+    rewriter.delete(titles[1:])
+    rewriter.replace_value(titles[0], "Новый")
+
+    updated = rewriter.render()
+    written = rewriter.write(file_path)
+    assert file_path.read_bytes() == updated
+    # Пишется только хвост от первой правки
+    assert written == len(updated) - DATA.index(b'Old')
+    assert json.loads(updated) == {"title": "Новый", "items": [1, 2], "tail": "x"}
+
+def test_write_truncates_shorter_file(tmp_path):
+    file_path = tmp_path / "translation.json"
+    file_path.write_bytes(DATA)
+    index = SpanIndex(DATA)
+    rewriter = SpanRewriter(index)
+    rewriter.delete([member for member in index.members if member.path == ('tail',)])
+    rewriter.write(file_path)
+    assert file_path.read_bytes() == b'{\n  "title": "Old",\n  "items": [1, 2],\n  "title": "New"\n}\n'
+
+def test_unchanged_file_is_not_written(tmp_path):
+    file_path = tmp_path / "translation.json"
+    file_path.write_bytes(DATA)
+    mtime = file_path.stat().st_mtime_ns
+    assert SpanRewriter(SpanIndex(DATA)).write(file_path) == 0
+    assert write_changes(file_path, DATA, DATA) == 0
+    assert file_path.stat().st_mtime_ns == mtime
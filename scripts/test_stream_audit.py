@@ -0,0 +1,24 @@
+"""Тесты потокового аудита (stream_audit)"""
+
+import json
+
+from stream_audit import stream_findings
+
+def test_section_name_counters_are_bounded():
+    data = {f"page{number}": {"common": {"title": "x"}} for number in range(50)}
+    findings = list(stream_findings(json.dumps(data).encode(), max_names=8))
+    summary = findings[-1]
+    assert summary['sections'] == 100
+    assert summary['names_truncated']
+    assert summary['unique_section_names'] <= 8
+    # Самое частое имя переживает сокращение счетчиков
+    assert summary['repeated_names']['common']['count'] > 1
+
+def test_duplicates_and_open_key_peak():
+    data = b'{"a": {"x": 1, "y": 2}, "b": {"x": 1, "x": 2}, "c": 3}'
+    findings = list(stream_findings(data))
+    assert [finding['path'] for finding in findings[:-1]] == ['b.x']
+    summary = findings[-1]
+    assert not summary['names_truncated']
+    # Пик - внутри a: ключ корня a и x, y; ключи закрытых объектов освобождаются
+    assert summary['max_open_keys'] == 3
@@ -0,0 +1,82 @@
+"""Тесты инкрементального разбора разделов (watch_translations.rescan_top_level)"""
+
+import json
+import os
+import random
+
+import pytest
+
+from watch_translations import WatchedFile, rescan_top_level, scan_top_level
+
+BASE = b'{\n  "home": {"title": "Home"},\n  "about": {"text": "About"},\n  "footer": "x"\n}\n'
+
+EDITS = [
+    # Значение среднего раздела
+    BASE.replace(b'"About"', b'"About us, longer"'),
+    # Первый и последний разделы
+    BASE.replace(b'"Home"', b'"H"'),
+    BASE.replace(b'"x"', b'{"a": [1, 2]}'),
+    # Новые разделы в начале, середине и конце
+    BASE.replace(b'{\n  "home"', b'{\n  "new": 1,\n  "home"'),
+    BASE.replace(b'\n  "footer"', b'\n  "extra": [],\n  "footer"'),
+    BASE.replace(b'"x"\n}', b'"x",\n  "last": true\n}'),
+    # Удаление разделов и переименование ключа
+    BASE.replace(b'\n  "about": {"text": "About"},', b''),
+    BASE.replace(b'{\n  "home": {"title": "Home"},', b'{'),
+    BASE.replace(b'"about"', b'"about_us"'),
+    # Повтор ключа и пустой объект
+    BASE.replace(b'"x"\n}', b'"x",\n  "home": {}\n}'),
+    b'{}',
+    # Изменения только в пробелах и внешних скобках
+    BASE.replace(b'\n}\n', b'}'),
+    b'  ' + BASE,
+]
+
+@pytest.mark.parametrize("new_data", EDITS)
+def test_rescan_matches_full_scan(new_data):
+    assert rescan_top_level(BASE, scan_top_level(BASE), new_data) == scan_top_level(new_data)
+
+def random_sections(rng, count):
+    return [(f"s{rng.randrange(12)}", {"k": "v" * rng.randrange(4), "n": [rng.randrange(3)] * rng.randrange(3)})
+            for _ in range(count)]
+
+def render(sections, indent):
+    # Пары ключ-значение вручную: повторяющиеся ключи сохраняются
+    separator = ",\n" if indent else ","
+    body = separator.join(f'{json.dumps(key)}: {json.dumps(value)}' for key, value in sections)
+    return ("{\n" + body + "\n}\n" if indent else "{" + body + "}").encode()
+
+def test_rescan_matches_full_scan_after_random_edits():
+    rng = random.Random(0)
+    for _ in range(300):
+        sections = random_sections(rng, rng.randrange(6))
+        edited = list(sections)
+        for _ in range(rng.randrange(1, 3)):
+            operation = rng.choice(("change", "insert", "delete"))
+            if operation == "insert" or not edited:
+                edited.insert(rng.randrange(len(edited) + 1), random_sections(rng, 1)[0])
+            elif operation == "delete":
+                del edited[rng.randrange(len(edited))]
+            else:
+                position = rng.randrange(len(edited))
+                edited[position] = (edited[position][0], random_sections(rng, 1)[0][1])
+        indent = rng.random() < 0.5
+        old_data, new_data = render(sections, indent), render(edited, indent)
+        assert rescan_top_level(old_data, scan_top_level(old_data), new_data) == scan_top_level(new_data)
+
+def test_watched_file_tracks_each_copy_of_duplicate_key(tmp_path):
+    file_path = tmp_path / "translation.json"
+    data = b'{\n  "home": {"title": "Home"},\n  "about": {"text": "About"},\n  "home": {"title": "Main"}\n}\n'
+    file_path.write_bytes(data)
+    watched = WatchedFile(file_path, {"max_length": 500})
+    assert watched.refresh() == ["home", "about", "home #2"]
+
+    # Правка перекрытой (первой) копии: пустое значение должно найтись
+    stamp = file_path.stat().st_mtime_ns
+    file_path.write_bytes(data.replace(b'"Home"', b'""'))
+    os.utime(file_path, ns=(stamp + 10**9, stamp + 10**9))
+    assert watched.refresh() == ["home"]
+    rules = {(finding["rule"], finding["path"]) for finding in watched.findings()}
+    assert ("empty-values", "home.title") in rules
+    assert ("duplicate-keys", "home") in rules
+    assert len(watched.sections) == 3
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Общий обход дерева JSON для инструментов переводов.
+Обход в глубину с явным стеком итераторов: без рекурсии (глубина
+вложенности не ограничена sys.getrecursionlimit) и без промежуточных
+списков на каждом уровне - узлы отдаются генератором по одному:
+
+    (ENTER, путь, ключ, узел)  - вход в словарь/список
+    (LEAF,  путь, ключ, значение)
+    (LEAVE, путь, ключ, узел)  - после всех детей узла
+
+Путь - кортеж ключей или, если передан store (PathStore), узел хранилища.
+"""
+
+from path_store import PathStore
+
+ENTER = "enter"
+LEAF = "leaf"
+LEAVE = "leave"
+
+CONTAINERS = (dict, list)
+
+def _items(node):
+    return iter(node.items()) if isinstance(node, dict) else enumerate(node)
+
+def iter_tree(data, path=None, store=None, descend=CONTAINERS):
+    """
+    События обхода data. descend - типы, в которые обход заходит
+    (например, (dict,) - списки считаются листьями). path - путь корня
+    (по умолчанию пустой кортеж или PathStore.ROOT)
+    """
+    if path is None:
+        path = PathStore.ROOT if store is not None else ()
+    if not isinstance(data, descend):
+        yield LEAF, path, None, data
+        return
+
+    yield ENTER, path, None, data
+    stack = [(path, None, data, _items(data))]
+    while stack:
+        path, key, node, items = stack[-1]
+        for child_key, value in items:
+            child_path = store.child(path, child_key) if store is not None else path + (child_key,)
+            if isinstance(value, descend):
+                yield ENTER, child_path, child_key, value
+                stack.append((child_path, child_key, value, _items(value)))
+                break
+            yield LEAF, child_path, child_key, value
+        else:
+            stack.pop()
+            yield LEAVE, path, key, node
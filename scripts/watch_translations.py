@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Режим наблюдения: повторный аудит файлов переводов при каждом сохранении.
+Файлы опрашиваются по mtime (без внешних зависимостей). Для каждого файла
+в памяти держатся его байты, границы разделов верхнего уровня и результаты
+проверок каждого раздела. При изменении файла границы пересчитываются
+только для измененного участка (общие начало и конец старой и новой версии
+не разбираются заново), а правила audit_rules выполняются только для
+разделов, байты которых изменились. Проверки уровня файла (одинаковые
+разделы, повторяющиеся имена) и сравнение переменных между языками
+собираются из сохраненных результатов разделов.
+
+Запуск:
+    python watch_translations.py [--interval=0.5] [--max-length=500] [--once]
+"""
+
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+
+from audit_rules import (DEFAULT_MAX_LENGTH, ERROR, INFO, SEVERITY_ICONS, WARNING,
+                         PlaceholdersRule, Rule, run_rules)
+from json_events import dotted, iter_members, read_bytes
+from locale_files import find_locales_dir
+from locale_parity import find_locale_groups
+from span_rewriter import first_difference
+
+DEFAULT_INTERVAL = 0.5
+# Правила, которым достаточно одного раздела; остальные собираются по файлу
+SECTION_RULES = ["duplicate-keys", "empty-values", "placeholders", "oversized-strings"]
+# Размер блока при поиске общего конца двух версий файла
+_COMPARE_BLOCK = 64 * 1024
+
+class SectionIndexRule(Rule):
+    """Собирает (имя, хэш, путь) всех разделов-словарей для проверок уровня файла"""
+    name = "section-index"
+    needs_digests = True
+
+    def __init__(self, options=None):
+        super().__init__(options)
+        self.sections = []
+
+    def leave(self, path, node, digest):
+        if path and isinstance(path[-1], str) and isinstance(node, dict):
+            self.sections.append([path[-1], digest, dotted(path)])
+
+    def state(self):
+        return self.sections
+
+def common_suffix(original, updated, limit):
+    """Длина общего конца двух версий (не больше limit)"""
+    length = 0
+    while length < limit:
+        step = min(_COMPARE_BLOCK, limit - length)
+        if original[len(original) - length - step:len(original) - length] != \
+                updated[len(updated) - length - step:len(updated) - length]:
+            break
+        length += step
+    else:
+        return limit
+    while length < limit and original[-length - 1] == updated[-length - 1]:
+        length += 1
+    return length
+
+def scan_top_level(data):
+    """Разделы верхнего уровня: [(ключ, смещение ключа, начало и конец значения)]"""
+    return [(member.path[0], member.offset, member.value_start, member.value_end)
+            for member in iter_members(data) if len(member.path) == 1]
+
+def rescan_top_level(old_data, old_members, new_data):
+    """
+    Границы разделов новой версии файла. Разделы, целиком лежащие в общем
+    начале или общем конце двух версий, переносятся без разбора; заново
+    разбирается только участок между ними. Если участок нельзя разобрать
+    отдельно (изменены внешние скобки и т.п.) - полный разбор.
+    """
+    start = first_difference(old_data, new_data)
+    suffix = common_suffix(old_data, new_data, min(len(old_data), len(new_data)) - start)
+    old_tail = len(old_data) - suffix
+    delta = len(new_data) - len(old_data)
+
+    before = [member for member in old_members if member[3] <= start]
+    after = [member for member in old_members if member[1] >= old_tail]
+    try:
+        if before:
+            region_start = before[-1][3]
+        else:
+            region_start = new_data.index(b'{') + 1
+            if region_start > start:
+                return scan_top_level(new_data)
+        if after:
+            region_end = after[0][1] + delta
+        else:
+            region_end = new_data.rindex(b'}')
+            if region_end < len(new_data) - suffix:
+                return scan_top_level(new_data)
+
+        middle = new_data[region_start:region_end]
+        body = middle.lstrip()
+        lead = len(middle) - len(body)
+        body = body.rstrip()
+        # Разделитель с соседними неизмененными разделами
+        if before:
+            if not body.startswith(b','):
+                return scan_top_level(new_data)
+            body = body[1:]
+            lead += 1
+        if after and body.strip():
+            if not body.endswith(b','):
+                return scan_top_level(new_data)
+            body = body[:-1]
+        if not body.strip():
+            middle_members = []
+        else:
+            base = region_start + lead - 1
+            middle_members = [(key, base + key_offset, base + value_start, base + value_end)
+                              for key, key_offset, value_start, value_end
+                              in scan_top_level(b'{' + body + b'}')]
+    except ValueError:
+        return scan_top_level(new_data)
+
+    shifted = [(key, key_offset + delta, value_start + delta, value_end + delta)
+               for key, key_offset, value_start, value_end in after]
+    return before + middle_members + shifted
+
+def analyze_section(key, raw, options):
+    """Правила SECTION_RULES для одного раздела (пути - от корня файла)"""
+    text = b'{' + json.dumps(key, ensure_ascii=False).encode('utf-8') + b':' + raw + b'}'
+    return run_rules(text, SECTION_RULES + [SectionIndexRule], options)
+
+def section_label(slot):
+    """Имя раздела для вывода: повторное вхождение ключа - с номером (home #2)"""
+    key, occurrence = slot
+    return key if not occurrence else f"{key} #{occurrence + 1}"
+
+class WatchedFile:
+    """Файл переводов в памяти: байты, разделы и результаты их проверок"""
+
+    def __init__(self, path, options):
+        self.path = path
+        self.options = options
+        self.stamp = None
+        self.data = None
+        self.members = []
+        # (ключ, номер вхождения ключа) -> (байты значения, результат analyze_section);
+        # номер различает повторы ключа верхнего уровня, включая перекрытые
+        self.sections = {}
+        self.error = None
+
+    def refresh(self):
+        """
+        Перечитывает файл, если изменились mtime или размер.
+        Возвращает список измененных разделов или None, если файл не менялся
+        """
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self.stamp:
+            return None
+        self.stamp = stamp
+        data = read_bytes(self.path)
+        if data == self.data:
+            return []
+
+        try:
+            if self.data is None or self.error:
+                members = scan_top_level(data)
+            else:
+                members = rescan_top_level(self.data, self.members, data)
+        except ValueError as e:
+            self.error = str(e)
+            self.data = data
+            return []
+        self.error = None
+
+        changed = []
+        sections = {}
+        occurrences = Counter()
+        for key, _, value_start, value_end in members:
+            slot = (key, occurrences[key])
+            occurrences[key] += 1
+            raw = data[value_start:value_end]
+            previous = self.sections.get(slot)
+            if previous is not None and previous[0] == raw:
+                sections[slot] = previous
+                continue
+            try:
+                sections[slot] = (raw, analyze_section(key, raw, self.options))
+            except ValueError as e:
+                self.error = f"раздел '{key}': {e}"
+                sections[slot] = (raw, {"findings": [], "states": {}})
+            changed.append(section_label(slot))
+        changed.extend(section_label(slot) for slot in self.sections if slot not in sections)
+        self.data = data
+        self.members = members
+        self.sections = sections
+        return changed
+
+    def findings(self):
+        """Все находки файла: разделов и уровня файла"""
+        if self.error:
+            return [{"rule": "parse-error", "severity": ERROR, "path": "", "message": self.error}]
+
+        findings = []
+        index = []
+        for raw, result in self.sections.values():
+            findings.extend(result["findings"])
+            index.extend(result["states"].get(SectionIndexRule.name, []))
+
+        counts = Counter(key for key, _, _, _ in self.members)
+        for key, count in counts.items():
+            if count > 1:
+                findings.append({"rule": "duplicate-keys", "severity": ERROR, "path": key,
+                                 "message": f"ключ '{key}' повторяется {count} раз"})
+
+        by_content = defaultdict(list)
+        by_name = defaultdict(list)
+        for name, digest, path in index:
+            by_content[(name, digest)].append(path)
+            by_name[name].append(path)
+        for (name, _), paths in by_content.items():
+            if len(paths) > 1:
+                findings.append({"rule": "duplicate-sections", "severity": WARNING, "path": paths[0],
+                                 "message": f"раздел '{name}' с одинаковым содержимым встречается "
+                                            f"{len(paths)} раз"})
+        for name, paths in by_name.items():
+            if len(paths) > 1:
+                findings.append({"rule": "section-names", "severity": INFO, "path": paths[0],
+                                 "message": f"имя раздела '{name}' встречается {len(paths)} раз"})
+        return findings
+
+    def placeholders(self):
+        """Переменные {{...}} всех строк файла для сравнения между языками"""
+        merged = {}
+        for raw, result in self.sections.values():
+            merged.update(result["states"].get(PlaceholdersRule.name, {}))
+        return merged
+
+def collect_findings(groups, watched):
+    """Множество находок всех файлов: {(файл, правило, путь, сообщение): severity}"""
+    current = {}
+    for group_name, group in groups.items():
+        states = {}
+        for lang, file_path in group.items():
+            watched_file = watched[file_path]
+            for finding in watched_file.findings():
+                current[(str(file_path), finding["rule"], finding["path"], finding["message"])] = finding["severity"]
+            if not watched_file.error:
+                states[lang] = watched_file.placeholders()
+        for finding in PlaceholdersRule.compare(states):
+            current[(group_name, finding["rule"], finding["path"], finding["message"])] = finding["severity"]
+    return current
+
+def print_diff(previous, current):
+    """Печатает новые и исправленные находки"""
+    for key in sorted(set(current) - set(previous)):
+        source, rule, path, message = key
+        print(f"   {SEVERITY_ICONS[current[key]]} {source} [{rule}] {path}: {message}")
+    for key in sorted(set(previous) - set(current)):
+        source, rule, path, message = key
+        print(f"   ✅ исправлено: {source} [{rule}] {path}: {message}")
+
+def summary(current):
+    counts = Counter(current.values())
+    return (f"ошибок: {counts[ERROR]}, предупреждений: {counts[WARNING]}, "
+            f"замечаний: {counts[INFO]}")
+
+def main():
+    """Основная функция"""
+    print("👀 НАБЛЮДЕНИЕ ЗА ФАЙЛАМИ ПЕРЕВОДОВ")
+    print("=" * 60)
+
+    interval = DEFAULT_INTERVAL
+    options = {"max_length": DEFAULT_MAX_LENGTH}
+    try:
+        for arg in sys.argv[1:]:
+            if arg.startswith("--interval="):
+                interval = float(arg.split("=", 1)[1])
+            elif arg.startswith("--max-length="):
+                options["max_length"] = int(arg.split("=", 1)[1])
+    except ValueError as e:
+        print(f"❌ Некорректный параметр: {e}")
+        return 1
+
+    locales_dir = find_locales_dir()
+    if locales_dir is None:
+        print("❌ Папка с переводами не найдена!")
+        return 1
+    groups = find_locale_groups(locales_dir)
+    if not groups:
+        print("❌ Файлы переводов не найдены!")
+        return 1
+
+    watched = {file_path: WatchedFile(file_path, options)
+               for group in groups.values() for file_path in group.values()}
+    started = time.perf_counter()
+    for watched_file in watched.values():
+        watched_file.refresh()
+    current = collect_findings(groups, watched)
+    print(f"📄 Файлов: {len(watched)}, первичный аудит: "
+          f"{(time.perf_counter() - started) * 1000:.0f} мс; {summary(current)}")
+    if "--once" in sys.argv:
+        return 1 if ERROR in current.values() else 0
+
+    print(f"⏳ Ожидание изменений (опрос каждые {interval} с, Ctrl+C - выход)")
+    try:
+        while True:
+            time.sleep(interval)
+            started = time.perf_counter()
+            changes = {}
+            for file_path, watched_file in watched.items():
+                changed = watched_file.refresh()
+                if changed is not None:
+                    changes[file_path] = changed
+            if not changes:
+                continue
+
+            previous, current = current, collect_findings(groups, watched)
+            elapsed = (time.perf_counter() - started) * 1000
+            for file_path, changed in changes.items():
+                sections = ", ".join(changed[:5]) + (f" и еще {len(changed) - 5}" if len(changed) > 5 else "")
+                print(f"\n📝 {file_path}: изменено разделов {len(changed)}" + (f" ({sections})" if changed else ""))
+            print_diff(previous, current)
+            print(f"⏱️  {elapsed:.1f} мс; {summary(current)}")
+    except KeyboardInterrupt:
+        print("\n👋 Наблюдение остановлено")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())